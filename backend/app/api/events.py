@@ -1,19 +1,51 @@
 """API routes for corporate action events."""
+import csv
+import io
+import json
 import logging
-from typing import Annotated
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, date, datetime
+from typing import Annotated, Any, Literal, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
 
-from app.core.database import get_db
+from app.core.config import get_settings
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
 from app.models.event import EventStatus, EventType
-from app.schemas.event import EventCreate, EventList, EventResponse, MetricsResponse
-from app.services.event_service import EventService
+from app.schemas.event import (
+    AUDIT_ROW_JSON,
+    EVENT_LIST_JSON,
+    EVENT_ROW_JSON,
+    AuditLogResponse,
+    AuditRow,
+    BatchCreateResponse,
+    BatchItemResult,
+    CalendarQuery,
+    EventCreate,
+    EventHistory,
+    EventList,
+    EventResponse,
+    MetricsResponse,
+)
+from app.services.async_event_service import AsyncEventService, get_event_service
+from app.services.broadcaster import broadcaster
+from app.services.idempotency import DuplicateIdempotencyKeyError
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 router = APIRouter(prefix="/events", tags=["events"])
 
+T = TypeVar("T")
+
+# Completed or already cancelled events cannot be cancelled
+CANCELLABLE_STATUSES = (EventStatus.PENDING, EventStatus.PROCESSING, EventStatus.FAILED)
+
 
 @router.post(
     "",
@@ -21,26 +53,43 @@ router = APIRouter(prefix="/events", tags=["events"])
     status_code=status.HTTP_201_CREATED,
     summary="Create a new corporate action event",
 )
-def create_event(
+async def create_event(
     event_data: EventCreate,
-    db: Annotated[Session, Depends(get_db)],
-) -> EventResponse:
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> EventResponse | Response:
     """
     Create a new corporate action event.
     
     Validates input, creates event record, and initiates processing.
-    Supports idempotency via optional idempotency_key.
+    Supports idempotency via optional idempotency_key: repeating a
+    request with the same key and body within the replay window returns
+    the original response with a 200 (and `Idempotent-Replayed: true`).
+    The same key with a different body, or after the window, gets a 409
+    whose body carries the original event under `event`.
     
     **Event Types:**
     - DIVIDEND: Requires amount, ex_date, record_date, payment_date
     - STOCK_SPLIT: Requires split_ratio_from, split_ratio_to, effective_date
     - MERGER: Requires target_symbol, exchange_ratio, effective_date
     """
-    service = EventService(db)
-    
+    replay = await service.get_replay(event_data)
+    if replay is not None:
+        return _replayed(replay)
     try:
-        event = service.create_event(event_data, user="api_user")
+        event = await service.create_event(event_data, user="api_user")
         return EventResponse.model_validate(event)
+    except DuplicateIdempotencyKeyError as e:
+        # Created through another process: the key is known locally now
+        replay = await service.get_replay(event_data)
+        if replay is not None:
+            return _replayed(replay)
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "detail": str(e),
+                "event": EventResponse.model_validate(e.event).model_dump(mode="json"),
+            },
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -54,19 +103,118 @@ def create_event(
         ) from e
 
 
+@router.post(
+    ":batch",
+    response_model=BatchCreateResponse,
+    summary="Create corporate action events in bulk",
+)
+async def create_events_batch(
+    request: Request,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> BatchCreateResponse | Response:
+    """
+    Create many events in one request.
+    
+    Accepts either a JSON array of event objects or a streamed NDJSON body
+    (``Content-Type: application/x-ndjson``, one event per line). Each
+    record is validated with the same schema as ``POST /events`` and
+    valid records are inserted in chunks with multi-row INSERTs.
+    
+    Chunks are inserted as soon as they fill, so an NDJSON upload is
+    written while it streams in and memory stays bounded by the chunk
+    size. Records past ``ingest_max_items`` are not inserted and are
+    reported as ``rejected``.
+    
+    A bad or duplicate record never aborts the batch: the response holds
+    one result per record (``created``, ``conflict`` for an existing
+    idempotency key, ``invalid`` or ``rejected``), in input order. If a
+    chunk fails unexpectedly, its records and every later one are
+    reported as ``failed`` (not written) alongside the chunks already
+    committed, with a 500 status.
+    """
+    results: list[BatchItemResult] = []
+    chunk: list[tuple[int, EventCreate]] = []
+    failed = False
+    
+    def not_created(index: int) -> BatchItemResult:
+        return BatchItemResult(index=index, status="failed", error="Not created: batch aborted")
+    
+    async def flush() -> None:
+        nonlocal failed
+        if not chunk:
+            return
+        try:
+            outcomes = await service.create_events([item for _, item in chunk], "api_user")
+        except Exception as e:
+            logger.error(f"Error in batch create: {e}", exc_info=True)
+            failed = True
+            results.extend(not_created(index) for index, _ in chunk)
+        else:
+            results.extend(
+                BatchItemResult(index=index, **outcome)
+                for (index, _), outcome in zip(chunk, outcomes, strict=True)
+            )
+        chunk.clear()
+    
+    async for index, record in _iter_batch_records(request):
+        if failed:
+            results.append(not_created(index))
+            continue
+        if index >= settings.ingest_max_items:
+            results.append(BatchItemResult(
+                index=index,
+                status="rejected",
+                error=f"Batch exceeds {settings.ingest_max_items} records",
+            ))
+            continue
+        try:
+            chunk.append((index, _parse_batch_record(record)))
+        except (ValueError, ValidationError) as e:
+            results.append(BatchItemResult(index=index, status="invalid", error=_error_text(e)))
+            continue
+        if len(chunk) >= settings.ingest_chunk_size:
+            await flush()
+    await flush()
+    
+    results.sort(key=lambda r: r.index)
+    response = BatchCreateResponse(
+        total=len(results),
+        created=sum(r.status == "created" for r in results),
+        conflicts=sum(r.status == "conflict" for r in results),
+        invalid=sum(r.status == "invalid" for r in results),
+        failed=sum(r.status == "failed" for r in results),
+        rejected=sum(r.status == "rejected" for r in results),
+        results=results,
+    )
+    if failed:
+        # The body still says exactly which records were written
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content=response.model_dump(mode="json"),
+        )
+    return response
+
+
 @router.get(
     "",
     response_model=EventList,
     summary="List corporate action events",
 )
-def list_events(
-    db: Annotated[Session, Depends(get_db)],
+async def list_events(
+    request: Request,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
-    event_type: EventType | None = None,
-    status: EventStatus | None = None,
-    symbol: str | None = None,
-) -> EventList:
+    event_type: Annotated[list[str] | None, Query()] = None,
+    status_filter: Annotated[list[str] | None, Query(alias="status")] = None,
+    symbol: Annotated[list[str] | None, Query()] = None,
+    target_symbol: str | None = None,
+    date_field: Literal["ex_date", "record_date", "payment_date", "effective_date"] = "ex_date",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    count: Literal["exact", "cached", "none"] = "exact",
+) -> Response:
     """
     List events with optional filters and pagination.
     
@@ -75,27 +223,71 @@ def list_events(
     - status: Filter by processing status
     - symbol: Filter by security symbol
     
+    Each of these takes several values, repeated (`symbol=AAPL&symbol=MSFT`)
+    or comma-separated (`status=FAILED,PENDING`), matched with `IN`; up
+    to 1000 values per filter. For larger watchlists use `POST
+    /events/calendar`.
+    
+    - target_symbol: Filter by merger target symbol
+    - date_from / date_to: Inclusive range on `date_field` (`ex_date`,
+      `record_date`, `payment_date` or `effective_date`; indexed per
+      event type)
+    
     **Pagination:**
-    - skip: Number of records to skip
+    - cursor: Pass the previous page's `next_cursor` to fetch the next page
+      (preferred; cost does not grow with depth)
+    - skip: Number of records to skip (ignored when cursor is given)
     - limit: Maximum records to return (1-100)
-    """
-    service = EventService(db)
+    - count: `exact` total, `cached` (recent, may lag by a few seconds) or
+      `none` to skip counting
     
+    Responses carry an ETag (except with `count=cached`, whose totals lag
+    the data); send it back in `If-None-Match` to get a 304 when no event
+    has changed since.
+    """
+    event_types = _split_values(event_type, EventType, "event_type")
+    statuses = _split_values(status_filter, EventStatus, "status")
+    symbols = _split_values(symbol, str, "symbol")
     try:
-        events, total = service.list_events(
+        etag = None
+        if count != "cached":
+            sequence = await service.get_change_sequence()
+            etag = make_etag("events", sequence, request.url.query)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+        
+        rows, total, next_cursor = await service.list_event_rows(
             skip=skip,
             limit=limit,
-            event_type=event_type,
-            status=status,
-            symbol=symbol,
+            event_type=event_types,
+            status=statuses,
+            symbol=symbols,
+            target_symbol=target_symbol,
+            date_field=date_field,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+            count=count,
         )
         
-        return EventList(
-            events=[EventResponse.model_validate(e) for e in events],
-            total=total,
-            page=skip // limit + 1,
-            page_size=limit,
+        # Rows go straight to JSON bytes; no ORM entities or models per row
+        body = EVENT_LIST_JSON.dump_json({
+            "events": rows,
+            "total": total,
+            "page": None if cursor else skip // limit + 1,
+            "page_size": limit,
+            "next_cursor": next_cursor,
+        })
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=etag_headers(etag) if etag is not None else None,
         )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
     except Exception as e:
         logger.error(f"Error listing events: {e}", exc_info=True)
         raise HTTPException(
@@ -104,30 +296,214 @@ def list_events(
         ) from e
 
 
+@router.post(
+    "/calendar",
+    summary="Stream events in a date window",
+    response_class=StreamingResponse,
+)
+async def event_calendar(
+    query: CalendarQuery,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> StreamingResponse:
+    """
+    Stream every event whose date falls in a window, for a watchlist.
+    
+    One request replaces a `GET /events` call per symbol and page: the
+    whole watchlist runs as a single indexed query whose rows are
+    streamed back as NDJSON (one EventResponse object per line), ordered
+    by date, symbol and id.
+    
+    **Body:**
+    - date_from / date_to: Inclusive window on `date_field` (`ex_date`,
+      `record_date`, `payment_date` or `effective_date`)
+    - symbols: Watchlist (empty for all symbols)
+    - event_types: Event types (empty for all; giving them lets the
+      window use the per-type date index)
+    - statuses: Processing statuses (empty for all)
+    """
+    if len(query.symbols) > settings.calendar_max_symbols:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Calendar queries accept at most {settings.calendar_max_symbols} symbols",
+        )
+    return StreamingResponse(
+        _calendar_lines(service, query),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _calendar_lines(service: AsyncEventService, query: CalendarQuery) -> AsyncIterator[bytes]:
+    """Yield NDJSON lines, one fetched batch at a time."""
+    async for rows in service.stream_calendar(query, settings.calendar_fetch_size):
+        yield b"".join(EVENT_ROW_JSON.dump_json(row) + b"\n" for row in rows)
+
+
+@router.get(
+    "/audit/export",
+    summary="Stream the audit trail for a time window",
+    response_class=StreamingResponse,
+)
+async def export_audit_log(
+    start: datetime,
+    end: datetime,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+    export_format: Annotated[Literal["ndjson", "csv"], Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """
+    Stream every audit entry with `start <= timestamp < end`.
+    
+    Entries are ordered by timestamp and id and read through a
+    server-side cursor on a read replica (when configured), a batch at a
+    time, so exports of millions of rows run in flat memory.
+    
+    **Parameters:**
+    - start / end: Window bounds (ISO 8601; naive times are UTC)
+    - format: `ndjson` (one AuditLogResponse object per line) or `csv`
+      (header row first; `changes` as a JSON string)
+    """
+    start, end = _naive_utc(start), _naive_utc(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end must be after start",
+        )
+    batches = service.stream_audit_log(start, end, settings.audit_export_fetch_size)
+    if export_format == "csv":
+        return StreamingResponse(
+            _audit_csv_lines(batches),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="audit_logs.csv"'},
+        )
+    return StreamingResponse(_audit_ndjson_lines(batches), media_type="application/x-ndjson")
+
+
+async def _audit_ndjson_lines(batches: AsyncIterator[list[AuditRow]]) -> AsyncIterator[bytes]:
+    """Yield NDJSON lines, one fetched batch at a time."""
+    async for rows in batches:
+        yield b"".join(AUDIT_ROW_JSON.dump_json(row) + b"\n" for row in rows)
+
+
+async def _audit_csv_lines(batches: AsyncIterator[list[AuditRow]]) -> AsyncIterator[str]:
+    """Yield the CSV header, then CSV text one fetched batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(AuditLogResponse.model_fields)
+    yield _drain(buffer)
+    async for rows in batches:
+        writer.writerows(
+            [
+                json.dumps(value, separators=(",", ":")) if name == "changes"
+                else value.isoformat() if isinstance(value, datetime)
+                else value
+                for name, value in row.items()
+            ]
+            for row in rows
+        )
+        yield _drain(buffer)
+
+
+@router.get(
+    "/stream",
+    summary="Push stream of event changes",
+    response_class=StreamingResponse,
+)
+async def stream_events(request: Request) -> StreamingResponse:
+    """
+    Server-Sent Events stream of event changes.
+    
+    **Event types:**
+    - created: New events with status/type count deltas
+    - status: Status transitions with status count deltas
+    - resync: The client fell behind, or another replica committed
+      changes; refetch the list and metrics
+    
+    created and status messages carry the change_sequence they committed
+    at; skip those at or below the change_sequence of the metrics
+    snapshot they would be applied to.
+    
+    A comment line is sent every few seconds while idle so proxies keep
+    the connection open.
+    """
+    return StreamingResponse(
+        _event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(request: Request) -> AsyncIterator[str]:
+    """Yield SSE frames for one subscriber until it disconnects."""
+    with broadcaster.subscribe() as subscription:
+        yield "retry: 3000\n\n"
+        while broadcaster.running and not await request.is_disconnected():
+            message = await subscription.get(settings.stream_heartbeat_seconds)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            frame = f"event: {message['type']}\ndata: {json.dumps(message)}\n"
+            if "sequence" in message:
+                frame = f"id: {message['sequence']}\n" + frame
+            yield frame + "\n"
+
+
 @router.get(
     "/{event_id}",
     response_model=EventResponse,
     summary="Get event by ID",
 )
-def get_event(
+async def get_event(
     event_id: int,
-    db: Annotated[Session, Depends(get_db)],
-) -> EventResponse:
+    request: Request,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> Response:
     """
     Retrieve a specific event by ID.
     
     Returns complete event details including payload and processing status.
+    Served from the event cache when possible. Honors `If-None-Match`
+    with a 304, checked without loading or serializing the event.
     """
-    service = EventService(db)
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Event {event_id} not found",
+    )
+    if request.headers.get("if-none-match"):
+        etag = await service.get_event_etag(event_id)
+        if etag is None:
+            raise not_found
+        if etag_matches(request, etag):
+            return not_modified(etag)
     
-    event = service.get_event(event_id)
-    if not event:
+    cached = await service.get_event_body(event_id)
+    if cached is None:
+        raise not_found
+    
+    return Response(
+        content=cached.body, media_type="application/json", headers=etag_headers(cached.etag)
+    )
+
+
+@router.get(
+    "/{event_id}/history",
+    response_model=EventHistory,
+    summary="Get an event's audit trail",
+)
+async def get_event_history(
+    event_id: int,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> EventHistory:
+    """
+    Retrieve every audit entry recorded for an event, oldest first.
+    
+    Entries archived by the audit retention job are no longer listed.
+    """
+    entries = await service.get_event_history(event_id)
+    if entries is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found",
         )
-    
-    return EventResponse.model_validate(event)
+    return EventHistory.model_validate({"event_id": event_id, "entries": entries})
 
 
 @router.post(
@@ -135,40 +511,147 @@ def get_event(
     response_model=EventResponse,
     summary="Cancel an event",
 )
-def cancel_event(
+async def cancel_event(
     event_id: int,
-    db: Annotated[Session, Depends(get_db)],
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
 ) -> EventResponse:
     """
     Cancel a pending or processing event.
     
     Completed or already cancelled events cannot be cancelled.
     """
-    service = EventService(db)
-    
-    event = service.get_event(event_id)
+    event = await service.get_event(event_id)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event {event_id} not found",
         )
     
-    if event.status in (EventStatus.COMPLETED, EventStatus.CANCELLED):
+    if event.status not in CANCELLABLE_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot cancel event with status {event.status.value}",
         )
     
-    updated = service.update_event_status(
-        event_id,
+    # Guarded on status so a concurrent completion is not overwritten
+    cancelled = await service.update_event_statuses(
+        [event_id],
         EventStatus.CANCELLED,
         user="api_user",
+        from_statuses=CANCELLABLE_STATUSES,
     )
     
+    updated = await service.get_event(event_id)
     if not updated:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to cancel event",
         )
     
+    if not cancelled:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot cancel event with status {updated.status.value}",
+        )
+    
     return EventResponse.model_validate(updated)
+
+
+async def _iter_batch_records(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """Yield (index, raw record) pairs from a JSON array or NDJSON body."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    
+    if content_type in NDJSON_MEDIA_TYPES:
+        index = 0
+        # Only the unterminated tail is kept between reads
+        buffer = bytearray()
+        async for data in request.stream():
+            buffer += data
+            start = 0
+            while (end := buffer.find(b"\n", start)) != -1:
+                line = bytes(buffer[start:end])
+                start = end + 1
+                if line.strip():
+                    yield index, line
+                    index += 1
+            del buffer[:start]
+        if buffer.strip():
+            yield index, bytes(buffer)
+        return
+    
+    try:
+        records = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Body must be a JSON array or NDJSON",
+        ) from e
+    if not isinstance(records, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Body must be a JSON array or NDJSON",
+        )
+    for index, record in enumerate(records):
+        yield index, record
+
+
+def _split_values(values: list[str] | None, kind: Callable[[str], T], name: str) -> list[T]:
+    """
+    Flatten repeated and comma-separated query values into a list.
+    
+    Raises:
+        HTTPException: 422 if a value is not a valid ``kind``
+    """
+    parsed: list[T] = []
+    for value in values or []:
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            try:
+                parsed.append(kind(item))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid {name} value: {item}",
+                ) from e
+    return parsed
+
+
+def _replayed(body: str) -> Response:
+    """200 response replaying a stored EventResponse body."""
+    return Response(
+        content=body, media_type="application/json", headers={"Idempotent-Replayed": "true"}
+    )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to the naive UTC the database stores."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    """Return and clear a text buffer's contents."""
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def _parse_batch_record(record: Any) -> EventCreate:
+    """Validate one batch record; NDJSON lines arrive as raw bytes."""
+    if isinstance(record, bytes):
+        return EventCreate.model_validate_json(record)
+    return EventCreate.model_validate(record)
+
+
+def _error_text(error: Exception) -> str:
+    """Flatten a validation error into a single line."""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}"
+            for err in error.errors()
+        )
+    return str(error)
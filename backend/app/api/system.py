@@ -3,13 +3,14 @@ import logging
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from app.core.database import get_db
-from app.schemas.event import HealthResponse, MetricsResponse
-from app.services.event_service import EventService
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.schemas.event import HealthResponse, MetricsResponse, ProcessorStatusResponse
+from app.services import event_counters
+from app.services.async_event_service import AsyncEventService, get_event_service
+from app.services.event_processor import processor
+from app.services.latency import latency_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +22,8 @@ router = APIRouter(tags=["system"])
     response_model=HealthResponse,
     summary="Health check endpoint",
 )
-def health_check(
-    db: Annotated[Session, Depends(get_db)],
+async def health_check(
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
 ) -> HealthResponse:
     """
     System health check.
@@ -36,7 +37,7 @@ def health_check(
     # Check database
     db_status = "healthy"
     try:
-        db.execute(text("SELECT 1"))
+        await service.ping()
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         db_status = "unhealthy"
@@ -57,9 +58,11 @@ def health_check(
     response_model=MetricsResponse,
     summary="System metrics",
 )
-def get_metrics(
-    db: Annotated[Session, Depends(get_db)],
-) -> MetricsResponse:
+async def get_metrics(
+    request: Request,
+    response: Response,
+    service: Annotated[AsyncEventService, Depends(get_event_service)],
+) -> MetricsResponse | Response:
     """
     Get aggregated system metrics.
     
@@ -68,13 +71,26 @@ def get_metrics(
     - Breakdown by type and status
     - Recent activity (1h, 24h)
     - Error rate
+    - Processing latency of the serving replica (latency_replica); it is
+      not aggregated across replicas
     
-    Useful for monitoring and dashboards.
+    Useful for monitoring and dashboards. The ETag changes with any event
+    write, each minute (rolling windows) and with new latency samples;
+    `If-None-Match` returns a 304 when none of those moved.
     """
-    service = EventService(db)
-    
     try:
-        metrics = service.get_metrics()
+        sequence = await service.get_change_sequence()
+        etag = make_etag(
+            "metrics",
+            sequence,
+            event_counters.bucket_for(datetime.utcnow()).isoformat(),
+            latency_tracker.version,
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        metrics = await service.get_metrics()
+        response.headers.update(etag_headers(etag))
         return MetricsResponse(**metrics)
     except Exception as e:
         logger.error(f"Error calculating metrics: {e}", exc_info=True)
@@ -82,3 +98,18 @@ def get_metrics(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to calculate metrics",
         ) from e
+
+
+@router.get(
+    "/processor",
+    response_model=ProcessorStatusResponse,
+    summary="Background processor status",
+)
+def get_processor_status() -> ProcessorStatusResponse:
+    """
+    Get background processor status.
+    
+    Returns the worker pool configuration and per-worker utilization
+    (fraction of time spent processing events since the pool started).
+    """
+    return ProcessorStatusResponse(**processor.get_stats())
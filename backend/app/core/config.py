@@ -1,7 +1,7 @@
 """Core application configuration."""
 import os
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -27,14 +27,82 @@ class Settings(BaseSettings):
     db_user: str = "corpactions"
     db_password: str = "corpactions_pass"
     db_name: str = "corporate_actions"
+    # Connection pool (per engine). Pre-ping "always" adds a round trip to
+    # every checkout; "idle" only pings connections idle longer than
+    # db_pool_pre_ping_idle_seconds
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pool_pre_ping_idle_seconds: float = 30.0
+    # Async driver for API requests ("asyncmy" or "aiomysql"); empty keeps
+    # the sync engine and runs queries in the threadpool
+    db_async_driver: str = ""
+    db_async_pool_size: int = 20
+    db_async_max_overflow: int = 20
+    # Read replicas for read-only queries (full SQLAlchemy URLs)
+    db_replica_urls: list[str] = []
+    # Reads stay on the primary this long after a client writes
+    read_your_writes_seconds: float = 5.0
     
     # API
     api_v1_prefix: str = "/api/v1"
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8000"]
     
+    list_count_cache_seconds: float = 5.0
+    list_count_cache_max_entries: int = 1000
+    # Values accepted per multi-value list filter (e.g. symbol=...&symbol=...)
+    list_max_filter_values: int = 1000
+    
+    # Bulk ingestion
+    ingest_chunk_size: int = 500
+    ingest_max_items: int = 50000
+    
+    # Audit log retention (monthly partitions; older ones are archived, then dropped)
+    audit_retention_months: int = 13
+    audit_partition_premake_months: int = 2
+    audit_archive_dir: str = "./audit-archive"
+    # Write audit entries to an unindexed outbox and move them into
+    # audit_logs in background batches
+    audit_outbox_enabled: bool = False
+    audit_outbox_batch_size: int = 500
+    audit_outbox_flush_interval_seconds: float = 0.5
+    # Rows fetched per batch by audit trail exports
+    audit_export_fetch_size: int = 1000
+    
+    # Calendar queries
+    calendar_max_symbols: int = 10000
+    calendar_fetch_size: int = 1000
+    
+    # Push stream (change sequence polling picks up other replicas; 0 disables it)
+    stream_client_queue_size: int = 100
+    stream_heartbeat_seconds: float = 15.0
+    stream_sequence_poll_seconds: float = 5.0
+    
+    # Event detail cache (0 entries disables it). The default backend is
+    # in-process: it never sees other replicas' invalidations, so their
+    # writes show up here only once entries expire after the TTL.
+    event_cache_max_entries: int = 10000
+    event_cache_ttl_seconds: float = 30.0
+    
+    # Idempotency key index (0 entries disables it)
+    idempotency_cache_max_entries: int = 100000
+    idempotency_bloom_capacity: int = 1000000
+    # How long POST /events replays the original response for a repeated key
+    idempotency_replay_ttl_seconds: float = 86400.0
+    
     # Security
     api_key: str = "demo_api_key_change_in_production"
-    
+
+    # Background processor
+    processor_workers: int = 4
+    processor_batch_size: int = 5
+    processor_poll_min_seconds: float = 0.1
+    processor_poll_max_seconds: float = 5.0
+    processor_lease_seconds: int = 60
+    processor_reap_interval_seconds: float = 15.0
+
     @property
     def database_url(self) -> str:
         """Construct database URL."""
@@ -42,6 +110,16 @@ class Settings(BaseSettings):
             f"mysql+mysqlconnector://{self.db_user}:{self.db_password}"
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
+    
+    @property
+    def async_database_url(self) -> str | None:
+        """Construct async database URL, if an async driver is configured."""
+        if not self.db_async_driver:
+            return None
+        return (
+            f"mysql+{self.db_async_driver}://{self.db_user}:{self.db_password}"
+            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
 
 
 @lru_cache
@@ -1,43 +1,416 @@
 """Database configuration and session management."""
 import logging
-from collections.abc import Generator
-from typing import Any
+import math
+import random
+import time
+from collections.abc import AsyncGenerator, Generator, Iterable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
 
 from app.core.config import get_settings
+from app.core.telemetry import DB_QUERY_LATENCY, POOL_CHECKOUT_WAIT, registry
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Cookie carrying the read-your-writes deadline (epoch seconds)
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+# Set per request: reads must see this client's recent writes
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+class _CheckoutTimer:
+    """Pool mixin that records how long checkouts wait for a connection."""
+    
+    metrics_name = "primary"
+    
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimer, QueuePool):
+    """QueuePool that records checkout wait."""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    """Async-adapted QueuePool that records checkout wait."""
+
+
+# Engines by metrics name, sampled by the pool gauges
+engines: dict[str, Engine] = {}
+
+
+def pool_options(pool_size: int, max_overflow: int) -> dict[str, Any]:
+    """Pool keyword arguments for create_engine, from settings."""
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        # "idle" pings from a checkout listener instead (see instrument_engine)
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+    }
+
+
+def pool_class(base: type[QueuePool], name: str) -> type[QueuePool]:
+    """Pool class whose checkout waits are labelled with ``name``."""
+    return type(f"{base.__name__}[{name}]", (base,), {"metrics_name": name})
+
+
+def instrument_engine(engine: Engine, name: str) -> Engine:
+    """
+    Register an engine for pool metrics and apply the pre-ping strategy.
+    
+    With ``db_pool_pre_ping="idle"`` a connection is only pinged when it
+    sat in the pool longer than ``db_pool_pre_ping_idle_seconds``, so a
+    busy pool pays no extra round trip per checkout while connections
+    dropped by the server during quiet periods are still replaced.
+    """
+    engines[name] = engine
+    if settings.db_pool_pre_ping == "idle":
+        idle_seconds = settings.db_pool_pre_ping_idle_seconds
+        
+        @event.listens_for(engine, "checkin")
+        def mark_idle(dbapi_connection: Any, connection_record: Any) -> None:
+            connection_record.info["idle_since"] = time.monotonic()
+        
+        @event.listens_for(engine, "checkout")
+        def ping_if_idle(dbapi_connection: Any, connection_record: Any, proxy: Any) -> None:
+            idle_since = connection_record.info.get("idle_since")
+            if idle_since is None or time.monotonic() - idle_since < idle_seconds:
+                return
+            try:
+                cursor = dbapi_connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+            except Exception as e:
+                # The pool discards this connection and checks out another
+                raise DisconnectionError("Idle connection failed pre-ping") from e
+    return engine
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """
+    Current pool occupancy per engine.
+    
+    Returns:
+        {engine name: {size, checked_out, idle, overflow}}
+    """
+    stats = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            stats[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+            }
+    return stats
+
+
+registry.gauge(
+    "db_pool_connections",
+    "Pooled database connections by state (checked_out = in use)",
+    lambda: {
+        (name, state): value
+        for name, stats in pool_stats().items()
+        for state, value in stats.items()
+    },
+    ["pool", "state"],
+)
+
+
 # Create engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
-    echo=settings.debug,
+engine = instrument_engine(
+    create_engine(
+        settings.database_url,
+        poolclass=pool_class(InstrumentedQueuePool, "primary"),
+        **pool_options(settings.db_pool_size, settings.db_max_overflow),
+        echo=settings.debug,
+    ),
+    "primary",
 )
 
+# Read replicas (optional)
+replica_engines = [
+    instrument_engine(
+        create_engine(
+            url,
+            poolclass=pool_class(InstrumentedQueuePool, f"replica-{index}"),
+            **pool_options(settings.db_pool_size, settings.db_max_overflow),
+            echo=settings.debug,
+        ),
+        f"replica-{index}",
+    )
+    for index, url in enumerate(settings.db_replica_urls)
+]
+
+
+class RoutingSession(Session):
+    """
+    Session that can send read-only queries to read replicas.
+    
+    Queries only go to a replica inside a ``replica_reads()`` block, and
+    never once the session has written (so a read after a write in the
+    same session sees it), nor while the current request must read its
+    own recent writes. Everything else, including processor claims,
+    uses the primary.
+    """
+    
+    def __init__(self, *args: Any, replicas: Sequence[Engine] = (), **kwargs: Any) -> None:
+        """
+        Initialize session.
+        
+        Args:
+            replicas: Engines eligible for read-only queries
+        """
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+        self._replica: Engine | None = None
+        self._replica_depth = 0
+        self._wrote = False
+    
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kw: Any) -> Any:
+        """Pick the primary or a replica for the next statement."""
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._wrote = True
+        elif (
+            self._replica_depth
+            and self.replicas
+            and not self._wrote
+            and not _primary_reads.get()
+        ):
+            # One replica per session, so a request's reads (e.g. an ETag
+            # version and the data it labels) never go back in time
+            if self._replica is None:
+                self._replica = random.choice(self.replicas)
+            return self._replica
+        return super().get_bind(mapper, clause=clause, **kw)
+    
+    @contextmanager
+    def replica_reads(self) -> Iterator[None]:
+        """Allow queries in this block to be served by a replica."""
+        self._replica_depth += 1
+        try:
+            yield
+        finally:
+            self._replica_depth -= 1
+
+
+def read_from_replica(db: Session) -> AbstractContextManager[None]:
+    """
+    Mark a block of read-only queries as replica-safe.
+    
+    A no-op for sessions that do not route (e.g. in tests).
+    """
+    if isinstance(db, RoutingSession):
+        return db.replica_reads()
+    return nullcontext()
+
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    replicas=replica_engines,
+)
+
+
+def create_async_engine_from_settings() -> "AsyncEngine | None":
+    """
+    Create the optional async engine for API requests.
+    
+    Returns:
+        Async engine, or None when no async driver is configured
+    """
+    if settings.async_database_url is None:
+        return None
+    # Imported lazily: the async extension needs greenlet and a driver
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=pool_class(InstrumentedAsyncQueuePool, "async-primary"),
+        # No threads to pin: concurrency is bounded by the database
+        **pool_options(settings.db_async_pool_size, settings.db_async_max_overflow),
+        echo=settings.debug,
+    )
+    instrument_engine(async_engine.sync_engine, "async-primary")
+    return async_engine
+
+
+def create_async_replica_engines() -> list["AsyncEngine"]:
+    """Create async engines for the read replicas, using the async driver."""
+    if settings.async_database_url is None:
+        return []
+    from sqlalchemy.ext.asyncio import create_async_engine
+    
+    replicas = []
+    for index, url in enumerate(settings.db_replica_urls):
+        name = f"async-replica-{index}"
+        replica = create_async_engine(
+            make_url(url).set(drivername=f"mysql+{settings.db_async_driver}"),
+            poolclass=pool_class(InstrumentedAsyncQueuePool, name),
+            **pool_options(settings.db_async_pool_size, settings.db_async_max_overflow),
+            echo=settings.debug,
+        )
+        instrument_engine(replica.sync_engine, name)
+        replicas.append(replica)
+    return replicas
+
+
+async_engine = create_async_engine_from_settings()
+async_replica_engines = create_async_replica_engines()
+
+
+def _async_session_factory() -> "async_sessionmaker[AsyncSession] | None":
+    if async_engine is None:
+        return None
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    
+    # Expired attributes cannot lazy-load outside the session's greenlet
+    return async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=[replica.sync_engine for replica in async_replica_engines],
+    )
+
+
+# Async session factory (None unless DB_ASYNC_DRIVER is set)
+AsyncSessionLocal = _async_session_factory()
+
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware that keeps a client's reads on the primary
+    for a short window after it writes.
+    
+    Write requests (anything but GET/HEAD/OPTIONS) always use the
+    primary and, when they succeed, set a cookie holding the end of the
+    window. Later requests carrying an unexpired cookie also read from
+    the primary, so ``POST /events`` followed by ``GET /events/{id}``
+    never observes replica lag. Being cookie-based, the window holds
+    across API replicas. Query endpoints that take their parameters in a
+    POST body are listed in ``read_only_paths`` and treated as reads.
+    """
+    
+    def __init__(
+        self,
+        app: Any,
+        window_seconds: float | None = None,
+        read_only_paths: Iterable[str] = (),
+    ) -> None:
+        """
+        Initialize middleware.
+        
+        Args:
+            app: Wrapped ASGI application
+            window_seconds: How long reads stick to the primary after a write
+            read_only_paths: Paths that never write, whatever their method
+        """
+        self.app = app
+        self.window_seconds = (
+            settings.read_your_writes_seconds if window_seconds is None else window_seconds
+        )
+        self.read_only_paths = frozenset(read_only_paths)
+    
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        """Route one request's reads."""
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        
+        writes = (
+            scope["method"] not in ("GET", "HEAD", "OPTIONS")
+            and scope["path"] not in self.read_only_paths
+        )
+        token = _primary_reads.set(writes or _primary_until(scope) > time.time())
+        
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if writes and message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{PRIMARY_UNTIL_COOKIE}={until:.3f}; "
+                    f"Max-Age={math.ceil(self.window_seconds)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _primary_reads.reset(token)
+
+
+def _primary_until(scope: dict[str, Any]) -> float:
+    """Read-your-writes deadline from the request cookie (0 if absent)."""
+    try:
+        return float(HTTPConnection(scope).cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
 
 # Base class for models
 Base = declarative_base()
 
 
-# Log slow queries
+_TIMED_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+# Time every statement
 @event.listens_for(Engine, "before_cursor_execute")
 def before_cursor_execute(
     conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
 ) -> None:
-    """Log SQL queries in debug mode."""
+    """Start the statement timer (and log SQL in debug mode)."""
     if settings.debug:
         logger.debug(f"SQL: {statement}")
         logger.debug(f"Parameters: {parameters}")
+    conn.info["query_start"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    """Observe statement execution time, labelled by SQL verb."""
+    start = conn.info.pop("query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    verb = statement[:8].split(None, 1)
+    operation = verb[0].upper() if verb else "OTHER"
+    if operation not in _TIMED_OPERATIONS:
+        operation = "OTHER"
+    DB_QUERY_LATENCY.labels(operation).observe(elapsed)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -54,8 +427,87 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Dependency for getting async database sessions.
+    
+    Yields:
+        Async database session that automatically closes after use.
+    
+    Raises:
+        RuntimeError: If no async driver is configured
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database engine is not configured")
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# Columns and indexes added to tables after they were first deployed.
+# create_all only creates missing tables, so upgrade_schema adds these to
+# existing ones. Additions must be nullable (or defaulted) to be safe on a
+# live table.
+SCHEMA_ADDITIONS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "corporate_action_events": (
+        (
+            # Promoted payload fields (filled in by app.services.payload_backfill)
+            "ex_date",
+            "record_date",
+            "payment_date",
+            "effective_date",
+            "target_symbol",
+            # Processing lease and timing
+            "lease_owner",
+            "lease_expires_at",
+            "queued_at",
+            "claimed_at",
+        ),
+        (
+            "ix_corporate_action_events_target_symbol",
+            "idx_status_created",
+            "idx_status_lease",
+            "idx_type_ex_date",
+            "idx_type_record_date",
+            "idx_type_payment_date",
+            "idx_type_effective_date",
+        ),
+    ),
+}
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """
+    Add the columns and indexes in SCHEMA_ADDITIONS that are missing.
+    
+    Idempotent: checks the live schema first, so it is safe to run on
+    every startup and before the payload backfill.
+    
+    Args:
+        bind: Engine for the database to upgrade
+    """
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table_name, (columns, indexes) in SCHEMA_ADDITIONS.items():
+            table = Base.metadata.tables.get(table_name)
+            if table is None or not inspector.has_table(table_name):
+                continue
+            quoted_table = conn.dialect.identifier_preparer.format_table(table)
+            existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+            for name in columns:
+                if name not in existing_columns:
+                    logger.info(f"Adding column {table_name}.{name}")
+                    column_ddl = CreateColumn(table.c[name]).compile(dialect=conn.dialect)
+                    conn.execute(text(f"ALTER TABLE {quoted_table} ADD COLUMN {column_ddl}"))
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+            for index in table.indexes:
+                if index.name in indexes and index.name not in existing_indexes:
+                    logger.info(f"Creating index {index.name} on {table_name}")
+                    index.create(conn)
+
+
 def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables and apply additive schema changes."""
     logger.info("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     logger.info("Database tables created successfully")
@@ -0,0 +1,365 @@
+"""Low-overhead Prometheus metrics and text exposition."""
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond queries up to slow requests
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _CounterChild:
+    """A single counter series."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    """A single histogram series with fixed upper bounds."""
+
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # One slot per bound plus the implicit +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class _Metric(ABC):
+    """
+    Labelled metric family.
+
+    Children are created on first use and cached by label values, so the
+    hot path is one dict lookup plus the child's update. Callers with
+    fixed labels can hold on to the child returned by ``labels``.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Any:
+        """Return the series for the given label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Create the series for one set of label values."""
+
+    def _series(self) -> list[tuple[tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _label_text(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labelnames, values, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def render(self) -> Iterable[str]:
+        """Yield exposition lines for this family."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled series."""
+        self.labels().inc(amount)
+
+    def render(self) -> Iterable[str]:
+        """Yield exposition lines for this family."""
+        for values, child in self._series():
+            yield f"{self.name}{self._label_text(values)} {_format(child.value)}"
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe into the unlabelled series."""
+        self.labels().observe(value)
+
+    def render(self) -> Iterable[str]:
+        """Yield exposition lines for this family."""
+        for values, child in self._series():
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = 'le="' + _format(bound) + '"'
+                yield f"{self.name}_bucket{self._label_text(values, le)} {cumulative}"
+            yield f"{self.name}_sum{self._label_text(values)} {_format(total)}"
+            yield f"{self.name}_count{self._label_text(values)} {cumulative}"
+
+
+class Gauge(_Metric):
+    """
+    Value sampled by a callback at scrape time.
+
+    Unlabelled gauges' callbacks return a number; labelled gauges'
+    callbacks return a mapping of label-value tuples to numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Any],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self) -> Any:
+        raise TypeError(f"{self.name} is sampled by its callback and has no series to update")
+
+    def render(self) -> Iterable[str]:
+        """Yield exposition lines for this family."""
+        value = self.callback()
+        if not self.labelnames:
+            yield f"{self.name} {_format(float(value))}"
+            return
+        for values, sample in sorted(value.items()):
+            yield f"{self.name}{self._label_text(values)} {_format(float(sample))}"
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family, returning the existing one on re-registration."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create (or fetch) a counter family."""
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create (or fetch) a histogram family."""
+        return self.register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Any],
+        labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        """Create (or replace) a callback gauge."""
+        gauge = Gauge(name, documentation, callback, labelnames)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        """Render every family in the Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the matched route template (e.g.
+    ``/api/v1/events/{event_id}``) rather than the raw path, so series
+    stay bounded. Streaming responses are timed until the body is done.
+    """
+
+    def __init__(self, app: Any, histogram: Histogram | None = None) -> None:
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            histogram: Histogram to observe into
+        """
+        self.app = app
+        self.histogram = histogram or REQUEST_LATENCY
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        """Time one request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = _route_template(scope)
+            self.histogram.labels(scope["method"], route, str(status_code)).observe(elapsed)
+
+
+def _route_template(scope: dict[str, Any]) -> str:
+    """
+    Rebuild the matched route template from the request path.
+
+    Path parameter values are swapped back for their ``{name}``
+    placeholders, which keeps label cardinality bounded by the number of
+    routes without depending on how the router exposes prefixes.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        value_text = str(value)
+        for index in range(len(segments) - 1, -1, -1):
+            if segments[index] == value_text:
+                segments[index] = "{" + name + "}"
+                break
+    return "/".join(segments)
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Global registry instance
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = registry.histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["operation"],
+)
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+)
+PROCESSOR_BATCH_SIZE = registry.histogram(
+    "processor_batch_size",
+    "Events claimed per processor batch",
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+STATUS_TRANSITIONS = registry.counter(
+    "event_status_transitions_total",
+    "Committed event status transitions",
+    ["from_status", "to_status"],
+)
+EVENT_CACHE_LOOKUPS = registry.counter(
+    "event_cache_lookups_total",
+    "Event detail cache lookups by result",
+    ["result"],
+)
+AUDIT_OUTBOX_FLUSH_LATENCY = registry.histogram(
+    "audit_outbox_flush_seconds",
+    "Time to move one batch of audit entries from the outbox into audit_logs",
+)
+AUDIT_OUTBOX_FLUSH_SIZE = registry.histogram(
+    "audit_outbox_flush_rows",
+    "Audit entries moved per outbox flush",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500),
+)
+IDEMPOTENCY_CHECKS = registry.counter(
+    "idempotency_checks_total",
+    "Idempotency key checks by how they were answered",
+    ["result"],
+)
@@ -3,13 +3,19 @@ import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import events, system
 from app.core.config import get_settings
-from app.core.database import init_db
+from app.core.database import ReadYourWritesMiddleware, SessionLocal, init_db
+from app.core.telemetry import CONTENT_TYPE, PrometheusMiddleware, registry
+from app.services.audit_outbox import audit_flusher
+from app.services.broadcaster import broadcaster
+from app.services.event_counters import ensure_counters
 from app.services.event_processor import processor
+from app.services.event_service import EventService
+from app.services.idempotency import idempotency_index
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +28,15 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def _read_change_sequence() -> int:
+    """Read the shared change sequence for the broadcaster's watcher."""
+    db = SessionLocal()
+    try:
+        return EventService(db).get_change_sequence()
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
@@ -29,7 +44,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     Handles startup and shutdown tasks:
     - Initialize database
-    - Start background processor
+    - Seed metrics counters on first run
+    - Load recent idempotency keys into the in-memory index
+    - Start push-stream broadcaster, background processor and, when
+      enabled, the audit outbox flusher
     - Clean shutdown
     """
     # Startup
@@ -38,18 +56,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         init_db()
         logger.info("Database initialized")
+        
+        db = SessionLocal()
+        try:
+            ensure_counters(db)
+            idempotency_index.rebuild(db)
+        finally:
+            db.close()
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
     
-    # Start background processor
+    # Start push-stream broadcaster and background workers
+    await broadcaster.start(read_sequence=_read_change_sequence)
     processor.start()
+    if settings.audit_outbox_enabled:
+        audit_flusher.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
     processor.stop()
+    # After the processor, so its last audit entries are flushed too
+    audit_flusher.stop()
+    await broadcaster.stop()
     logger.info("Application shutdown complete")
 
 
@@ -72,6 +103,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep a client's reads on the primary right after it writes
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    read_only_paths=[f"{settings.api_v1_prefix}/events/calendar"],
+)
+
+# Time every request by route
+app.add_middleware(PrometheusMiddleware)
+
 # Include routers
 app.include_router(system.router, prefix=settings.api_v1_prefix)
 app.include_router(events.router, prefix=settings.api_v1_prefix)
@@ -86,3 +126,9 @@ def root() -> dict[str, str]:
         "docs": "/docs",
         "health": f"{settings.api_v1_prefix}/health",
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,8 +1,8 @@
 """SQLAlchemy models for corporate action events."""
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import JSON, DateTime, Enum, Index, Numeric, String, Text
+from sqlalchemy import JSON, Date, DateTime, Enum, Index, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -61,10 +61,28 @@ class CorporateActionEvent(Base):
     # Event-specific data stored as JSON for flexibility
     payload: Mapped[dict] = mapped_column(JSON, nullable=False)
     
+    # Copied out of the payload on write so date-range queries can use
+    # indexes (older rows are filled in by app.services.payload_backfill)
+    ex_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    record_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    payment_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    effective_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    target_symbol: Mapped[str | None] = mapped_column(String(20), nullable=True, index=True)
+    
     # Processing metadata
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     retry_count: Mapped[int] = mapped_column(default=0, nullable=False)
     
+    # Processing lease (visibility timeout) held while PROCESSING
+    lease_owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    
+    # Processing timing: when the event last entered the queue and was last claimed
+    queued_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True, default=datetime.utcnow
+    )
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    
     # Compliance fields
     idempotency_key: Mapped[str | None] = mapped_column(String(255), unique=True, index=True)
     created_by: Mapped[str] = mapped_column(String(100), nullable=False, default="system")
@@ -73,6 +91,15 @@ class CorporateActionEvent(Base):
     __table_args__ = (
         Index("idx_symbol_created", "symbol", "created_at"),
         Index("idx_status_type", "status", "event_type"),
+        # Lets processor claims read the oldest pending rows in index order
+        Index("idx_status_created", "status", "created_at"),
+        # Lets the lease reaper range-scan expired PROCESSING rows only
+        Index("idx_status_lease", "status", "lease_expires_at"),
+        # Date-window queries ("DIVIDEND ex-dates this week") per event type
+        Index("idx_type_ex_date", "event_type", "ex_date"),
+        Index("idx_type_record_date", "event_type", "record_date"),
+        Index("idx_type_payment_date", "event_type", "payment_date"),
+        Index("idx_type_effective_date", "event_type", "effective_date"),
     )
 
 
@@ -106,3 +133,45 @@ class AuditLog(Base):
     correlation_id: Mapped[str | None] = mapped_column(String(100), index=True)
     
     __table_args__ = (Index("idx_event_timestamp", "event_id", "timestamp"),)
+
+
+class AuditOutbox(Base):
+    """
+    Audit entries waiting to be moved into audit_logs.
+    
+    Written in the same transaction as the change it records, so an entry
+    is durable exactly when the change is. The table has no secondary
+    indexes, which keeps the insert on the request path cheap; the
+    flusher pays for audit_logs' indexes in batches.
+    """
+    
+    __tablename__ = "audit_outbox"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_id: Mapped[int] = mapped_column(nullable=False)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
+    old_status: Mapped[str | None] = mapped_column(String(50))
+    new_status: Mapped[str] = mapped_column(String(50), nullable=False)
+    changes: Mapped[dict] = mapped_column(JSON, nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    user: Mapped[str] = mapped_column(String(100), nullable=False)
+    correlation_id: Mapped[str | None] = mapped_column(String(100))
+
+
+class IdempotencyRecord(Base):
+    """
+    Original response to a keyed create, replayed to retries.
+    
+    One row per idempotency key, written in the creating transaction and
+    deleted in batches once it expires.
+    """
+    
+    __tablename__ = "idempotency_records"
+    
+    idempotency_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    event_id: Mapped[int] = mapped_column(nullable=False)
+    # Hash of the request body, so a reused key with a different body is
+    # rejected instead of replayed
+    request_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,37 @@
+"""SQLAlchemy models for incrementally maintained event metrics."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class EventCounter(Base):
+    """
+    Running event count for one breakdown value.
+
+    Maintained in the same transaction as every create and status
+    transition, so metrics reads never aggregate the events table.
+    """
+
+    __tablename__ = "event_counters"
+
+    # Breakdown, e.g. ("status", "PENDING") or ("type", "DIVIDEND")
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class EventCountBucket(Base):
+    """
+    Events created per minute.
+
+    Rolling windows (1h, 24h) are served by summing at most 1440 buckets.
+    """
+
+    __tablename__ = "event_count_buckets"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    created: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,9 +1,10 @@
 """Pydantic schemas for request/response validation."""
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from typing_extensions import TypedDict  # pydantic requires it before Python 3.12
 
 from app.models.event import EventStatus, EventType
 
@@ -115,9 +116,143 @@ class EventList(BaseModel):
     """Paginated list of events."""
     
     events: list[EventResponse]
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     page_size: int
+    next_cursor: str | None = None
+
+
+class AuditLogResponse(BaseModel):
+    """Schema for one audit trail entry."""
+    
+    id: int
+    event_id: int
+    action: str
+    old_status: str | None = None
+    new_status: str
+    changes: dict[str, Any]
+    timestamp: datetime
+    user: str
+    correlation_id: str | None = None
+    
+    model_config = {"from_attributes": True}
+
+
+class EventHistory(BaseModel):
+    """Audit trail of one event, oldest entry first."""
+    
+    event_id: int
+    entries: list[AuditLogResponse]
+
+
+class CalendarQuery(BaseModel):
+    """Date-window query over a watchlist of symbols."""
+    
+    date_from: date
+    date_to: date
+    date_field: Literal["ex_date", "record_date", "payment_date", "effective_date"] = "ex_date"
+    symbols: list[str] = Field(default_factory=list, description="Empty for all symbols")
+    event_types: list[EventType] = Field(default_factory=list, description="Empty for all types")
+    statuses: list[EventStatus] = Field(default_factory=list, description="Empty for all")
+    
+    @field_validator("date_to")
+    @classmethod
+    def window_not_reversed(cls, v: date, info: Any) -> date:
+        """Validate the window ends on or after it starts."""
+        if info.data.get("date_from") and v < info.data["date_from"]:
+            raise ValueError("date_to must be on or after date_from")
+        return v
+    
+    @field_validator("symbols")
+    @classmethod
+    def normalize_symbols(cls, v: list[str]) -> list[str]:
+        """Uppercase and de-duplicate symbols."""
+        return sorted({symbol.strip().upper() for symbol in v if symbol.strip()})
+
+
+class EventRow(TypedDict):
+    """EventResponse fields as a plain dict (one selected row)."""
+    
+    id: int
+    event_type: EventType
+    symbol: str
+    status: EventStatus
+    payload: dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+    error_message: str | None
+    retry_count: int
+    idempotency_key: str | None
+    created_by: str
+
+
+class EventListRows(TypedDict):
+    """EventList with rows in place of EventResponse models."""
+    
+    events: list[EventRow]
+    total: int | None
+    page: int | None
+    page_size: int
+    next_cursor: str | None
+
+
+class AuditRow(TypedDict):
+    """AuditLogResponse fields as a plain dict (one selected row)."""
+    
+    id: int
+    event_id: int
+    action: str
+    old_status: str | None
+    new_status: str
+    changes: dict[str, Any]
+    timestamp: datetime
+    user: str
+    correlation_id: str | None
+
+
+# Serializes rows straight to the EventList JSON body, skipping model
+# construction and validation (rows come from the database, not clients)
+EVENT_LIST_JSON = TypeAdapter(EventListRows)
+EVENT_ROW_JSON = TypeAdapter(EventRow)
+AUDIT_ROW_JSON = TypeAdapter(AuditRow)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome for one record of a batch create request."""
+    
+    index: int
+    status: Literal["created", "conflict", "invalid", "failed", "rejected"]
+    event_id: int | None = None
+    error: str | None = None
+
+
+class BatchCreateResponse(BaseModel):
+    """Per-item results of a batch create request."""
+    
+    total: int
+    created: int
+    conflicts: int
+    invalid: int
+    failed: int = 0
+    rejected: int = 0
+    results: list[BatchItemResult]
+
+
+class LatencySummary(BaseModel):
+    """Latency distribution in seconds."""
+    
+    count: int
+    mean: float | None = None
+    p50: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+
+
+class EventTypeLatency(BaseModel):
+    """Processing and queue-wait latency for one event type."""
+    
+    processing: LatencySummary | None = None
+    queue_wait: LatencySummary | None = None
 
 
 class MetricsResponse(BaseModel):
@@ -129,7 +264,31 @@ class MetricsResponse(BaseModel):
     recent_events_1h: int
     recent_events_24h: int
     average_processing_time_seconds: float | None = None
+    latency_by_type: dict[str, EventTypeLatency] = Field(default_factory=dict)
+    latency_replica: str | None = Field(
+        None,
+        description="Replica that served the request; latency figures cover only its processor",
+    )
     error_rate: float
+    change_sequence: int | None = None
+
+
+class WorkerStatusResponse(BaseModel):
+    """Utilization snapshot for a single processor worker."""
+
+    name: str
+    events_processed: int
+    busy_seconds: float
+    utilization: float
+    current_event_id: int | None = None
+
+
+class ProcessorStatusResponse(BaseModel):
+    """Background processor status."""
+
+    running: bool
+    workers: list[WorkerStatusResponse]
+    batch_size: int
 
 
 class HealthResponse(BaseModel):
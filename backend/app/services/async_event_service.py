@@ -0,0 +1,219 @@
+"""Async counterpart of the event service for async route handlers."""
+import logging
+from collections.abc import AsyncIterator, Callable, Collection, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Annotated, Any, TypeVar, cast
+
+from fastapi import Depends
+from sqlalchemy import Select, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.core.database import AsyncSessionLocal, get_async_db, get_db, read_from_replica
+from app.core.etag import make_etag
+from app.models.event import CorporateActionEvent, EventStatus
+from app.schemas.event import AuditRow, CalendarQuery, EventCreate, EventResponse, EventRow
+from app.services.event_cache import CachedResponse, event_cache
+from app.services.event_service import EventService, audit_export_statement, calendar_statement
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def event_etag(
+    event_id: int, status: EventStatus, retry_count: int, updated_at: datetime
+) -> str:
+    """ETag for one event, from the columns every write changes."""
+    # Status and retry count cover writes within the updated_at resolution
+    return make_etag("event", event_id, status.value, retry_count, updated_at.isoformat())
+
+
+class AsyncEventService:
+    """
+    Awaitable facade over EventService.
+
+    With an AsyncSession the service logic runs through
+    ``AsyncSession.run_sync``, which drives the async driver from the
+    calling coroutine (no thread is held while the database works). With
+    a plain Session each call runs in the threadpool instead, so the same
+    routes work whether or not an async driver is configured.
+    """
+
+    def __init__(self, db: "AsyncSession | Session") -> None:
+        """Initialize service with an async or sync database session."""
+        self.db = db
+
+    async def create_event(
+        self, event_data: EventCreate, user: str = "system"
+    ) -> CorporateActionEvent:
+        """See EventService.create_event."""
+        return await self._run(lambda service: service.create_event(event_data, user))
+
+    async def create_events(
+        self, items: Sequence[EventCreate], user: str = "system"
+    ) -> list[dict[str, Any]]:
+        """See EventService.create_events."""
+        return await self._run(lambda service: service.create_events(items, user))
+
+    async def get_replay(self, event_data: EventCreate) -> str | None:
+        """See EventService.get_replay."""
+        return await self._run(lambda service: service.get_replay(event_data))
+
+    async def get_event(
+        self, event_id: int, allow_replica: bool = True
+    ) -> CorporateActionEvent | None:
+        """See EventService.get_event."""
+        return await self._run(lambda service: service.get_event(event_id, allow_replica))
+
+    async def get_event_body(self, event_id: int) -> CachedResponse | None:
+        """
+        Get an event's serialized EventResponse and ETag, reading through the cache.
+
+        Cache hits skip the database (and the threadpool) entirely. Misses
+        that fill the cache read the primary: a lagging replica could
+        return the version an invalidation just removed, and it would be
+        served until the TTL.
+
+        Returns:
+            ETag and JSON body, or None if the event does not exist
+        """
+        cached = event_cache.get(event_id)
+        if cached is not None:
+            return cached
+        token = event_cache.fill_token()
+        event = await self.get_event(event_id, allow_replica=not event_cache.enabled)
+        if event is None:
+            return None
+        response = CachedResponse(
+            event_etag(event.id, event.status, event.retry_count, event.updated_at),
+            EventResponse.model_validate(event).model_dump_json().encode(),
+        )
+        event_cache.put(event_id, response, token)
+        return response
+
+    async def get_event_etag(self, event_id: int) -> str | None:
+        """
+        Get an event's current ETag without serializing it.
+
+        Served from the cache, or from a primary-key lookup of the
+        event's version columns.
+
+        Returns:
+            ETag, or None if the event does not exist
+        """
+        cached = event_cache.get(event_id)
+        if cached is not None:
+            return cached.etag
+        version = await self._run(lambda service: service.get_event_version(event_id))
+        return event_etag(event_id, *version) if version else None
+
+    async def list_events(
+        self, **filters: Any
+    ) -> tuple[list[CorporateActionEvent], int | None, str | None]:
+        """See EventService.list_events (takes the same keyword arguments)."""
+        return await self._run(lambda service: service.list_events(**filters))
+
+    async def list_event_rows(
+        self, **filters: Any
+    ) -> tuple[list[EventRow], int | None, str | None]:
+        """See EventService.list_event_rows (takes the same keyword arguments)."""
+        return await self._run(lambda service: service.list_event_rows(**filters))
+
+    async def stream_calendar(
+        self, query: CalendarQuery, fetch_size: int = 1000
+    ) -> AsyncIterator[list[EventRow]]:
+        """
+        Stream a calendar query's rows in batches.
+
+        See EventService.iter_calendar. With a plain Session each batch is
+        fetched in the threadpool; with an AsyncSession the async driver
+        streams the result.
+        """
+        async for batch in self._stream(calendar_statement(query), fetch_size):
+            yield cast(list[EventRow], batch)
+
+    async def get_event_history(self, event_id: int) -> list[AuditRow] | None:
+        """See EventService.get_event_history."""
+        return await self._run(lambda service: service.get_event_history(event_id))
+
+    async def stream_audit_log(
+        self, start: datetime, end: datetime, fetch_size: int = 1000
+    ) -> AsyncIterator[list[AuditRow]]:
+        """Stream the audit trail for a window in batches, as stream_calendar does."""
+        async for batch in self._stream(audit_export_statement(start, end), fetch_size):
+            yield cast(list[AuditRow], batch)
+
+    async def update_event_statuses(
+        self,
+        event_ids: Sequence[int],
+        new_status: EventStatus,
+        error_message: str | None = None,
+        user: str = "system",
+        from_statuses: Collection[EventStatus] | None = None,
+    ) -> list[int]:
+        """See EventService.update_event_statuses."""
+        return await self._run(
+            lambda service: service.update_event_statuses(
+                event_ids,
+                new_status,
+                error_message=error_message,
+                user=user,
+                from_statuses=from_statuses,
+            )
+        )
+
+    async def get_change_sequence(self) -> int:
+        """See event_counters.read_change_sequence."""
+        return await self._run(lambda service: service.get_change_sequence())
+
+    async def get_metrics(self) -> dict[str, Any]:
+        """See EventService.get_metrics."""
+        return await self._run(lambda service: service.get_metrics())
+
+    async def ping(self) -> None:
+        """Round-trip a trivial query to check the database connection."""
+        await self._run(lambda service: service.db.execute(text("SELECT 1")))
+
+    async def _stream(
+        self, stmt: Select[Any], fetch_size: int
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream a read-only query's rows in batches on the session's execution model."""
+        if isinstance(self.db, Session):
+            batches = EventService(self.db).iter_rows(stmt, fetch_size)
+            async for batch in iterate_in_threadpool(batches):
+                yield batch
+            return
+        with read_from_replica(self.db.sync_session):
+            result = await self.db.stream(stmt.execution_options(yield_per=fetch_size))
+        async for partition in result.partitions():
+            yield [row._asdict() for row in partition]
+
+    async def _run(self, call: Callable[[EventService], T]) -> T:
+        """Run a sync service call on the session's execution model."""
+        if isinstance(self.db, Session):
+            db = self.db
+            return await run_in_threadpool(lambda: call(EventService(db)))
+        return await self.db.run_sync(lambda session: call(EventService(session)))
+
+
+async def _threaded_event_service(
+    db: Annotated[Session, Depends(get_db)],
+) -> AsyncEventService:
+    return AsyncEventService(db)
+
+
+async def _async_event_service(
+    db: Annotated[Any, Depends(get_async_db)],
+) -> AsyncEventService:
+    return AsyncEventService(db)
+
+
+# Dependency for route handlers: async sessions when an async driver is
+# configured, otherwise the sync session in the threadpool
+get_event_service = (
+    _async_event_service if AsyncSessionLocal is not None else _threaded_event_service
+)
@@ -0,0 +1,400 @@
+"""Monthly partitioning of audit_logs with archive-then-drop retention."""
+import argparse
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.event import AuditLog
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Catch-all partition that new months are split out of
+MAXVALUE_PARTITION = "pmax"
+
+AUDIT_COLUMNS = (
+    "id", "event_id", "action", "old_status", "new_status", "changes", "timestamp", "user",
+    "correlation_id",
+)
+
+
+class Partition(NamedTuple):
+    """One month of audit rows: timestamps in [start, end)."""
+
+    name: str
+    start: date
+    end: date
+
+
+def month_partition(day: date) -> Partition:
+    """The partition holding ``day``."""
+    start = day.replace(day=1)
+    return Partition(f"p{start:%Y%m}", start, add_months(start, 1))
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def plan_rotation(
+    existing: Iterable[Partition], today: date, retention_months: int, premake_months: int
+) -> tuple[list[Partition], list[Partition]]:
+    """
+    Decide which partitions to create and which to archive.
+
+    Args:
+        existing: Current month partitions
+        today: Reference date
+        retention_months: Whole months kept online before the current one
+        premake_months: Future months that must already have a partition
+
+    Returns:
+        Tuple of (partitions to create, expired partitions oldest first)
+    """
+    existing = list(existing)
+    names = {partition.name for partition in existing}
+    current = today.replace(day=1)
+    wanted = [month_partition(add_months(current, n)) for n in range(premake_months + 1)]
+    to_create = [partition for partition in wanted if partition.name not in names]
+    cutoff = add_months(current, -retention_months)
+    expired = sorted(
+        (partition for partition in existing if partition.end <= cutoff), key=lambda p: p.start
+    )
+    return to_create, expired
+
+
+class PartitionStore(ABC):
+    """Dialect-specific management of audit_logs partitions."""
+
+    @abstractmethod
+    def list_partitions(self, db: Session) -> list[Partition]:
+        """Month partitions currently holding (or ready for) audit rows."""
+
+    @abstractmethod
+    def create_partitions(self, db: Session, partitions: list[Partition]) -> None:
+        """Add empty partitions for upcoming months."""
+
+    @abstractmethod
+    def drop_partition(self, db: Session, partition: Partition) -> None:
+        """Remove a partition and every row in it."""
+
+    def ensure_partitioned(self, db: Session) -> None:  # noqa: B027 - optional conversion step
+        """Convert the table to the partitioned layout if it is not yet (no-op by default)."""
+
+
+class MySQLPartitionStore(PartitionStore):
+    """
+    Native RANGE COLUMNS partitioning on ``timestamp``.
+
+    Rows only ever go into the newest partition, so inserts append and
+    old months are removed with a metadata-only DROP PARTITION instead
+    of a huge DELETE. MySQL requires the partition column in every
+    unique key, so the primary key becomes (id, timestamp); id stays
+    AUTO_INCREMENT and unique in practice. ``idx_event_timestamp`` is
+    local to each partition, and history lookups bounded below by the
+    event's creation time only visit partitions from then on.
+    """
+
+    def list_partitions(self, db: Session) -> list[Partition]:
+        """Read month partitions from information_schema."""
+        names = db.execute(
+            text(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table "
+                "AND PARTITION_NAME IS NOT NULL"
+            ),
+            {"table": AuditLog.__tablename__},
+        ).scalars()
+        return sorted(
+            (_parse_partition(name) for name in names if name != MAXVALUE_PARTITION),
+            key=lambda partition: partition.start,
+        )
+
+    def create_partitions(self, db: Session, partitions: list[Partition]) -> None:
+        """Split new months out of the MAXVALUE partition (normally still empty)."""
+        if not partitions:
+            return
+        db.execute(text(
+            f"ALTER TABLE {AuditLog.__tablename__} REORGANIZE PARTITION {MAXVALUE_PARTITION} "
+            f"INTO ({_partition_clauses(partitions)})"
+        ))
+
+    def drop_partition(self, db: Session, partition: Partition) -> None:
+        """Drop the partition (metadata-only; no row-by-row delete)."""
+        db.execute(text(f"ALTER TABLE {AuditLog.__tablename__} DROP PARTITION {partition.name}"))
+
+    def ensure_partitioned(self, db: Session) -> None:
+        """
+        Partition the table by month, once.
+
+        Rebuilds the table, so the first run on a large table should be
+        scheduled like any other offline schema change.
+        """
+        if self.list_partitions(db):
+            return
+        oldest = db.execute(select(func.min(AuditLog.timestamp))).scalar()
+        current = date.today().replace(day=1)
+        month = (oldest.date() if oldest else current).replace(day=1)
+        partitions = []
+        while month <= current:
+            partitions.append(month_partition(month))
+            month = add_months(month, 1)
+        logger.info(f"Partitioning {AuditLog.__tablename__} into {len(partitions)} month(s)")
+        db.execute(text(
+            f"ALTER TABLE {AuditLog.__tablename__} "
+            "DROP PRIMARY KEY, ADD PRIMARY KEY (id, `timestamp`) "
+            f"PARTITION BY RANGE COLUMNS(`timestamp`) ({_partition_clauses(partitions)})"
+        ))
+
+
+class SimulatedPartitionStore(PartitionStore):
+    """
+    Month "partitions" over an unpartitioned table (SQLite, tests).
+
+    Every month between the oldest and newest row counts as a
+    partition; dropping one deletes its timestamp range.
+    """
+
+    def list_partitions(self, db: Session) -> list[Partition]:
+        """Months spanned by the table's rows."""
+        oldest, newest = db.execute(
+            select(func.min(AuditLog.timestamp), func.max(AuditLog.timestamp))
+        ).one()
+        if oldest is None:
+            return []
+        partitions = []
+        month = oldest.date().replace(day=1)
+        while month <= newest.date():
+            partitions.append(month_partition(month))
+            month = add_months(month, 1)
+        return partitions
+
+    def create_partitions(self, db: Session, partitions: list[Partition]) -> None:
+        """Nothing to create without native partitions."""
+
+    def drop_partition(self, db: Session, partition: Partition) -> None:
+        """Delete the partition's rows."""
+        db.execute(delete(AuditLog).where(*_in_partition(partition)))
+
+
+def partition_store(db: Session) -> PartitionStore:
+    """Partition store for the session's database."""
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        return MySQLPartitionStore()
+    return SimulatedPartitionStore()
+
+
+class AuditExporter(ABC):
+    """Writes a partition's rows to durable archive storage."""
+
+    @abstractmethod
+    def export(self, partition: Partition, batches: Iterator[list[dict[str, Any]]]) -> int:
+        """
+        Archive one partition.
+
+        Returns:
+            Number of rows written; the partition is only dropped when
+            this matches its row count
+        """
+
+
+class ParquetAuditExporter(AuditExporter):
+    """
+    Compressed columnar (Parquet) files, one per month.
+
+    Requires pyarrow (``pip install corporate-actions-api[archive]``).
+    Files are written under a temporary name and renamed when complete,
+    so a crash never leaves a partial archive that looks finished.
+    """
+
+    def __init__(self, directory: str | Path, compression: str = "zstd") -> None:
+        """
+        Initialize exporter.
+
+        Args:
+            directory: Archive directory (created if missing)
+            compression: Parquet codec
+        """
+        self.directory = Path(directory)
+        self.compression = compression
+
+    def export(self, partition: Partition, batches: Iterator[list[dict[str, Any]]]) -> int:
+        """Stream the partition's batches into ``audit_logs-<name>.parquet``."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError(
+                "Parquet export requires pyarrow: pip install corporate-actions-api[archive]"
+            ) from e
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("event_id", pa.int64()),
+            ("action", pa.string()),
+            ("old_status", pa.string()),
+            ("new_status", pa.string()),
+            # JSON text; the archive keeps the blob as written
+            ("changes", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("user", pa.string()),
+            ("correlation_id", pa.string()),
+        ])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{AuditLog.__tablename__}-{partition.name}.parquet"
+        partial = target.with_suffix(".parquet.partial")
+        rows = 0
+        with pq.ParquetWriter(partial, schema, compression=self.compression) as writer:
+            for batch in batches:
+                columns = {name: [row[name] for row in batch] for name in AUDIT_COLUMNS}
+                columns["changes"] = [_json_text(value) for value in columns["changes"]]
+                writer.write_table(pa.table(columns, schema=schema))
+                rows += len(batch)
+        os.replace(partial, target)
+        logger.info(f"Archived {rows} audit row(s) from {partition.name} to {target}")
+        return rows
+
+
+def iter_partition_rows(
+    db: Session, partition: Partition, chunk_size: int = 5000
+) -> Iterator[list[dict[str, Any]]]:
+    """Stream a partition's rows in batches with a server-side cursor."""
+    columns = [getattr(AuditLog, name) for name in AUDIT_COLUMNS]
+    result = db.execute(
+        select(*columns)
+        .where(*_in_partition(partition))
+        .order_by(AuditLog.timestamp, AuditLog.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for batch in result.partitions():
+        yield [row._asdict() for row in batch]
+
+
+def rotate_audit_partitions(
+    db: Session,
+    exporter: AuditExporter,
+    today: date | None = None,
+    retention_months: int | None = None,
+    premake_months: int | None = None,
+    chunk_size: int = 5000,
+) -> dict[str, Any]:
+    """
+    Create upcoming partitions and archive-then-drop expired ones.
+
+    An expired partition is only dropped after the exporter wrote as
+    many rows as it holds; otherwise rotation stops with an error and the
+    partition stays online for the next run.
+
+    Args:
+        db: Database session
+        exporter: Archive writer
+        today: Reference date (defaults to today)
+        retention_months: Months kept online (defaults to settings)
+        premake_months: Future partitions kept ready (defaults to settings)
+        chunk_size: Rows fetched per batch while exporting
+
+    Returns:
+        Dictionary with created (partition names) and archived
+        ({partition name: rows})
+
+    Raises:
+        RuntimeError: If an export's row count does not match
+    """
+    today = today or date.today()
+    retention_months = (
+        settings.audit_retention_months if retention_months is None else retention_months
+    )
+    premake_months = (
+        settings.audit_partition_premake_months if premake_months is None else premake_months
+    )
+    store = partition_store(db)
+    store.ensure_partitioned(db)
+    to_create, expired = plan_rotation(
+        store.list_partitions(db), today, retention_months, premake_months
+    )
+    store.create_partitions(db, to_create)
+
+    archived: dict[str, int] = {}
+    for partition in expired:
+        expected = db.execute(
+            select(func.count()).select_from(AuditLog).where(*_in_partition(partition))
+        ).scalar_one()
+        written = exporter.export(partition, iter_partition_rows(db, partition, chunk_size))
+        if written != expected:
+            raise RuntimeError(
+                f"Archive of {partition.name} wrote {written} of {expected} rows; not dropping"
+            )
+        store.drop_partition(db, partition)
+        db.commit()
+        archived[partition.name] = written
+        logger.info(f"Dropped audit partition {partition.name} ({written} rows archived)")
+
+    db.commit()
+    return {"created": [partition.name for partition in to_create], "archived": archived}
+
+
+def _parse_partition(name: str) -> Partition:
+    return month_partition(datetime.strptime(name[1:], "%Y%m").date())
+
+
+def _partition_clauses(partitions: list[Partition]) -> str:
+    clauses = [
+        f"PARTITION {partition.name} VALUES LESS THAN ('{partition.end.isoformat()}')"
+        for partition in partitions
+    ]
+    clauses.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(clauses)
+
+
+def _in_partition(partition: Partition) -> tuple[Any, Any]:
+    start = datetime.combine(partition.start, datetime.min.time())
+    end = datetime.combine(partition.end, datetime.min.time())
+    return AuditLog.timestamp >= start, AuditLog.timestamp < end
+
+
+def _json_text(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def main() -> None:
+    """Run one rotation against the configured database."""
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rotate and archive audit_logs partitions")
+    parser.add_argument("--archive-dir", default=settings.audit_archive_dir)
+    parser.add_argument("--retention-months", type=int, default=settings.audit_retention_months)
+    parser.add_argument(
+        "--premake-months", type=int, default=settings.audit_partition_premake_months
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    db = SessionLocal()
+    try:
+        summary = rotate_audit_partitions(
+            db,
+            ParquetAuditExporter(args.archive_dir),
+            retention_months=args.retention_months,
+            premake_months=args.premake_months,
+        )
+    finally:
+        db.close()
+    logger.info(f"Audit rotation complete: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Background group commit of audit entries from the outbox into audit_logs."""
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.telemetry import AUDIT_OUTBOX_FLUSH_LATENCY, AUDIT_OUTBOX_FLUSH_SIZE, registry
+from app.models.event import AuditLog, AuditOutbox
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+AUDIT_COLUMNS = (
+    "event_id",
+    "action",
+    "old_status",
+    "new_status",
+    "changes",
+    "timestamp",
+    "user",
+    "correlation_id",
+)
+
+
+def flush_audit_outbox(db: Session, batch_size: int = 500) -> int:
+    """
+    Move the oldest outbox entries into audit_logs.
+
+    The batch is copied with one multi-row INSERT and removed from the
+    outbox in the same transaction, so every entry lands in audit_logs
+    exactly once even if the flusher dies mid-batch. Entries keep the
+    timestamp they were written with. Rows are claimed with SKIP LOCKED,
+    so flushers on several pods drain disjoint batches.
+
+    Args:
+        db: Database session
+        batch_size: Maximum entries moved
+
+    Returns:
+        Number of entries moved
+    """
+    outbox = AuditOutbox.__table__
+    start = time.perf_counter()
+    rows = db.execute(
+        select(outbox.c.id, *(outbox.c[name] for name in AUDIT_COLUMNS))
+        .order_by(outbox.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        db.rollback()
+        return 0
+
+    db.execute(insert(AuditLog).values([
+        {name: getattr(row, name) for name in AUDIT_COLUMNS} for row in rows
+    ]))
+    db.execute(delete(outbox).where(outbox.c.id.in_([row.id for row in rows])))
+    db.commit()
+
+    AUDIT_OUTBOX_FLUSH_LATENCY.observe(time.perf_counter() - start)
+    AUDIT_OUTBOX_FLUSH_SIZE.observe(len(rows))
+    return len(rows)
+
+
+def read_outbox_backlog(db: Session) -> tuple[int, datetime | None]:
+    """Return (entries waiting, timestamp of the oldest one)."""
+    depth, oldest = db.execute(
+        select(func.count(), func.min(AuditOutbox.timestamp)).select_from(AuditOutbox)
+    ).one()
+    return depth, oldest
+
+
+class AuditOutboxFlusher:
+    """
+    Background thread draining the audit outbox.
+
+    Flushes back to back while full batches keep coming, then sleeps for
+    ``interval`` between polls. After every drain it samples the backlog,
+    which the depth and lag gauges report. ``stop`` drains what is left
+    before returning.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        interval: float = 0.5,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> None:
+        """
+        Initialize flusher.
+
+        Args:
+            batch_size: Maximum entries moved per transaction
+            interval: Seconds between polls once the outbox is drained
+            session_factory: Factory for the flusher's database sessions
+        """
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.session_factory = session_factory
+        self.depth = 0
+        self.oldest: datetime | None = None
+        self.thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        """Start the flusher thread."""
+        if self.thread is not None:
+            logger.warning("Audit outbox flusher already running")
+            return
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="audit-outbox-flusher", daemon=True)
+        self.thread.start()
+        logger.info("Audit outbox flusher started")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after a final drain."""
+        if self.thread is None:
+            return
+        self._stop_event.set()
+        self.thread.join(timeout=timeout)
+        if self.thread.is_alive():
+            logger.warning("Audit outbox flusher did not stop in time")
+        self.thread = None
+        logger.info("Audit outbox flusher stopped")
+
+    def drain(self) -> int:
+        """Flush until the outbox is empty, then sample the backlog."""
+        moved = 0
+        db = self.session_factory()
+        try:
+            while True:
+                count = flush_audit_outbox(db, self.batch_size)
+                moved += count
+                if count < self.batch_size:
+                    break
+            self.depth, self.oldest = read_outbox_backlog(db)
+        finally:
+            db.close()
+        return moved
+
+    def lag_seconds(self) -> float:
+        """Age of the oldest entry seen waiting at the last sample."""
+        if self.oldest is None:
+            return 0.0
+        return max(0.0, (datetime.utcnow() - self.oldest).total_seconds())
+
+    def stats(self) -> dict[str, Any]:
+        """Return the flusher's state and last backlog sample."""
+        return {
+            "running": self.thread is not None,
+            "depth": self.depth,
+            "lag_seconds": round(self.lag_seconds(), 3),
+        }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._drain_logged()
+            self._stop_event.wait(self.interval)
+        # Entries committed while stopping
+        self._drain_logged()
+
+    def _drain_logged(self) -> None:
+        try:
+            self.drain()
+        except Exception as e:
+            logger.error(f"Error flushing audit outbox: {e}", exc_info=True)
+
+
+# Global flusher instance
+audit_flusher = AuditOutboxFlusher(
+    batch_size=settings.audit_outbox_batch_size,
+    interval=settings.audit_outbox_flush_interval_seconds,
+)
+
+registry.gauge(
+    "audit_outbox_depth",
+    "Audit entries waiting in the outbox at the last flusher sample",
+    lambda: audit_flusher.depth,
+)
+registry.gauge(
+    "audit_outbox_lag_seconds",
+    "Age of the oldest audit entry waiting in the outbox at the last sample",
+    audit_flusher.lag_seconds,
+)
@@ -0,0 +1,237 @@
+"""Fan-out of event changes to push-stream subscribers."""
+import asyncio
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class Subscription:
+    """
+    One subscriber's bounded message queue.
+
+    A slow client never blocks the producer or other clients: when its
+    queue is full the queued messages are discarded and replaced by a
+    single resync notice, telling the client to refetch. Messages offered
+    while that notice is waiting are discarded too, since the refetch
+    covers them; a client never receives deltas older than its resync.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initialize subscription.
+
+        Args:
+            maxsize: Messages buffered before the client must resync
+        """
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self._resync_pending = False
+
+    def offer(self, message: dict[str, Any]) -> None:
+        """Enqueue a message, or replace the queue with a resync if it is full."""
+        if self._resync_pending:
+            self.dropped += 1
+        elif self.queue.full():
+            self.dropped += 1
+            self.request_resync()
+        else:
+            self.queue.put_nowait(message)
+
+    def request_resync(self) -> None:
+        """Discard queued messages and ask the client to refetch."""
+        if self._resync_pending:
+            return
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self._resync_pending = True
+        self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        """
+        Wait for the next message.
+
+        Returns:
+            The next message, a resync notice (with the total number of
+            messages dropped so far), or None if the timeout elapsed
+        """
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+        if message["type"] == "resync":
+            self._resync_pending = False
+            return {"type": "resync", "dropped": self.dropped}
+        return message
+
+
+class EventBroadcaster:
+    """
+    Broadcasts event changes to every push-stream subscriber.
+
+    ``publish`` may be called from any thread (request handlers and
+    processor workers commit in worker threads). Messages are handed to
+    the event loop and a single producer task fans each one out to all
+    subscription queues, so publishing costs the caller one thread-safe
+    call regardless of how many dashboards are connected.
+
+    Only changes committed by this replica are published as deltas.
+    Given a ``read_sequence`` callable, a watcher task polls the shared
+    change sequence while anyone is subscribed; when it moves past the
+    highest sequence published here, another replica committed changes
+    and every subscriber is sent a resync. A local commit that has not
+    reached the producer yet can trigger the same resync, which costs a
+    refetch but never loses a change.
+    """
+
+    def __init__(
+        self,
+        client_queue_size: int = 100,
+        inbox_size: int = 10000,
+        sequence_poll_interval: float = 5.0,
+    ) -> None:
+        """
+        Initialize broadcaster.
+
+        Args:
+            client_queue_size: Per-subscriber buffer before resyncing
+            inbox_size: Messages buffered for the producer task
+            sequence_poll_interval: Seconds between change sequence polls
+                (0 disables the watcher)
+        """
+        self.client_queue_size = client_queue_size
+        self.inbox_size = inbox_size
+        self.sequence_poll_interval = sequence_poll_interval
+        self._subscriptions: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inbox: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._watcher: asyncio.Task[None] | None = None
+        self._sequence = 0
+        # Highest change sequence published or resynced to
+        self._change_sequence: int | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the producer task is running."""
+        return self._task is not None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscriptions)
+
+    async def start(self, read_sequence: Callable[[], int] | None = None) -> None:
+        """
+        Start the producer task on the running event loop.
+
+        Args:
+            read_sequence: Blocking read of the shared change sequence;
+                enables the cross-replica watcher
+        """
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue(self.inbox_size)
+        self._task = asyncio.create_task(self._run(), name="event-broadcaster")
+        if read_sequence is not None and self.sequence_poll_interval > 0:
+            self._watcher = asyncio.create_task(
+                self._watch(read_sequence), name="event-broadcaster-watcher"
+            )
+
+    async def stop(self) -> None:
+        """Stop the producer and watcher tasks."""
+        tasks = [task for task in (self._task, self._watcher) if task is not None]
+        self._task = self._watcher = None
+        self._loop = None
+        self._change_sequence = None
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def publish(self, message: dict[str, Any]) -> None:
+        """
+        Broadcast a message to all subscribers (thread-safe).
+
+        A no-op when nobody is subscribed or the broadcaster is stopped.
+        """
+        loop = self._loop
+        if loop is None or not self._subscriptions:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, message)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    @contextmanager
+    def subscribe(self) -> Iterator[Subscription]:
+        """Register a subscription for the duration of the block."""
+        subscription = Subscription(self.client_queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def _enqueue(self, message: dict[str, Any]) -> None:
+        """Queue a message for the producer (runs on the event loop)."""
+        if self._inbox is None:
+            return
+        if self._inbox.full():
+            self._inbox.get_nowait()
+            logger.warning("Broadcast inbox full; dropped oldest message")
+        self._inbox.put_nowait(message)
+
+    def resync_all(self) -> None:
+        """Ask every subscriber to refetch (runs on the event loop)."""
+        for subscription in list(self._subscriptions):
+            subscription.request_resync()
+
+    async def _run(self) -> None:
+        """Single producer: fan each message out to every subscriber."""
+        assert self._inbox is not None
+        while True:
+            message = await self._inbox.get()
+            self._sequence += 1
+            message = {**message, "sequence": self._sequence}
+            change_sequence = message.get("change_sequence")
+            if change_sequence is not None:
+                self._change_sequence = max(self._change_sequence or 0, change_sequence)
+            for subscription in list(self._subscriptions):
+                subscription.offer(message)
+
+    async def _watch(self, read_sequence: Callable[[], int]) -> None:
+        """Resync subscribers when the change sequence moves without us."""
+        while True:
+            await asyncio.sleep(self.sequence_poll_interval)
+            if not self._subscriptions:
+                # New subscribers fetch a fresh snapshot; start over
+                self._change_sequence = None
+                continue
+            try:
+                current = await asyncio.to_thread(read_sequence)
+            except Exception as e:
+                logger.error(f"Error polling change sequence: {e}", exc_info=True)
+                continue
+            known = self._change_sequence
+            self._change_sequence = max(current, known or 0)
+            if known is not None and current > known:
+                self.resync_all()
+
+
+# Global broadcaster instance
+broadcaster = EventBroadcaster(
+    client_queue_size=settings.stream_client_queue_size,
+    sequence_poll_interval=settings.stream_sequence_poll_seconds,
+)
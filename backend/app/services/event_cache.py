@@ -0,0 +1,321 @@
+"""Read-through cache of serialized event responses."""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from app.core.config import get_settings
+from app.core.telemetry import EVENT_CACHE_LOOKUPS, registry
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Invalidations remembered for racing fills; older fills are refused
+INVALIDATION_HISTORY = 10000
+
+
+class CachedResponse(NamedTuple):
+    """A cached response body and the ETag it was served with."""
+
+    etag: str
+    body: bytes
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached response bodies.
+
+    Implementations bound their own size and expire entries after the
+    TTL given to ``set``. Every method must be safe to call from any thread.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+    @abstractmethod
+    def delete(self, keys: list[str]) -> None:
+        """Remove entries (missing keys are ignored)."""
+
+    def size(self) -> int | None:
+        """Number of stored entries, if cheaply known."""
+        return None
+
+    def clear(self) -> None:  # noqa: B027 - optional, shared stores are not cleared per replica
+        """Remove every entry (a no-op unless overridden)."""
+
+
+class InProcessCacheBackend(CacheBackend):
+    """
+    Bounded LRU with per-entry expiry, local to this process.
+
+    The default backend. Each replica keeps its own copy, so writes on
+    other replicas only become visible here when entries expire.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """
+        Initialize backend.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: list[str]) -> None:
+        """Remove entries."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def size(self) -> int:
+        """Number of stored entries (including expired ones not yet evicted)."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedCacheBackend(CacheBackend):
+    """
+    Adapter over a shared cache server client (e.g. ``redis.Redis``).
+
+    The client needs ``get(key)``, ``set(key, value, ex=seconds)`` and
+    ``delete(*keys)``. All replicas see the same entries, so an
+    invalidation on one replica takes effect everywhere. Backend errors
+    are logged and treated as misses; the database stays authoritative.
+    """
+
+    def __init__(self, client: Any, prefix: str = "event:") -> None:
+        """
+        Initialize backend.
+
+        Args:
+            client: Shared cache client
+            prefix: Namespace prepended to every key
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if missing or unavailable."""
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            return None
+        return value if isinstance(value, bytes) else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value with a server-side expiry."""
+        try:
+            self.client.set(self.prefix + key, value, ex=max(1, round(ttl)))
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {e}")
+
+    def delete(self, keys: list[str]) -> None:
+        """Remove entries."""
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            # Stale entries still expire after the TTL
+            logger.warning(f"Shared cache invalidation failed: {e}")
+
+
+class InMemorySharedClient:
+    """
+    Dict-backed stand-in for a shared cache client.
+
+    Used in tests: every SharedCacheBackend built on the same instance
+    behaves like a separate replica talking to one cache server.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._store: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the stored value unless expired."""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._store.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ex: int) -> None:
+        """Store a value for ``ex`` seconds."""
+        with self._lock:
+            self._store[key] = (time.monotonic() + ex, value)
+
+    def delete(self, *keys: str) -> int:
+        """Remove keys, returning how many existed."""
+        with self._lock:
+            return sum(self._store.pop(key, None) is not None for key in keys)
+
+
+class EventCache:
+    """
+    Read-through cache of serialized ``EventResponse`` bodies by event id.
+
+    Each body is stored with its ETag so conditional requests can be
+    answered from the cache too. Writers invalidate the ids they changed after committing. A reader
+    that misses takes a fill token *before* loading from the database and
+    hands it back with the body; if the event was invalidated in between,
+    the (possibly stale) body is not stored. Entries also expire after
+    the TTL, which bounds staleness from writes on other replicas when
+    the in-process backend is used.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, ttl: float = 30.0) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            backend: Storage backend; None disables caching
+            ttl: Seconds an entry is served before it is reloaded
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = EVENT_CACHE_LOOKUPS.labels("hit")
+        self._miss_counter = EVENT_CACHE_LOOKUPS.labels("miss")
+        self._generation = 0
+        self._invalidated: OrderedDict[int, int] = OrderedDict()
+        self._history_floor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a backend is attached."""
+        return self.backend is not None
+
+    def set_backend(self, backend: CacheBackend | None) -> None:
+        """Attach (or detach) the storage backend."""
+        self.backend = backend
+
+    def get(self, event_id: int) -> CachedResponse | None:
+        """Return the cached response, counting the hit or miss."""
+        if self.backend is None:
+            return None
+        value = self.backend.get(str(event_id))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        (self._miss_counter if value is None else self._hit_counter).inc()
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return CachedResponse(etag.decode(), body)
+
+    def fill_token(self) -> int:
+        """Token to pass to ``put`` for a body about to be loaded."""
+        with self._lock:
+            return self._generation
+
+    def put(self, event_id: int, response: CachedResponse, token: int) -> bool:
+        """
+        Store a freshly loaded response.
+
+        Args:
+            event_id: Event the body describes
+            response: ETag and serialized EventResponse
+            token: fill_token() taken before the body was loaded
+
+        Returns:
+            True if stored, False if the event changed since the token
+        """
+        if self.backend is None:
+            return False
+        with self._lock:
+            if token < self._history_floor or self._invalidated.get(event_id, -1) > token:
+                return False
+        # ETags never contain newlines, so the first one splits the value
+        value = response.etag.encode() + b"\n" + response.body
+        self.backend.set(str(event_id), value, self.ttl)
+        return True
+
+    def invalidate(self, event_ids: Iterable[int]) -> None:
+        """Drop cached bodies for events that changed."""
+        event_ids = list(event_ids)
+        if self.backend is None or not event_ids:
+            return
+        with self._lock:
+            self._generation += 1
+            for event_id in event_ids:
+                self._invalidated[event_id] = self._generation
+                self._invalidated.move_to_end(event_id)
+            while len(self._invalidated) > INVALIDATION_HISTORY:
+                _, generation = self._invalidated.popitem(last=False)
+                self._history_floor = generation
+        self.backend.delete([str(event_id) for event_id in event_ids])
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counts and current size (None if the backend cannot tell)."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": self.backend.size() if self.backend is not None else 0,
+        }
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counts."""
+        if self.backend is not None:
+            self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+# Global event cache instance
+event_cache = EventCache(
+    InProcessCacheBackend(settings.event_cache_max_entries)
+    if settings.event_cache_max_entries > 0
+    else None,
+    ttl=settings.event_cache_ttl_seconds,
+)
+
+registry.gauge(
+    "event_cache_entries",
+    "Event detail responses held by the local cache",
+    lambda: event_cache.stats()["entries"] or 0,
+)
@@ -0,0 +1,267 @@
+"""Incrementally maintained event counters backing the metrics endpoint."""
+import logging
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Table, case, delete, func, insert, select
+from sqlalchemy.dialects.mysql import Insert as MySQLInsert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.event import CorporateActionEvent, EventStatus, EventType
+from app.models.metrics import EventCountBucket, EventCounter
+
+logger = logging.getLogger(__name__)
+
+STATUS = "status"
+TYPE = "type"
+# Change sequence: bumped by every write, used as the list/metrics ETag version.
+# Striped over several rows (summed on read) so concurrent writers do not all
+# queue on one hot counter row.
+SEQUENCE = "sequence"
+CHANGES = "changes"
+SEQUENCE_STRIPES = 16
+
+# Buckets older than the widest window (plus slack) are pruned
+BUCKET_RETENTION = timedelta(hours=25)
+
+
+def bucket_for(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to its minute bucket."""
+    return timestamp.replace(second=0, microsecond=0)
+
+
+def _sequence_stripe() -> tuple[str, str]:
+    """Pick the sequence row this transaction bumps."""
+    return (SEQUENCE, f"{CHANGES}:{random.randrange(SEQUENCE_STRIPES):02d}")
+
+
+def record_created(
+    db: Session, created: list[tuple[EventType, datetime]]
+) -> None:
+    """
+    Count newly created (PENDING) events in the current transaction.
+
+    Args:
+        db: Database session
+        created: (event_type, created_at) for each new event
+    """
+    if not created:
+        return
+    counters: Counter[tuple[str, str]] = Counter()
+    buckets: Counter[datetime] = Counter()
+    counters[_sequence_stripe()] += 1
+    for event_type, created_at in created:
+        counters[(TYPE, event_type.value)] += 1
+        counters[(STATUS, EventStatus.PENDING.value)] += 1
+        buckets[bucket_for(created_at)] += 1
+    _increment(db, counters)
+    _increment_buckets(db, buckets)
+
+
+def record_transitions(
+    db: Session, old_statuses: list[EventStatus], new_status: EventStatus
+) -> None:
+    """
+    Move counts between statuses in the current transaction.
+
+    Args:
+        db: Database session
+        old_statuses: Previous status of each transitioned event
+        new_status: Status they all moved to
+    """
+    counters: Counter[tuple[str, str]] = Counter()
+    if old_statuses:
+        counters[_sequence_stripe()] += 1
+    for old_status in old_statuses:
+        if old_status != new_status:
+            counters[(STATUS, old_status.value)] -= 1
+            counters[(STATUS, new_status.value)] += 1
+    _increment(db, counters)
+
+
+def read_counters(db: Session, now: datetime | None = None) -> dict[str, Any]:
+    """
+    Read all counters and rolling windows with two small queries.
+
+    Returns:
+        Dictionary with events_by_type, events_by_status,
+        recent_events_1h, recent_events_24h and change_sequence (the
+        sequence these counts are as of)
+    """
+    now = now or datetime.utcnow()
+    by_dimension: dict[str, dict[str, int]] = {STATUS: {}, TYPE: {}}
+    change_sequence = 0
+    for dimension, key, value in db.query(
+        EventCounter.dimension, EventCounter.key, EventCounter.value
+    ):
+        if dimension == SEQUENCE:
+            change_sequence += value
+        elif value > 0 and dimension in by_dimension:
+            by_dimension[dimension][key] = value
+
+    one_hour_ago = bucket_for(now - timedelta(hours=1))
+    one_day_ago = bucket_for(now - timedelta(days=1))
+    recent_1h, recent_24h = db.query(
+        func.sum(
+            case((EventCountBucket.bucket_start >= one_hour_ago, EventCountBucket.created), else_=0)
+        ),
+        func.sum(EventCountBucket.created),
+    ).filter(EventCountBucket.bucket_start >= one_day_ago).one()
+
+    return {
+        "events_by_type": by_dimension[TYPE],
+        "events_by_status": by_dimension[STATUS],
+        "recent_events_1h": int(recent_1h or 0),
+        "recent_events_24h": int(recent_24h or 0),
+        "change_sequence": change_sequence,
+    }
+
+
+def read_change_sequence(db: Session) -> int:
+    """
+    Read the change sequence.
+
+    Every transaction that creates or transitions events increments one
+    stripe, so an unchanged sum means no event changed in between.
+    """
+    value = db.query(func.sum(EventCounter.value)).filter(
+        EventCounter.dimension == SEQUENCE
+    ).scalar()
+    return int(value or 0)
+
+
+def prune_buckets(db: Session, now: datetime | None = None) -> int:
+    """Delete minute buckets that fell out of every window."""
+    cutoff = bucket_for((now or datetime.utcnow()) - BUCKET_RETENTION)
+    result = cast(
+        CursorResult[Any],
+        db.execute(delete(EventCountBucket).where(EventCountBucket.bucket_start < cutoff)),
+    )
+    db.commit()
+    return result.rowcount
+
+
+def ensure_counters(db: Session) -> None:
+    """Seed counters from the events table if they have never been built."""
+    if db.query(EventCounter.key).first() is not None:
+        return
+    if db.query(CorporateActionEvent.id).first() is None:
+        return
+    rebuild_counters(db)
+
+
+def rebuild_counters(db: Session) -> None:
+    """
+    Recompute all counters and recent buckets from the events table.
+
+    Full aggregate; intended for first deployment or repair only.
+    """
+    logger.info("Rebuilding event counters...")
+    now = datetime.utcnow()
+    counters: Counter[tuple[str, str]] = Counter()
+    for event_type, count in db.query(
+        CorporateActionEvent.event_type, func.count(CorporateActionEvent.id)
+    ).group_by(CorporateActionEvent.event_type):
+        counters[(TYPE, event_type.value)] = count
+    for status, count in db.query(
+        CorporateActionEvent.status, func.count(CorporateActionEvent.id)
+    ).group_by(CorporateActionEvent.status):
+        counters[(STATUS, status.value)] = count
+
+    # Keep the sequence moving forward so old ETags never match again
+    counters[(SEQUENCE, f"{CHANGES}:00")] = read_change_sequence(db) + 1
+
+    buckets: Counter[datetime] = Counter()
+    recent = db.execute(
+        select(CorporateActionEvent.created_at)
+        .where(CorporateActionEvent.created_at >= now - BUCKET_RETENTION)
+        .execution_options(yield_per=1000)
+    )
+    for (created_at,) in recent:
+        buckets[bucket_for(created_at)] += 1
+
+    try:
+        db.execute(delete(EventCounter))
+        db.execute(delete(EventCountBucket))
+        _increment(db, counters)
+        _increment_buckets(db, buckets)
+        db.commit()
+    except IntegrityError:
+        # Another replica seeded the counters at the same time
+        db.rollback()
+        logger.info("Event counters were rebuilt concurrently; keeping theirs")
+        return
+    logger.info("Event counters rebuilt")
+
+
+def _increment(db: Session, deltas: Counter[tuple[str, str]]) -> None:
+    """Add deltas to counter rows, creating them on first use."""
+    rows = [
+        {"dimension": dimension, "key": key, "value": delta}
+        for (dimension, key), delta in sorted(deltas.items())
+        if delta
+    ]
+    _upsert_add(db, EventCounter.__table__, ["dimension", "key"], "value", rows)
+
+
+def _increment_buckets(db: Session, deltas: Counter[datetime]) -> None:
+    """Add creation counts to minute buckets, creating them on first use."""
+    rows = [
+        {"bucket_start": bucket_start, "created": delta}
+        for bucket_start, delta in sorted(deltas.items())
+        if delta
+    ]
+    _upsert_add(db, EventCountBucket.__table__, ["bucket_start"], "created", rows)
+
+
+def _upsert_add(
+    db: Session,
+    table: Table,
+    key_columns: list[str],
+    value_column: str,
+    rows: list[dict[str, Any]],
+) -> None:
+    """
+    Multi-row INSERT that adds to the value column on key conflict.
+
+    Rows are sorted by key by the callers so concurrent transactions lock
+    counter rows in the same order and cannot deadlock each other.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        mysql_stmt: MySQLInsert = mysql_insert(table).values(rows)
+        db.execute(
+            mysql_stmt.on_duplicate_key_update(
+                {value_column: table.c[value_column] + mysql_stmt.inserted[value_column]}
+            )
+        )
+    elif dialect == "sqlite":
+        sqlite_stmt: SQLiteInsert = sqlite_insert(table).values(rows)
+        db.execute(
+            sqlite_stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={value_column: table.c[value_column] + sqlite_stmt.excluded[value_column]},
+            )
+        )
+    else:
+        # Portable fallback: update existing rows, insert the rest
+        for row in rows:
+            key_filter = [table.c[column] == row[column] for column in key_columns]
+            updated = cast(
+                CursorResult[Any],
+                db.execute(
+                    table.update()
+                    .where(*key_filter)
+                    .values({value_column: table.c[value_column] + row[value_column]})
+                ),
+            )
+            if updated.rowcount == 0:
+                db.execute(insert(table).values(row))
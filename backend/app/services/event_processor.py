@@ -1,142 +1,408 @@
 """Background event processor with retry logic."""
 import logging
 import random
+import socket
 import threading
 import time
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.core.database import SessionLocal
-from app.models.event import EventStatus
-from app.services.event_service import EventService
+from app.core.telemetry import PROCESSOR_BATCH_SIZE, registry
+from app.models.event import CorporateActionEvent, EventStatus
+from app.services import event_counters
+from app.services.event_service import DEFAULT_LEASE_SECONDS, EventService
+from app.services.idempotency import expire_replay_records
+from app.services.latency import PROCESSING, QUEUE_WAIT, LatencyTracker, latency_tracker
+from app.services.notifier import EventNotifier, notifier
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+MAX_RETRIES = 3
+
+
+class WorkerStats:
+    """
+    Busy/idle accounting for a single processor worker.
+
+    Utilization is the fraction of the worker's lifetime spent
+    processing events (as opposed to polling or idling).
+    """
+
+    def __init__(self, name: str, owner: str | None = None) -> None:
+        """Initialize stats for the named worker."""
+        self.name = name
+        self.owner = owner or name
+        self.started_at = time.monotonic()
+        self.busy_seconds = 0.0
+        self.events_processed = 0
+        self.current_event_id: int | None = None
+        self._busy_since: float | None = None
+        self._lock = threading.Lock()
+
+    def begin(self, event_id: int) -> None:
+        """Mark the worker busy with an event."""
+        with self._lock:
+            self.current_event_id = event_id
+            self._busy_since = time.monotonic()
+
+    def end(self) -> None:
+        """Mark the worker idle again."""
+        with self._lock:
+            if self._busy_since is not None:
+                self.busy_seconds += time.monotonic() - self._busy_since
+            self._busy_since = None
+            self.current_event_id = None
+            self.events_processed += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a consistent view of the worker's counters."""
+        with self._lock:
+            now = time.monotonic()
+            busy = self.busy_seconds
+            if self._busy_since is not None:
+                busy += now - self._busy_since
+            elapsed = now - self.started_at
+            return {
+                "name": self.name,
+                "events_processed": self.events_processed,
+                "busy_seconds": round(busy, 3),
+                "utilization": round(busy / elapsed, 4) if elapsed > 0 else 0.0,
+                "current_event_id": self.current_event_id,
+            }
+
 
 class EventProcessor:
     """
     Background processor for corporate action events.
-    
+
     Simulates async processing with configurable failure rate
-    and automatic retry logic.
-    """
+    and automatic retry logic. Runs a pool of worker threads; each
+    worker claims its own batch of pending events and processes it
+    independently, so throughput scales with the worker count.
+
+    Claimed events are leased to the claiming worker. A reaper thread
+    returns events whose lease expired (e.g. the pod died mid-batch)
+    to the queue.
+
+    Idle workers sleep on the notifier, so a newly created event wakes
+    them immediately. Without a wakeup they poll with exponential
+    backoff: straight away while work exists, slowing toward
+    ``poll_max_interval`` while the queue stays empty.
     
-    def __init__(self, failure_rate: float = 0.1, processing_delay: float = 2.0) -> None:
+    Every attempt is timed: queue wait (queued until claimed) and
+    processing time (started until finished) feed the latency sketches
+    behind the metrics endpoint, and the timestamps are recorded in the
+    attempt's audit entry.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.1,
+        processing_delay: float = 2.0,
+        workers: int = 1,
+        batch_size: int = 10,
+        poll_min_interval: float = 0.1,
+        poll_max_interval: float = 5.0,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        reap_interval: float = 15.0,
+        session_factory: Callable[[], Session] = SessionLocal,
+        event_notifier: EventNotifier = notifier,
+        tracker: LatencyTracker = latency_tracker,
+    ) -> None:
         """
         Initialize processor.
-        
+
         Args:
             failure_rate: Probability of simulated failure (0.0 to 1.0)
             processing_delay: Delay in seconds to simulate processing
+            workers: Number of worker threads in the pool
+            batch_size: Maximum events a worker claims per cycle
+            poll_min_interval: First idle backoff step in seconds
+            poll_max_interval: Cap on the idle backoff in seconds
+            lease_seconds: Lease duration on claimed events
+            reap_interval: Seconds between expired-lease sweeps
+            session_factory: Factory for per-worker database sessions
+            event_notifier: Notifier that signals newly queued work
+            tracker: Latency sketches fed with per-event timings
         """
         self.failure_rate = failure_rate
         self.processing_delay = processing_delay
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.poll_min_interval = poll_min_interval
+        self.poll_max_interval = max(poll_min_interval, poll_max_interval)
+        self.lease_seconds = lease_seconds
+        self.reap_interval = reap_interval
+        self.session_factory = session_factory
+        self.notifier = event_notifier
+        self.tracker = tracker
         self.running = False
-        self.thread: threading.Thread | None = None
-    
+        self.threads: list[threading.Thread] = []
+        self.reaper_thread: threading.Thread | None = None
+        self.worker_stats: list[WorkerStats] = []
+        self._stop_event = threading.Event()
+
     def start(self) -> None:
-        """Start the background processor thread."""
+        """Start the background worker pool."""
         if self.running:
             logger.warning("Processor already running")
             return
-        
+
         self.running = True
-        self.thread = threading.Thread(target=self._process_loop, daemon=True)
-        self.thread.start()
-        logger.info("Event processor started")
-    
+        self._stop_event.clear()
+        hostname = socket.gethostname()
+        self.worker_stats = []
+        for i in range(self.workers):
+            name = f"event-processor-{i}"
+            self.worker_stats.append(WorkerStats(name, owner=f"{hostname}:{name}"))
+        self.threads = [
+            threading.Thread(
+                target=self._process_loop,
+                args=(stats,),
+                name=stats.name,
+                daemon=True,
+            )
+            for stats in self.worker_stats
+        ]
+        for thread in self.threads:
+            thread.start()
+        self.reaper_thread = threading.Thread(
+            target=self._reap_loop, name="event-processor-reaper", daemon=True
+        )
+        self.reaper_thread.start()
+        logger.info(f"Event processor started with {self.workers} worker(s)")
+
     def stop(self) -> None:
-        """Stop the background processor thread."""
+        """
+        Stop the worker pool.
+
+        Workers finish the event they are currently processing and hand
+        any claimed-but-unstarted events back to the queue before exiting.
+        """
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        self._stop_event.set()
+        self.notifier.wake()
+        deadline = time.monotonic() + self.processing_delay + 5
+        threads = [*self.threads, self.reaper_thread] if self.reaper_thread else self.threads
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning(f"Worker {thread.name} did not stop in time")
+        self.threads = []
+        self.reaper_thread = None
         logger.info("Event processor stopped")
-    
-    def _process_loop(self) -> None:
-        """Main processing loop."""
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get processor status with per-worker utilization.
+
+        Returns:
+            Dictionary with pool configuration and worker snapshots
+        """
+        return {
+            "running": self.running,
+            "workers": [stats.snapshot() for stats in self.worker_stats],
+            "batch_size": self.batch_size,
+        }
+
+    def _process_loop(self, stats: WorkerStats) -> None:
+        """Main processing loop for one worker."""
+        interval = self.poll_min_interval
         while self.running:
+            # Read before polling so a wakeup during the poll is not missed
+            seen = self.notifier.generation
+            processed = 0
             try:
-                db = SessionLocal()
+                db = self.session_factory()
                 try:
-                    self._process_pending_events(db)
+                    processed = self._process_pending_events(db, stats)
                 finally:
                     db.close()
             except Exception as e:
                 logger.error(f"Error in processor loop: {e}", exc_info=True)
-            
-            # Sleep between poll cycles
-            time.sleep(1)
-    
-    def _process_pending_events(self, db: Session) -> None:
+
+            if processed:
+                interval = self.poll_min_interval
+                continue
+
+            if not self.running:
+                break
+
+            if self.notifier.wait(seen, interval):
+                interval = self.poll_min_interval
+            else:
+                interval = min(interval * 2, self.poll_max_interval)
+
+    def _reap_loop(self) -> None:
+        """
+        Periodically return events with expired leases to the queue.
+
+        Also prunes metric buckets that aged out of every window and
+        expired idempotency replay records.
+        """
+        while not self._stop_event.wait(self.reap_interval):
+            try:
+                db = self.session_factory()
+                try:
+                    EventService(db).release_expired_leases()
+                    event_counters.prune_buckets(db)
+                    expire_replay_records(db)
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.error(f"Error in lease reaper: {e}", exc_info=True)
+
+    def _process_pending_events(self, db: Session, stats: WorkerStats) -> int:
         """
-        Process all pending events.
-        
+        Claim and process a batch of pending events.
+
+        Outcomes are collected while the batch is processed and written
+        back with one bulk transition per distinct outcome.
+
         Args:
             db: Database session
+            stats: Accounting for the worker doing the processing
+
+        Returns:
+            Number of events claimed
         """
         service = EventService(db)
-        
-        # Get pending events (limit to avoid overwhelming system)
-        events, _ = service.list_events(
-            status=EventStatus.PENDING,
-            limit=10,
+
+        # Claim is atomic in the database, so workers and replicas never overlap
+        events = service.claim_events(
+            self.batch_size,
+            owner=stats.owner,
+            lease_seconds=self.lease_seconds,
         )
-        
+        if events:
+            PROCESSOR_BATCH_SIZE.observe(len(events))
+
+        outcomes: dict[tuple[EventStatus, str | None], list[int]] = defaultdict(list)
+        timings: dict[int, dict[str, Any]] = {}
         for event in events:
+            self._record_queue_wait(event)
+
+        for index, event in enumerate(events):
+            if not self.running:
+                # Hand unstarted events back to the queue on shutdown
+                outcomes[(EventStatus.PENDING, None)].extend(e.id for e in events[index:])
+                break
+
+            stats.begin(event.id)
+            started_at = datetime.utcnow()
+            started = time.monotonic()
             try:
-                # Mark as processing
-                service.update_event_status(
-                    event.id,
-                    EventStatus.PROCESSING,
+                outcomes[self._process_event(event)].append(event.id)
+            finally:
+                stats.end()
+                elapsed = time.monotonic() - started
+                self.tracker.record(event.event_type, PROCESSING, elapsed)
+                timings[event.id] = {
+                    "timing": {
+                        "claimed_at": _isoformat(event.claimed_at),
+                        "started_at": started_at.isoformat(),
+                        "finished_at": datetime.utcnow().isoformat(),
+                        "processing_seconds": round(elapsed, 6),
+                    }
+                }
+
+        self._record_outcomes(service, outcomes, stats.owner, timings)
+        return len(events)
+
+    def _record_queue_wait(self, event: CorporateActionEvent) -> None:
+        """Feed the time an event spent queued before this claim."""
+        if event.queued_at is None or event.claimed_at is None:
+            return
+        wait = (event.claimed_at - event.queued_at).total_seconds()
+        self.tracker.record(event.event_type, QUEUE_WAIT, wait)
+
+    def _process_event(self, event: CorporateActionEvent) -> tuple[EventStatus, str | None]:
+        """
+        Process a single claimed event.
+
+        Returns:
+            Tuple of (new_status, error_message) describing the outcome
+        """
+        try:
+            # Simulate processing
+            logger.info(f"Processing event {event.id} ({event.event_type.value})")
+            time.sleep(self.processing_delay)
+
+            # Simulate random failures
+            if random.random() < self.failure_rate and event.retry_count < MAX_RETRIES:
+                error_msg = "Simulated processing failure (will retry)"
+                logger.warning(f"Event {event.id} failed: {error_msg}")
+                return EventStatus.PENDING, error_msg  # Back to pending for retry
+
+            if event.retry_count >= MAX_RETRIES:
+                # Max retries exceeded
+                error_msg = f"Max retries ({MAX_RETRIES}) exceeded"
+                logger.error(f"Event {event.id} permanently failed: {error_msg}")
+                return EventStatus.FAILED, error_msg
+
+            # Success
+            logger.info(f"Event {event.id} completed successfully")
+            return EventStatus.COMPLETED, None
+
+        except Exception as e:
+            logger.error(f"Error processing event {event.id}: {e}", exc_info=True)
+            return EventStatus.FAILED, str(e)
+
+    def _record_outcomes(
+        self,
+        service: EventService,
+        outcomes: dict[tuple[EventStatus, str | None], list[int]],
+        owner: str,
+        timings: dict[int, dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Write batch outcomes back with one bulk transition per outcome.
+
+        Transitions are guarded on ``owner`` still holding the lease; if a
+        lease expired and the event was reclaimed, this attempt's result
+        is discarded.
+        """
+        for (new_status, error_message), event_ids in outcomes.items():
+            try:
+                service.update_event_statuses(
+                    event_ids,
+                    new_status,
+                    error_message=error_message,
                     user="processor",
+                    lease_owner=owner,
+                    audit_details=timings,
                 )
-                
-                # Simulate processing
-                logger.info(f"Processing event {event.id} ({event.event_type.value})")
-                time.sleep(self.processing_delay)
-                
-                # Simulate random failures
-                if random.random() < self.failure_rate and event.retry_count < 3:
-                    error_msg = "Simulated processing failure (will retry)"
-                    logger.warning(f"Event {event.id} failed: {error_msg}")
-                    service.update_event_status(
-                        event.id,
-                        EventStatus.PENDING,  # Back to pending for retry
-                        error_message=error_msg,
-                        user="processor",
-                    )
-                elif event.retry_count >= 3:
-                    # Max retries exceeded
-                    error_msg = "Max retries (3) exceeded"
-                    logger.error(f"Event {event.id} permanently failed: {error_msg}")
-                    service.update_event_status(
-                        event.id,
-                        EventStatus.FAILED,
-                        error_message=error_msg,
-                        user="processor",
-                    )
-                else:
-                    # Success
-                    logger.info(f"Event {event.id} completed successfully")
-                    service.update_event_status(
-                        event.id,
-                        EventStatus.COMPLETED,
-                        user="processor",
-                    )
-                
             except Exception as e:
-                logger.error(f"Error processing event {event.id}: {e}", exc_info=True)
-                try:
-                    service.update_event_status(
-                        event.id,
-                        EventStatus.FAILED,
-                        error_message=str(e),
-                        user="processor",
-                    )
-                except Exception as inner_e:
-                    logger.error(f"Failed to update event status: {inner_e}")
+                logger.error(f"Failed to update status of events {event_ids}: {e}")
+                service.db.rollback()
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
 
 
 # Global processor instance
-processor = EventProcessor(failure_rate=0.05, processing_delay=1.5)
+processor = EventProcessor(
+    failure_rate=0.05,
+    processing_delay=1.5,
+    workers=settings.processor_workers,
+    batch_size=settings.processor_batch_size,
+    poll_min_interval=settings.processor_poll_min_seconds,
+    poll_max_interval=settings.processor_poll_max_seconds,
+    lease_seconds=settings.processor_lease_seconds,
+    reap_interval=settings.processor_reap_interval_seconds,
+)
+
+registry.gauge(
+    "processor_workers",
+    "Running processor worker threads (each holds at most one pooled connection)",
+    lambda: len(processor.threads),
+)
@@ -1,17 +1,152 @@
 """Service layer for corporate action event processing."""
+import base64
 import logging
-from datetime import datetime, timedelta
-from typing import Any
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from typing import Any, TypeVar, cast
 
-from sqlalchemy import func
+from sqlalchemy import ColumnElement, Select, func, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.event import AuditLog, CorporateActionEvent, EventStatus, EventType
-from app.schemas.event import EventCreate, EventResponse
+from app.core.config import get_settings
+from app.core.database import read_from_replica
+from app.core.telemetry import IDEMPOTENCY_CHECKS, STATUS_TRANSITIONS
+from app.models.event import (
+    AuditLog,
+    AuditOutbox,
+    CorporateActionEvent,
+    EventStatus,
+    EventType,
+    IdempotencyRecord,
+)
+from app.schemas.event import (
+    AuditLogResponse,
+    AuditRow,
+    CalendarQuery,
+    EventCreate,
+    EventResponse,
+    EventRow,
+)
+from app.services import event_counters
+from app.services.broadcaster import broadcaster
+from app.services.event_cache import event_cache
+from app.services.idempotency import (
+    DuplicateIdempotencyKeyError,
+    idempotency_index,
+    request_fingerprint,
+)
+from app.services.latency import latency_tracker
+from app.services.notifier import notifier
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+# Default processing lease before an event may be reclaimed
+DEFAULT_LEASE_SECONDS = 60
+
+LEASE_EXPIRED_MESSAGE = "Processing lease expired"
+
+# Recent list counts keyed by filters, least recently used first:
+# {filters: (expires_at, total)}
+_count_cache: OrderedDict[tuple[Any, ...], tuple[float, int]] = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+# Payload dates also stored in their own indexed columns
+PROMOTED_DATE_FIELDS = ("ex_date", "record_date", "payment_date", "effective_date")
+
+# Columns list_event_rows selects, in EventResponse field order
+EVENT_RESPONSE_COLUMNS = [
+    getattr(CorporateActionEvent, name) for name in EventResponse.model_fields
+]
+
+# Columns audit reads select, in AuditLogResponse field order
+AUDIT_COLUMNS = [getattr(AuditLog, name) for name in AuditLogResponse.model_fields]
+
+
+def promoted_fields(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Column values for the payload fields promoted to indexed columns.
+    
+    Args:
+        payload: Event payload as stored (dates as ISO strings)
+        
+    Returns:
+        Dictionary with ex_date, record_date, payment_date, effective_date
+        (dates or None) and target_symbol
+    """
+    values: dict[str, Any] = {}
+    for name in PROMOTED_DATE_FIELDS:
+        raw = payload.get(name)
+        try:
+            values[name] = date.fromisoformat(raw) if isinstance(raw, str) else None
+        except ValueError:
+            values[name] = None
+    values["target_symbol"] = payload.get("target_symbol")
+    return values
+
+
+def calendar_statement(query: CalendarQuery) -> Select[Any]:
+    """
+    Build the single query behind a calendar request.
+    
+    Selects the EventResponse columns for events whose ``date_field``
+    falls in the window, optionally restricted to symbols, types and
+    statuses (each an IN list), ordered by date, symbol and id. With
+    event types given, the window is a range scan of the matching
+    (event_type, date) index.
+    """
+    column = getattr(CorporateActionEvent, query.date_field)
+    stmt = select(*EVENT_RESPONSE_COLUMNS).where(column.between(query.date_from, query.date_to))
+    if query.event_types:
+        stmt = stmt.where(CorporateActionEvent.event_type.in_(query.event_types))
+    if query.symbols:
+        stmt = stmt.where(CorporateActionEvent.symbol.in_(query.symbols))
+    if query.statuses:
+        stmt = stmt.where(CorporateActionEvent.status.in_(query.statuses))
+    return stmt.order_by(column, CorporateActionEvent.symbol, CorporateActionEvent.id)
+
+
+def audit_export_statement(start: datetime, end: datetime) -> Select[Any]:
+    """
+    Build the query behind an audit trail export.
+    
+    Selects the AuditLogResponse columns for entries with ``start <=
+    timestamp < end``, in (timestamp, id) order: a range scan of the
+    timestamp index that only touches the partitions covering the window.
+    """
+    return (
+        select(*AUDIT_COLUMNS)
+        .where(AuditLog.timestamp >= start, AuditLog.timestamp < end)
+        .order_by(AuditLog.timestamp, AuditLog.id)
+    )
+
+
+def encode_cursor(created_at: datetime, event_id: int) -> str:
+    """Encode a list position as an opaque, URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, event_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(event_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
 
 class EventService:
     """Business logic for corporate action events."""
@@ -34,61 +169,24 @@ class EventService:
             Created event entity
             
         Raises:
-            ValueError: If idempotency key already exists
+            DuplicateIdempotencyKeyError: If idempotency key already exists
+                (carries the event created by the original submission)
         """
-        # Build payload from event-specific fields
-        payload: dict[str, Any] = {
-            "currency": event_data.currency,
-        }
+        key = event_data.idempotency_key
+        if key and idempotency_index.enabled:
+            original = self._find_by_idempotency_key(key)
+            if original is not None:
+                raise DuplicateIdempotencyKeyError(original)
         
-        # Add type-specific fields
-        if event_data.event_type == EventType.DIVIDEND:
-            payload.update({
-                "amount": str(event_data.amount) if event_data.amount else None,
-                "ex_date": event_data.ex_date.isoformat() if event_data.ex_date else None,
-                "record_date": (
-                    event_data.record_date.isoformat() if event_data.record_date else None
-                ),
-                "payment_date": (
-                    event_data.payment_date.isoformat() if event_data.payment_date else None
-                ),
-            })
-        elif event_data.event_type == EventType.STOCK_SPLIT:
-            payload.update({
-                "split_ratio_from": event_data.split_ratio_from,
-                "split_ratio_to": event_data.split_ratio_to,
-                "effective_date": (
-                    event_data.effective_date.isoformat() if event_data.effective_date else None
-                ),
-            })
-        elif event_data.event_type == EventType.MERGER:
-            payload.update({
-                "target_symbol": event_data.target_symbol,
-                "exchange_ratio": (
-                    str(event_data.exchange_ratio) if event_data.exchange_ratio else None
-                ),
-                "cash_component": (
-                    str(event_data.cash_component) if event_data.cash_component else None
-                ),
-                "effective_date": (
-                    event_data.effective_date.isoformat() if event_data.effective_date else None
-                ),
-            })
-        
-        # Create event
-        event = CorporateActionEvent(
-            event_type=event_data.event_type,
-            symbol=event_data.symbol.upper(),
-            status=EventStatus.PENDING,
-            payload=payload,
-            idempotency_key=event_data.idempotency_key,
-            created_by=user,
-        )
+        event = self._build_event(event_data, user)
+        payload = event.payload
         
         try:
             self.db.add(event)
             self.db.flush()  # Get the ID before audit log
             
+            event_counters.record_created(self.db, [(event.event_type, event.created_at)])
+            
             # Create audit log entry
             self._create_audit_log(
                 event_id=event.id,
@@ -98,54 +196,682 @@ class EventService:
                 changes={"payload": payload},
                 user=user,
             )
+            if key:
+                self._write_replay_records([(event, event_data)])
+            sequence = self._broadcast_sequence()
             
             self.db.commit()
             self.db.refresh(event)
+            if key:
+                idempotency_index.add(key, event.id)
+            
+            # Wake idle processor workers instead of waiting for their next poll
+            notifier.notify()
+            _announce_created([(event.id, event.event_type, event.symbol)], sequence)
             
             logger.info(f"Created event {event.id} for {event.symbol} ({event.event_type.value})")
             return event
             
         except IntegrityError as e:
             self.db.rollback()
-            if "idempotency_key" in str(e):
-                raise ValueError("Duplicate idempotency key") from e
-            raise
-    
-    def get_event(self, event_id: int) -> CorporateActionEvent | None:
-        """Get event by ID."""
-        return self.db.query(CorporateActionEvent).filter(
-            CorporateActionEvent.id == event_id
+            # The unique index is the final word: a key written by another
+            # process, or one the index forgot, still lands here
+            original = self._find_by_idempotency_key(key, use_index=False) if key else None
+            if original is None:
+                raise
+            IDEMPOTENCY_CHECKS.labels("conflict").inc()
+            raise DuplicateIdempotencyKeyError(original) from e
+    
+    def get_replay(self, event_data: EventCreate) -> str | None:
+        """
+        Get the original response to a repeated keyed create.
+        
+        One primary-key read of the replay record, skipped for keys the
+        idempotency index has never seen. The record is only replayed if
+        it has not expired and the request body matches the original.
+        
+        Args:
+            event_data: Event creation schema with an idempotency key
+            
+        Returns:
+            The original EventResponse JSON, or None to go on creating
+        """
+        key = event_data.idempotency_key
+        if not key or not idempotency_index.may_contain(key):
+            return None
+        record = self.db.execute(
+            select(IdempotencyRecord.request_hash, IdempotencyRecord.response).where(
+                IdempotencyRecord.idempotency_key == key,
+                IdempotencyRecord.expires_at > datetime.utcnow(),
+            )
         ).first()
+        if record is None or record.request_hash != request_fingerprint(event_data):
+            return None
+        IDEMPOTENCY_CHECKS.labels("replay").inc()
+        response: str = record.response
+        return response
+    
+    def create_events(
+        self, items: Sequence[EventCreate], user: str = "system"
+    ) -> list[dict[str, Any]]:
+        """
+        Create a chunk of events in a single transaction.
+        
+        Idempotency conflicts (against existing rows or earlier items in the
+        chunk) are detected up front with one indexed lookup, and the
+        remaining events and their audit rows are written with multi-row
+        INSERTs and one commit. Keyed events get replay records too, so a
+        retry through ``create_event``/``get_replay`` is answered with the
+        original response. If a concurrent writer claims one of the
+        keys mid-flight, the chunk falls back to item-by-item creation so
+        one conflict never aborts the rest.
+        
+        Args:
+            items: Validated event creation schemas
+            user: User creating the events
+            
+        Returns:
+            One result per item, in order, with ``status`` ("created" or
+            "conflict"), ``event_id`` and ``error``
+        """
+        results: list[dict[str, Any]] = [{} for _ in items]
+        keys = {item.idempotency_key for item in items if item.idempotency_key}
+        existing: dict[str, int] = {}
+        unknown: list[str] = []
+        for key in keys:
+            event_id = idempotency_index.get(key)
+            if event_id is not None:
+                existing[key] = event_id
+            elif idempotency_index.may_contain(key):
+                unknown.append(key)
+        if existing:
+            IDEMPOTENCY_CHECKS.labels("recent").inc(len(existing))
+        if len(keys) > len(existing) + len(unknown):
+            IDEMPOTENCY_CHECKS.labels("new").inc(len(keys) - len(existing) - len(unknown))
+        if unknown:
+            found = {
+                key: event_id
+                for key, event_id in self.db.query(
+                    CorporateActionEvent.idempotency_key, CorporateActionEvent.id
+                ).filter(CorporateActionEvent.idempotency_key.in_(unknown))
+                if key is not None
+            }
+            IDEMPOTENCY_CHECKS.labels("lookup").inc(len(unknown))
+            idempotency_index.add_many(found.items())
+            existing |= found
+        
+        pending: list[tuple[int, CorporateActionEvent]] = []
+        duplicates: dict[int, str] = {}
+        seen: set[str] = set()
+        for index, item in enumerate(items):
+            item_key = item.idempotency_key
+            if item_key and item_key in existing:
+                results[index] = _conflict(existing[item_key])
+            elif item_key and item_key in seen:
+                duplicates[index] = item_key
+            else:
+                if item_key:
+                    seen.add(item_key)
+                pending.append((index, self._build_event(item, user)))
+        
+        if pending:
+            try:
+                self.db.add_all([event for _, event in pending])
+                self.db.flush()  # Multi-row INSERT where the dialect supports RETURNING
+                event_counters.record_created(
+                    self.db, [(event.event_type, event.created_at) for _, event in pending]
+                )
+                self._write_audit_logs([
+                    self._audit_row(
+                        event_id=event.id,
+                        action="CREATE",
+                        old_status=None,
+                        new_status=EventStatus.PENDING.value,
+                        changes={"payload": event.payload},
+                        user=user,
+                    )
+                    for _, event in pending
+                ])
+                self._write_replay_records([
+                    (event, items[index]) for index, event in pending if event.idempotency_key
+                ])
+                created = [
+                    (index, event.id, event.idempotency_key, event.event_type, event.symbol)
+                    for index, event in pending
+                ]
+                sequence = self._broadcast_sequence()
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                logger.warning(
+                    "Bulk insert hit a concurrent idempotency conflict; retrying per item"
+                )
+                return self._create_events_individually(items, user)
+            
+            for index, event_id, created_key, _, _ in created:
+                results[index] = {"status": "created", "event_id": event_id, "error": None}
+                if created_key:
+                    existing[created_key] = event_id
+            idempotency_index.add_many((row[2], row[1]) for row in created if row[2])
+            
+            notifier.notify()
+            _announce_created([(row[1], row[3], row[4]) for row in created], sequence)
+            logger.info(f"Created {len(created)} event(s) in bulk")
+        
+        for index, key in duplicates.items():
+            results[index] = _conflict(existing.get(key))
+        
+        return results
+    
+    def get_event(
+        self, event_id: int, allow_replica: bool = True
+    ) -> CorporateActionEvent | None:
+        """
+        Get event by ID.
+        
+        Args:
+            event_id: Event to load
+            allow_replica: Whether a read replica may serve the lookup
+        """
+        # Bulk updates bypass the identity map; always reload the row
+        with read_from_replica(self.db) if allow_replica else nullcontext():
+            return self.db.query(CorporateActionEvent).filter(
+                CorporateActionEvent.id == event_id
+            ).populate_existing().first()
+    
+    def get_event_version(self, event_id: int) -> tuple[EventStatus, int, datetime] | None:
+        """
+        Get the columns that identify an event's current version.
+        
+        Returns:
+            (status, retry_count, updated_at), or None if the event does not exist
+        """
+        with read_from_replica(self.db):
+            row = self.db.query(
+                CorporateActionEvent.status,
+                CorporateActionEvent.retry_count,
+                CorporateActionEvent.updated_at,
+            ).filter(CorporateActionEvent.id == event_id).first()
+        return (row.status, row.retry_count, row.updated_at) if row else None
+    
+    def get_change_sequence(self) -> int:
+        """Current change sequence; see event_counters.read_change_sequence."""
+        with read_from_replica(self.db):
+            return event_counters.read_change_sequence(self.db)
     
     def list_events(
         self,
         skip: int = 0,
         limit: int = 100,
-        event_type: EventType | None = None,
-        status: EventStatus | None = None,
-        symbol: str | None = None,
-    ) -> tuple[list[CorporateActionEvent], int]:
+        event_type: EventType | Sequence[EventType] | None = None,
+        status: EventStatus | Sequence[EventStatus] | None = None,
+        symbol: str | Sequence[str] | None = None,
+        target_symbol: str | None = None,
+        date_field: str = "ex_date",
+        date_from: date | None = None,
+        date_to: date | None = None,
+        cursor: str | None = None,
+        count: str = "exact",
+    ) -> tuple[list[CorporateActionEvent], int | None, str | None]:
+        """
+        List events with filters and pagination, newest first.
+        
+        Pages are addressed either by ``skip`` (OFFSET) or, preferably, by
+        the opaque ``cursor`` returned with the previous page. Cursor pages
+        seek directly to (created_at, id) on the created_at indexes, so
+        their cost does not grow with depth. Served by a read replica when
+        one is configured.
+        
+        Args:
+            skip: Number of records to skip (ignored when cursor is given)
+            limit: Maximum records to return
+            event_type: Filter by event type (one or several)
+            status: Filter by processing status (one or several)
+            symbol: Filter by security symbol (one or several, at most
+                settings.list_max_filter_values)
+            target_symbol: Filter by merger target symbol
+            date_field: Promoted date column the date range applies to
+                (ex_date, record_date, payment_date or effective_date)
+            date_from: Earliest date_field value, inclusive
+            date_to: Latest date_field value, inclusive
+            cursor: Cursor from a previous page's next_cursor
+            count: "exact" runs COUNT(*), "cached" reuses a recent count for
+                the same filters, "none" skips the count
+            
+        Returns:
+            Tuple of (events, total_count or None, next_cursor or None)
+            
+        Raises:
+            ValueError: If the cursor or date_field is invalid, or a filter
+                has too many values
+        """
+        stmt = select(CorporateActionEvent)
+        filters = _list_filters(
+            event_type, status, symbol, target_symbol, date_field, date_from, date_to
+        )
+        total, stmt = self._list_statement(stmt, filters, skip, limit, cursor, count)
+        with read_from_replica(self.db):
+            events = list(self.db.scalars(stmt))
+        next_cursor = _trim_page(events, limit)
+        return events, total, next_cursor
+    
+    def list_event_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        event_type: EventType | Sequence[EventType] | None = None,
+        status: EventStatus | Sequence[EventStatus] | None = None,
+        symbol: str | Sequence[str] | None = None,
+        target_symbol: str | None = None,
+        date_field: str = "ex_date",
+        date_from: date | None = None,
+        date_to: date | None = None,
+        cursor: str | None = None,
+        count: str = "exact",
+    ) -> tuple[list[EventRow], int | None, str | None]:
+        """
+        Like list_events, but returns plain column dicts instead of entities.
+        
+        Selects only the EventResponse columns with a Core statement, so
+        rows skip the ORM identity map and can be serialized directly
+        (see EVENT_LIST_JSON).
+        
+        Returns:
+            Tuple of (rows, total_count or None, next_cursor or None)
+            
+        Raises:
+            ValueError: If the cursor or date_field is invalid, or a filter
+                has too many values
+        """
+        stmt = select(*EVENT_RESPONSE_COLUMNS)
+        filters = _list_filters(
+            event_type, status, symbol, target_symbol, date_field, date_from, date_to
+        )
+        total, stmt = self._list_statement(stmt, filters, skip, limit, cursor, count)
+        with read_from_replica(self.db):
+            rows = [cast(EventRow, row._asdict()) for row in self.db.execute(stmt)]
+        next_cursor = _trim_page(rows, limit)
+        return rows, total, next_cursor
+    
+    def iter_calendar(
+        self, query: CalendarQuery, fetch_size: int = 1000
+    ) -> Iterator[list[EventRow]]:
+        """
+        Stream a calendar query's rows in batches.
+        
+        The query runs once with a server-side cursor where the driver
+        supports it, so memory stays bounded by ``fetch_size`` however
+        many rows match. Served by a read replica when one is configured.
+        
+        Args:
+            query: Calendar window and filters
+            fetch_size: Rows fetched (and yielded) per batch
+            
+        Yields:
+            Lists of row dicts in EventResponse field order
+        """
+        return cast(Iterator[list[EventRow]], self.iter_rows(calendar_statement(query), fetch_size))
+    
+    def get_event_history(self, event_id: int) -> list[AuditRow] | None:
+        """
+        Get an event's audit trail, oldest entry first.
+        
+        Reads idx_event_timestamp from the event's creation time onward;
+        no entry predates the event, and the lower bound lets MySQL skip
+        the audit partitions older than the event. With the audit outbox
+        enabled, the newest entries appear once the flusher has moved
+        them (within about one flush interval).
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Audit rows in AuditLogResponse field order, or None if the
+            event does not exist
+        """
+        with read_from_replica(self.db):
+            created_at = self.db.scalar(
+                select(CorporateActionEvent.created_at).where(CorporateActionEvent.id == event_id)
+            )
+            if created_at is None:
+                return None
+            rows = self.db.execute(
+                select(*AUDIT_COLUMNS)
+                .where(AuditLog.event_id == event_id, AuditLog.timestamp >= created_at)
+                .order_by(AuditLog.timestamp, AuditLog.id)
+            )
+            return [cast(AuditRow, row._asdict()) for row in rows]
+    
+    def iter_audit_log(
+        self, start: datetime, end: datetime, fetch_size: int = 1000
+    ) -> Iterator[list[AuditRow]]:
         """
-        List events with filters and pagination.
+        Stream the audit trail for a time window in batches.
         
+        Same streaming as iter_calendar: one query on a server-side
+        cursor (read replica when configured), ``fetch_size`` rows held
+        at a time.
+        
+        Args:
+            start: Window start (inclusive)
+            end: Window end (exclusive)
+            fetch_size: Rows fetched (and yielded) per batch
+            
+        Yields:
+            Lists of row dicts in AuditLogResponse field order
+        """
+        stmt = audit_export_statement(start, end)
+        return cast(Iterator[list[AuditRow]], self.iter_rows(stmt, fetch_size))
+    
+    def iter_rows(self, stmt: Select[Any], fetch_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Run a read-only query on a server-side cursor, yielding row batches."""
+        with read_from_replica(self.db):
+            result = self.db.execute(stmt.execution_options(yield_per=fetch_size))
+        for partition in result.partitions():
+            yield [row._asdict() for row in partition]
+    
+    def _list_statement(
+        self,
+        stmt: Select[Any],
+        filters: Mapping[str, Any],
+        skip: int,
+        limit: int,
+        cursor: str | None,
+        count: str,
+    ) -> tuple[int | None, Select[Any]]:
+        """
+        Apply list filters and pagination to a select, counting the matches.
+        
+        Args:
+            stmt: Select over the events table
+            filters: list_events filter arguments by name
+            
         Returns:
-            Tuple of (events, total_count)
+            Tuple of (total_count or None, statement fetching one row more
+            than the page so the caller can tell whether another page exists)
         """
-        query = self.db.query(CorporateActionEvent)
+        # status + event_type use idx_status_type; symbol idx_symbol_created
+        for name in ("event_type", "status", "symbol"):
+            if filters[name]:
+                stmt = stmt.where(_matches(getattr(CorporateActionEvent, name), filters[name]))
+        if filters["target_symbol"]:
+            stmt = stmt.where(
+                CorporateActionEvent.target_symbol == filters["target_symbol"].upper()
+            )
+        if filters["date_from"] or filters["date_to"]:
+            if filters["date_field"] not in PROMOTED_DATE_FIELDS:
+                raise ValueError(f"Cannot filter on date field {filters['date_field']!r}")
+            column = getattr(CorporateActionEvent, filters["date_field"])
+            if filters["date_from"]:
+                stmt = stmt.where(column >= filters["date_from"])
+            if filters["date_to"]:
+                stmt = stmt.where(column <= filters["date_to"])
         
-        if event_type:
-            query = query.filter(CorporateActionEvent.event_type == event_type)
-        if status:
-            query = query.filter(CorporateActionEvent.status == status)
-        if symbol:
-            query = query.filter(CorporateActionEvent.symbol == symbol.upper())
+        with read_from_replica(self.db):
+            total = self._count_events(stmt, tuple(sorted(filters.items())), count)
         
-        total = query.count()
-        events = query.order_by(CorporateActionEvent.created_at.desc()).offset(skip).limit(
-            limit
-        ).all()
+        stmt = stmt.order_by(
+            CorporateActionEvent.created_at.desc(), CorporateActionEvent.id.desc()
+        )
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                CorporateActionEvent.created_at <= created_at,
+                or_(
+                    CorporateActionEvent.created_at < created_at,
+                    CorporateActionEvent.id < last_id,
+                ),
+            )
+        else:
+            stmt = stmt.offset(skip)
         
-        return events, total
+        return total, stmt.limit(limit + 1)
+    
+    def _count_events(self, stmt: Select[Any], filters: tuple[Any, ...], mode: str) -> int | None:
+        """Count rows for a list query according to the requested mode."""
+        if mode == "none":
+            return None
+        if mode == "cached":
+            now = time.monotonic()
+            with _count_cache_lock:
+                cached = _count_cache.get(filters)
+                if cached and cached[0] > now:
+                    _count_cache.move_to_end(filters)
+                    return cached[1]
+            total = self._count(stmt)
+            with _count_cache_lock:
+                _put_count(filters, now + settings.list_count_cache_seconds, total)
+            return total
+        return self._count(stmt)
+    
+    def _count(self, stmt: Select[Any]) -> int:
+        """COUNT(*) over the rows a filtered select matches."""
+        counted = select(func.count()).select_from(
+            stmt.with_only_columns(CorporateActionEvent.id).subquery()
+        )
+        return self.db.execute(counted).scalar_one()
+    
+    def claim_events(
+        self,
+        limit: int,
+        owner: str,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        user: str = "processor",
+    ) -> list[CorporateActionEvent]:
+        """
+        Atomically claim a batch of pending events for processing.
+        
+        Claimed events are moved to PROCESSING under a lease held by
+        ``owner`` that expires after ``lease_seconds``; expired leases are
+        returned to the queue by ``release_expired_leases``. Concurrent
+        claimers (other workers or other replicas) always receive disjoint
+        batches: the claim is a compare-and-set UPDATE guarded on
+        status = PENDING, and only rows stamped with our owner are
+        returned. On MySQL the candidate rows are additionally locked with
+        SELECT ... FOR UPDATE SKIP LOCKED so claimers never contend for
+        the same rows; SQLite relies on the guarded UPDATE alone.
+        
+        Args:
+            limit: Maximum number of events to claim
+            owner: Unique lease owner, e.g. host and worker name
+            lease_seconds: Lease duration before the event may be reclaimed
+            user: User recorded in the audit trail
+            
+        Returns:
+            Claimed events, oldest first
+        """
+        candidate_ids = [
+            row.id
+            for row in self.db.query(CorporateActionEvent.id)
+            .filter(CorporateActionEvent.status == EventStatus.PENDING)
+            .order_by(CorporateActionEvent.created_at, CorporateActionEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        ]
+        if not candidate_ids:
+            self.db.rollback()
+            return []
+        
+        now = datetime.utcnow()
+        self.db.execute(
+            update(CorporateActionEvent)
+            .where(
+                CorporateActionEvent.id.in_(candidate_ids),
+                CorporateActionEvent.status == EventStatus.PENDING,
+            )
+            .values(
+                status=EventStatus.PROCESSING,
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                claimed_at=now,
+                updated_at=now,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        
+        # Rows lost to a concurrent claimer carry someone else's owner
+        events = (
+            self.db.query(CorporateActionEvent)
+            .filter(
+                CorporateActionEvent.id.in_(candidate_ids),
+                CorporateActionEvent.status == EventStatus.PROCESSING,
+                CorporateActionEvent.lease_owner == owner,
+            )
+            .order_by(CorporateActionEvent.created_at, CorporateActionEvent.id)
+            .all()
+        )
+        
+        self._write_audit_logs([
+            self._audit_row(
+                event_id=event.id,
+                action="UPDATE",
+                old_status=EventStatus.PENDING.value,
+                new_status=EventStatus.PROCESSING.value,
+                changes={
+                    "status": {
+                        "from": EventStatus.PENDING.value,
+                        "to": EventStatus.PROCESSING.value,
+                    },
+                    "lease_owner": owner,
+                },
+                user=user,
+            )
+            for event in events
+        ])
+        event_counters.record_transitions(
+            self.db, [EventStatus.PENDING] * len(events), EventStatus.PROCESSING
+        )
+        sequence = self._broadcast_sequence()
+        
+        self.db.commit()
+        _announce_transitions(
+            [
+                {
+                    "id": event.id,
+                    "from": EventStatus.PENDING.value,
+                    "retry_count": event.retry_count,
+                }
+                for event in events
+            ],
+            EventStatus.PROCESSING,
+            sequence,
+        )
+        
+        if events:
+            logger.info(f"Claimed {len(events)} event(s) for {owner}")
+        return events
+    
+    def release_expired_leases(self, limit: int = 500, user: str = "reaper") -> int:
+        """
+        Return PROCESSING events whose lease has expired to the queue.
+        
+        Expired rows are located with a range scan on
+        (status, lease_expires_at), so the reaper never touches live or
+        finished events, and are reset in bulk. Each reclaim counts as a
+        failed attempt so a poison event cannot cycle forever. The expired
+        ids are selected with FOR UPDATE SKIP LOCKED, so on MySQL exactly
+        those rows are reset, audited and announced; where the database
+        supports UPDATE ... RETURNING (SQLite, which has no row locks) the
+        guarded UPDATE reports the ids it actually reset instead.
+        
+        Args:
+            limit: Maximum number of leases to release in one pass
+            user: User recorded in the audit trail
+            
+        Returns:
+            Number of events returned to PENDING
+        """
+        now = datetime.utcnow()
+        expired = (
+            self.db.query(
+                CorporateActionEvent.id,
+                CorporateActionEvent.lease_owner,
+                CorporateActionEvent.retry_count,
+            )
+            .filter(
+                CorporateActionEvent.status == EventStatus.PROCESSING,
+                CorporateActionEvent.lease_expires_at < now,
+            )
+            .order_by(CorporateActionEvent.lease_expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not expired:
+            self.db.rollback()
+            return 0
+        
+        reset = (
+            update(CorporateActionEvent)
+            .where(
+                CorporateActionEvent.id.in_([row.id for row in expired]),
+                CorporateActionEvent.status == EventStatus.PROCESSING,
+                CorporateActionEvent.lease_expires_at < now,
+            )
+            .values(
+                status=EventStatus.PENDING,
+                lease_owner=None,
+                lease_expires_at=None,
+                error_message=LEASE_EXPIRED_MESSAGE,
+                retry_count=CorporateActionEvent.retry_count + 1,
+                queued_at=now,
+                updated_at=now,
+            )
+        )
+        if self.db.get_bind().dialect.update_returning:
+            released_ids = set(self.db.scalars(
+                reset.returning(CorporateActionEvent.id),
+                execution_options={"synchronize_session": False},
+            ))
+            expired = [row for row in expired if row.id in released_ids]
+        else:
+            # The rows are locked by the SELECT above, so the guarded
+            # UPDATE resets exactly these ids
+            self.db.execute(reset, execution_options={"synchronize_session": False})
+        
+        self._write_audit_logs([
+            self._audit_row(
+                event_id=row.id,
+                action="UPDATE",
+                old_status=EventStatus.PROCESSING.value,
+                new_status=EventStatus.PENDING.value,
+                changes={
+                    "status": {
+                        "from": EventStatus.PROCESSING.value,
+                        "to": EventStatus.PENDING.value,
+                    },
+                    "error_message": LEASE_EXPIRED_MESSAGE,
+                    "retry_count": row.retry_count + 1,
+                    "lease_owner": row.lease_owner,
+                },
+                user=user,
+            )
+            for row in expired
+        ])
+        event_counters.record_transitions(
+            self.db, [EventStatus.PROCESSING] * len(expired), EventStatus.PENDING
+        )
+        sequence = self._broadcast_sequence()
+        
+        self.db.commit()
+        _announce_transitions(
+            [
+                {
+                    "id": row.id,
+                    "from": EventStatus.PROCESSING.value,
+                    "retry_count": row.retry_count + 1,
+                    "error_message": LEASE_EXPIRED_MESSAGE,
+                }
+                for row in expired
+            ],
+            EventStatus.PENDING,
+            sequence,
+        )
+        if expired:
+            notifier.notify()
+            logger.warning(f"Released {len(expired)} event(s) with expired leases")
+        return len(expired)
     
     def update_event_status(
         self,
@@ -153,6 +879,7 @@ class EventService:
         new_status: EventStatus,
         error_message: str | None = None,
         user: str = "system",
+        lease_owner: str | None = None,
     ) -> CorporateActionEvent | None:
         """
         Update event status with audit trail.
@@ -162,101 +889,297 @@ class EventService:
             new_status: New status
             error_message: Optional error message for failed events
             user: User making the change
+            lease_owner: If given, only apply while this owner holds the lease
             
         Returns:
-            Updated event or None if not found
+            Updated event or None if not found (or the lease was lost)
         """
-        event = self.get_event(event_id)
-        if not event:
+        if not self.update_event_statuses(
+            [event_id],
+            new_status,
+            error_message=error_message,
+            user=user,
+            lease_owner=lease_owner,
+        ):
             return None
+        return self.get_event(event_id)
+    
+    def update_event_statuses(
+        self,
+        event_ids: Sequence[int],
+        new_status: EventStatus,
+        error_message: str | None = None,
+        user: str = "system",
+        from_statuses: Collection[EventStatus] | None = None,
+        lease_owner: str | None = None,
+        audit_details: Mapping[int, dict[str, Any]] | None = None,
+    ) -> list[int]:
+        """
+        Transition a batch of events to a new status with audit trail.
         
-        old_status = event.status
-        event.status = new_status
-        event.updated_at = datetime.utcnow()
+        Issues one locking SELECT for the current statuses, one
+        UPDATE ... WHERE id IN (...), one executemany INSERT for the audit
+        rows and a single commit, regardless of the batch size.
         
-        if error_message:
-            event.error_message = error_message
-            event.retry_count += 1
+        Args:
+            event_ids: Events to transition
+            new_status: New status
+            error_message: Optional error message; increments retry_count
+            user: User making the change
+            from_statuses: If given, only events currently in one of these
+                statuses are transitioned
+            lease_owner: If given, only events leased to this owner are
+                transitioned
+            audit_details: Extra per-event entries (e.g. timing) merged
+                into each audit row's changes
+            
+        Returns:
+            IDs of the events that were transitioned
+        """
+        if not event_ids:
+            return []
+        
+        guards: list[ColumnElement[bool]] = [CorporateActionEvent.id.in_(list(set(event_ids)))]
+        if from_statuses is not None:
+            guards.append(CorporateActionEvent.status.in_(list(from_statuses)))
+        if lease_owner is not None:
+            guards.append(CorporateActionEvent.lease_owner == lease_owner)
+        
+        current = (
+            self.db.query(
+                CorporateActionEvent.id,
+                CorporateActionEvent.status,
+                CorporateActionEvent.retry_count,
+            )
+            .filter(*guards)
+            .with_for_update()
+            .all()
+        )
+        if not current:
+            self.db.rollback()
+            if lease_owner is not None:
+                logger.warning(
+                    f"Events {list(event_ids)} not leased to {lease_owner}; skipping"
+                )
+            return []
         
-        # Create audit log
-        changes = {"status": {"from": old_status.value, "to": new_status.value}}
+        now = datetime.utcnow()
+        values: dict[str, Any] = {
+            "status": new_status,
+            "updated_at": now,
+        }
+        if new_status == EventStatus.PENDING:
+            values["queued_at"] = now
+        if new_status != EventStatus.PROCESSING:
+            values["lease_owner"] = None
+            values["lease_expires_at"] = None
         if error_message:
-            changes["error_message"] = error_message
-            changes["retry_count"] = event.retry_count
-        
-        self._create_audit_log(
-            event_id=event.id,
-            action="UPDATE",
-            old_status=old_status.value,
-            new_status=new_status.value,
-            changes=changes,
-            user=user,
+            values["error_message"] = error_message
+            values["retry_count"] = CorporateActionEvent.retry_count + 1
+        
+        transitioned_ids = [row.id for row in current]
+        self.db.execute(
+            update(CorporateActionEvent)
+            .where(CorporateActionEvent.id.in_(transitioned_ids), *guards[1:])
+            .values(**values),
+            execution_options={"synchronize_session": False},
         )
         
+        audit_rows = []
+        transitions = []
+        for row in current:
+            changes: dict[str, Any] = {
+                "status": {"from": row.status.value, "to": new_status.value}
+            }
+            transition: dict[str, Any] = {
+                "id": row.id, "from": row.status.value, "retry_count": row.retry_count
+            }
+            if error_message:
+                changes["error_message"] = error_message
+                changes["retry_count"] = row.retry_count + 1
+                transition.update(error_message=error_message, retry_count=row.retry_count + 1)
+            transitions.append(transition)
+            if audit_details and row.id in audit_details:
+                changes.update(audit_details[row.id])
+            audit_rows.append(
+                self._audit_row(
+                    event_id=row.id,
+                    action="UPDATE",
+                    old_status=row.status.value,
+                    new_status=new_status.value,
+                    changes=changes,
+                    user=user,
+                )
+            )
+        self._write_audit_logs(audit_rows)
+        event_counters.record_transitions(self.db, [row.status for row in current], new_status)
+        sequence = self._broadcast_sequence()
+        
         self.db.commit()
-        self.db.refresh(event)
+        _announce_transitions(transitions, new_status, sequence)
         
-        logger.info(f"Updated event {event_id} status: {old_status.value} -> {new_status.value}")
-        return event
+        logger.info(
+            f"Updated {len(transitioned_ids)} event(s) status -> {new_status.value}: "
+            f"{transitioned_ids}"
+        )
+        return transitioned_ids
     
     def get_metrics(self) -> dict[str, Any]:
         """
         Calculate system metrics.
         
+        Served from counters maintained transactionally on every create
+        and status transition, so the cost is independent of table size.
+        Latencies come from the streaming sketches fed by this replica's
+        processor and are labelled with latency_replica.
+        
         Returns:
             Dictionary with aggregated metrics
         """
-        now = datetime.utcnow()
-        one_hour_ago = now - timedelta(hours=1)
-        one_day_ago = now - timedelta(days=1)
-        
-        # Total events
-        total = self.db.query(func.count(CorporateActionEvent.id)).scalar() or 0
-        
-        # Events by type
-        type_counts = dict(
-            self.db.query(CorporateActionEvent.event_type, func.count(CorporateActionEvent.id))
-            .group_by(CorporateActionEvent.event_type)
-            .all()
-        )
-        events_by_type = {k.value: v for k, v in type_counts.items()}
-        
-        # Events by status
-        status_counts = dict(
-            self.db.query(CorporateActionEvent.status, func.count(CorporateActionEvent.id))
-            .group_by(CorporateActionEvent.status)
-            .all()
-        )
-        events_by_status = {k.value: v for k, v in status_counts.items()}
-        
-        # Recent events
-        recent_1h = (
-            self.db.query(func.count(CorporateActionEvent.id))
-            .filter(CorporateActionEvent.created_at >= one_hour_ago)
-            .scalar()
-            or 0
-        )
+        with read_from_replica(self.db):
+            counters = event_counters.read_counters(self.db)
         
-        recent_24h = (
-            self.db.query(func.count(CorporateActionEvent.id))
-            .filter(CorporateActionEvent.created_at >= one_day_ago)
-            .scalar()
-            or 0
-        )
+        total = sum(counters["events_by_type"].values())
         
         # Error rate
-        failed_count = events_by_status.get(EventStatus.FAILED.value, 0)
+        failed_count = counters["events_by_status"].get(EventStatus.FAILED.value, 0)
         error_rate = failed_count / total if total > 0 else 0.0
         
+        latency = latency_tracker.summary()
+        
         return {
             "total_events": total,
-            "events_by_type": events_by_type,
-            "events_by_status": events_by_status,
-            "recent_events_1h": recent_1h,
-            "recent_events_24h": recent_24h,
-            "average_processing_time_seconds": None,  # Would need timing data
+            "events_by_type": counters["events_by_type"],
+            "events_by_status": counters["events_by_status"],
+            "recent_events_1h": counters["recent_events_1h"],
+            "recent_events_24h": counters["recent_events_24h"],
+            "average_processing_time_seconds": latency["average_processing_time_seconds"],
+            "latency_by_type": latency["latency_by_type"],
+            "latency_replica": latency["replica"],
             "error_rate": round(error_rate, 4),
+            "change_sequence": counters["change_sequence"],
+        }
+    
+    def _create_events_individually(
+        self, items: Sequence[EventCreate], user: str
+    ) -> list[dict[str, Any]]:
+        """Create events one transaction at a time, reporting conflicts per item."""
+        results = []
+        for item in items:
+            try:
+                event = self.create_event(item, user=user)
+                results.append({"status": "created", "event_id": event.id, "error": None})
+            except DuplicateIdempotencyKeyError as e:
+                results.append(_conflict(e.event.id))
+        return results
+    
+    def _write_replay_records(
+        self, created: Sequence[tuple[CorporateActionEvent, EventCreate]]
+    ) -> None:
+        """Store the responses to keyed creates (after flush) for replays."""
+        if not created:
+            return
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.idempotency_replay_ttl_seconds)
+        self.db.execute(
+            insert(IdempotencyRecord),
+            [
+                {
+                    "idempotency_key": event.idempotency_key,
+                    "event_id": event.id,
+                    "request_hash": request_fingerprint(event_data),
+                    "response": EventResponse.model_validate(event).model_dump_json(),
+                    "expires_at": expires_at,
+                }
+                for event, event_data in created
+            ],
+        )
+    
+    def _find_by_idempotency_key(
+        self, key: str, use_index: bool = True
+    ) -> CorporateActionEvent | None:
+        """
+        Find the event owning an idempotency key, on the primary.
+        
+        With ``use_index``, a key in the idempotency index's LRU is
+        answered by primary key, and a key its bloom filter has never
+        seen is reported missing without a query (the unique index still
+        catches it on insert if another process wrote it).
+        """
+        if use_index:
+            event_id = idempotency_index.get(key)
+            if event_id is not None:
+                event: CorporateActionEvent | None = self.db.scalar(
+                    select(CorporateActionEvent)
+                    .where(CorporateActionEvent.id == event_id)
+                    .execution_options(populate_existing=True)
+                )
+                if event is not None:
+                    IDEMPOTENCY_CHECKS.labels("recent").inc()
+                    return event
+            elif not idempotency_index.may_contain(key):
+                IDEMPOTENCY_CHECKS.labels("new").inc()
+                return None
+        
+        event = self.db.scalar(
+            select(CorporateActionEvent)
+            .where(CorporateActionEvent.idempotency_key == key)
+            .execution_options(populate_existing=True)
+        )
+        IDEMPOTENCY_CHECKS.labels("lookup").inc()
+        if event is not None:
+            idempotency_index.add(key, event.id)
+        return event
+    
+    def _build_event(self, event_data: EventCreate, user: str) -> CorporateActionEvent:
+        """Build an unsaved event entity with its type-specific payload."""
+        # Build payload from event-specific fields
+        payload: dict[str, Any] = {
+            "currency": event_data.currency,
         }
+        
+        # Add type-specific fields
+        if event_data.event_type == EventType.DIVIDEND:
+            payload.update({
+                "amount": str(event_data.amount) if event_data.amount else None,
+                "ex_date": event_data.ex_date.isoformat() if event_data.ex_date else None,
+                "record_date": (
+                    event_data.record_date.isoformat() if event_data.record_date else None
+                ),
+                "payment_date": (
+                    event_data.payment_date.isoformat() if event_data.payment_date else None
+                ),
+            })
+        elif event_data.event_type == EventType.STOCK_SPLIT:
+            payload.update({
+                "split_ratio_from": event_data.split_ratio_from,
+                "split_ratio_to": event_data.split_ratio_to,
+                "effective_date": (
+                    event_data.effective_date.isoformat() if event_data.effective_date else None
+                ),
+            })
+        elif event_data.event_type == EventType.MERGER:
+            payload.update({
+                "target_symbol": event_data.target_symbol,
+                "exchange_ratio": (
+                    str(event_data.exchange_ratio) if event_data.exchange_ratio else None
+                ),
+                "cash_component": (
+                    str(event_data.cash_component) if event_data.cash_component else None
+                ),
+                "effective_date": (
+                    event_data.effective_date.isoformat() if event_data.effective_date else None
+                ),
+            })
+        
+        return CorporateActionEvent(
+            event_type=event_data.event_type,
+            symbol=event_data.symbol.upper(),
+            status=EventStatus.PENDING,
+            payload=payload,
+            **promoted_fields(payload),
+            idempotency_key=event_data.idempotency_key,
+            created_by=user,
+        )
     
     def _create_audit_log(
         self,
@@ -269,13 +1192,229 @@ class EventService:
         correlation_id: str | None = None,
     ) -> None:
         """Create immutable audit log entry."""
-        audit = AuditLog(
-            event_id=event_id,
-            action=action,
-            old_status=old_status,
-            new_status=new_status,
-            changes=changes,
-            user=user,
-            correlation_id=correlation_id,
+        self._write_audit_logs([
+            self._audit_row(
+                event_id=event_id,
+                action=action,
+                old_status=old_status,
+                new_status=new_status,
+                changes=changes,
+                user=user,
+                correlation_id=correlation_id,
+            )
+        ])
+    
+    def _audit_row(
+        self,
+        event_id: int,
+        action: str,
+        old_status: str | None,
+        new_status: str,
+        changes: dict[str, Any],
+        user: str,
+        correlation_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Build the column values for one audit log entry."""
+        return {
+            "event_id": event_id,
+            "action": action,
+            "old_status": old_status,
+            "new_status": new_status,
+            "changes": changes,
+            "timestamp": datetime.utcnow(),
+            "user": user,
+            "correlation_id": correlation_id,
+        }
+    
+    def _write_audit_logs(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Insert audit log entries in the current transaction (executemany).
+        
+        With the audit outbox enabled the entries go to the unindexed
+        audit_outbox table instead, and the background flusher moves them
+        into audit_logs.
+        """
+        if rows:
+            table = AuditOutbox if settings.audit_outbox_enabled else AuditLog
+            self.db.execute(insert(table), rows)
+    
+    def _broadcast_sequence(self) -> int | None:
+        """
+        Change sequence this transaction will commit, for tagging deltas.
+        
+        Read after the counters are bumped and before commit, so it is the
+        sequence a metrics snapshot taken just after the commit reports.
+        Skipped (None) when nobody is subscribed.
+        """
+        if not broadcaster.subscriber_count:
+            return None
+        return event_counters.read_change_sequence(self.db)
+
+
+def _announce_created(
+    events: list[tuple[int, EventType, str]], change_sequence: int | None = None
+) -> None:
+    """
+    Broadcast committed creations, with metric deltas, to push subscribers.
+    
+    ``change_sequence`` is the counter sequence the creations committed
+    at; clients skip deltas their metrics snapshot already includes.
+    """
+    event_cache.invalidate(event_id for event_id, _, _ in events)
+    if not events or not broadcaster.subscriber_count:
+        return
+    broadcaster.publish({
+        "type": "created",
+        "change_sequence": change_sequence,
+        "events": [
+            {
+                "id": event_id,
+                "event_type": event_type.value,
+                "symbol": symbol,
+                "status": EventStatus.PENDING.value,
+            }
+            for event_id, event_type, symbol in events
+        ],
+        "deltas": {
+            "status": {EventStatus.PENDING.value: len(events)},
+            "type": dict(Counter(event_type.value for _, event_type, _ in events)),
+        },
+    })
+
+
+def _announce_transitions(
+    transitions: list[dict[str, Any]], new_status: EventStatus, change_sequence: int | None = None
+) -> None:
+    """
+    Publish committed status transitions.
+    
+    Invalidates the events' cached responses, counts the transitions for
+    the Prometheus exposition and broadcasts them, with the resulting
+    status-count deltas, to push subscribers.
+    
+    Args:
+        transitions: One dict per event with id, from (old status) and
+            the event's new retry_count / error_message where known
+        new_status: Status the events moved to
+        change_sequence: Counter sequence the transitions committed at
+    """
+    event_cache.invalidate(transition["id"] for transition in transitions)
+    deltas: Counter[str] = Counter()
+    for transition in transitions:
+        STATUS_TRANSITIONS.labels(transition["from"], new_status.value).inc()
+        if transition["from"] != new_status.value:
+            deltas[transition["from"]] -= 1
+            deltas[new_status.value] += 1
+    if not transitions or not broadcaster.subscriber_count:
+        return
+    broadcaster.publish({
+        "type": "status",
+        "change_sequence": change_sequence,
+        "to": new_status.value,
+        "events": transitions,
+        "deltas": {"status": {status: delta for status, delta in deltas.items() if delta}},
+    })
+
+
+def _put_count(filters: tuple[Any, ...], expires_at: float, total: int) -> None:
+    """
+    Cache a list count (caller holds _count_cache_lock).
+    
+    Expired counts are dropped first, then the least recently used ones
+    beyond list_count_cache_max_entries.
+    """
+    now = time.monotonic()
+    for key in [key for key, (expires, _) in _count_cache.items() if expires <= now]:
+        del _count_cache[key]
+    _count_cache[filters] = (expires_at, total)
+    _count_cache.move_to_end(filters)
+    while len(_count_cache) > settings.list_count_cache_max_entries:
+        _count_cache.popitem(last=False)
+
+
+def _list_filters(
+    event_type: EventType | Sequence[EventType] | None,
+    status: EventStatus | Sequence[EventStatus] | None,
+    symbol: str | Sequence[str] | None,
+    target_symbol: str | None,
+    date_field: str,
+    date_from: date | None,
+    date_to: date | None,
+) -> dict[str, Any]:
+    """
+    Normalize list_events filter arguments for _list_statement.
+    
+    Raises:
+        ValueError: If a filter has too many values
+    """
+    return {
+        "event_type": _values(event_type),
+        "status": _values(status),
+        "symbol": _values(symbol, str.upper),
+        "target_symbol": target_symbol,
+        "date_field": date_field,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+
+# Filter values: plain strings or str-valued enums, so they sort
+S = TypeVar("S", bound=str)
+
+
+def _values(
+    value: S | Sequence[S] | None,
+    normalize: Callable[[S], S] | None = None,
+) -> tuple[S, ...]:
+    """
+    Normalize a one-or-many filter argument to a sorted, de-duplicated tuple.
+    
+    Raises:
+        ValueError: If there are more values than list_max_filter_values
+    """
+    if value is None:
+        return ()
+    values = [value] if isinstance(value, str) else list(value)
+    if normalize is not None:
+        values = [normalize(v) for v in values]
+    unique = tuple(sorted(set(values)))
+    if len(unique) > settings.list_max_filter_values:
+        raise ValueError(
+            f"At most {settings.list_max_filter_values} values per filter are supported"
         )
-        self.db.add(audit)
+    return unique
+
+
+def _matches(column: Any, values: tuple[Any, ...]) -> Any:
+    """
+    Equality for one value, IN (...) for several.
+    
+    IN lists are padded to the next power of two by repeating the last
+    value, so statements come in a handful of shapes per filter instead
+    of one per list length, and the database can reuse their plans.
+    """
+    if len(values) == 1:
+        return column == values[0]
+    padded = list(values) + [values[-1]] * ((1 << (len(values) - 1).bit_length()) - len(values))
+    return column.in_(padded)
+
+
+def _trim_page(page: list[Any], limit: int) -> str | None:
+    """
+    Drop a page's look-ahead row in place.
+    
+    Returns:
+        Cursor for the next page, or None if this is the last page
+    """
+    if len(page) <= limit:
+        return None
+    del page[limit:]
+    last = page[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
+
+def _conflict(event_id: int | None) -> dict[str, Any]:
+    """Batch result for an item whose idempotency key already exists."""
+    return {"status": "conflict", "event_id": event_id, "error": "Duplicate idempotency key"}
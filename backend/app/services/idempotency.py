@@ -0,0 +1,278 @@
+"""In-memory fast path for idempotency key checks."""
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.telemetry import registry
+from app.models.event import CorporateActionEvent, IdempotencyRecord
+from app.schemas.event import EventCreate
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class DuplicateIdempotencyKeyError(ValueError):
+    """An event with the submitted idempotency key already exists."""
+
+    def __init__(self, event: CorporateActionEvent) -> None:
+        """Carry the event created by the original submission."""
+        super().__init__("Duplicate idempotency key")
+        self.event = event
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Sized for ``capacity`` keys at ``error_rate`` false positives; the
+    rate climbs past that, so callers rotate filters once ``count``
+    reaches ``capacity``. Never reports a false negative.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Initialize an empty filter."""
+        self.capacity = capacity
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, key: str) -> None:
+        """Add a key."""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Whether the key may have been added (False is definite)."""
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+
+class IdempotencyIndex:
+    """
+    Recently seen idempotency keys, checked before touching the database.
+
+    Two structures, both bounded:
+
+    - an LRU of key -> event id for recent keys, which answers retried
+      submissions without a key lookup;
+    - a bloom filter of every key this process has seen, which lets new
+      keys (the common case) skip the key lookup entirely. It has two
+      generations: when the current one fills, it becomes the previous
+      one and the oldest keys are forgotten.
+
+    The index only decides how much checking a create does up front. A key
+    another process wrote, or one the index has forgotten, still collides
+    on the unique index, so answers are never wrong, only slower.
+    """
+
+    def __init__(
+        self, max_entries: int = 100000, bloom_capacity: int = 1000000, error_rate: float = 0.01
+    ) -> None:
+        """
+        Initialize index.
+
+        Args:
+            max_entries: Keys held in the LRU (0 disables the index)
+            bloom_capacity: Keys per bloom filter generation
+            error_rate: Target bloom false-positive rate
+        """
+        self.max_entries = max_entries
+        self.bloom_capacity = max(1, bloom_capacity)
+        self.error_rate = error_rate
+        self._recent: OrderedDict[str, int] = OrderedDict()
+        self._current = BloomFilter(self.bloom_capacity, error_rate)
+        self._previous: BloomFilter | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the index is in use."""
+        return self.max_entries > 0
+
+    def get(self, key: str) -> int | None:
+        """Event id for a recently seen key, if still held."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            event_id = self._recent.get(key)
+            if event_id is not None:
+                self._recent.move_to_end(key)
+        return event_id
+
+    def may_contain(self, key: str) -> bool:
+        """
+        Whether the key may already exist.
+
+        False means this process has not seen the key since it started or
+        rebuilt, so an up-front lookup would almost certainly miss. Always
+        True while disabled.
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            return key in self._current or (self._previous is not None and key in self._previous)
+
+    def add(self, key: str, event_id: int) -> None:
+        """Record a key and the event that owns it."""
+        self.add_many([(key, event_id)])
+
+    def add_many(self, items: Iterable[tuple[str, int]]) -> None:
+        """Record several keys and the events that own them."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for key, event_id in items:
+                self._recent[key] = event_id
+                self._recent.move_to_end(key)
+                if self._current.count >= self.bloom_capacity:
+                    self._previous = self._current
+                    self._current = BloomFilter(self.bloom_capacity, self.error_rate)
+                self._current.add(key)
+            while len(self._recent) > self.max_entries:
+                self._recent.popitem(last=False)
+
+    def rebuild(self, db: Session, batch_size: int = 10000, now: datetime | None = None) -> int:
+        """
+        Reload the index from the newest keyed events.
+
+        Walks keyed events newest first by primary key ranges, up to one
+        bloom generation, and stops at the first event created before the
+        replay retention window (idempotency_replay_ttl_seconds): retries
+        of older submissions are rare, and the unique index still catches
+        them. Every key goes into the bloom filter; only the newest
+        ``max_entries`` are kept for the LRU, so memory stays bounded by
+        the index itself. Run at startup so keys created before a restart
+        keep their fast path.
+
+        Returns:
+            Number of keys loaded
+        """
+        if not self.enabled:
+            return 0
+        self.clear()
+        since = (now or datetime.utcnow()) - timedelta(
+            seconds=settings.idempotency_replay_ttl_seconds
+        )
+        newest: list[tuple[str, int]] = []
+        loaded = 0
+        last_id: int | None = None
+        while loaded < self.bloom_capacity:
+            stmt = (
+                select(
+                    CorporateActionEvent.idempotency_key,
+                    CorporateActionEvent.id,
+                    CorporateActionEvent.created_at,
+                )
+                .where(CorporateActionEvent.idempotency_key.is_not(None))
+                .order_by(CorporateActionEvent.id.desc())
+                .limit(min(batch_size, self.bloom_capacity - loaded))
+            )
+            if last_id is not None:
+                stmt = stmt.where(CorporateActionEvent.id < last_id)
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+            batch = [
+                (key, event_id)
+                for key, event_id, created_at in rows
+                if key is not None and created_at >= since
+            ]
+            with self._lock:
+                for key, _ in batch:
+                    self._current.add(key)
+            if len(newest) < self.max_entries:
+                newest.extend(batch[: self.max_entries - len(newest)])
+            loaded += len(batch)
+            # Ids grow with created_at, so every later row is older still
+            if len(batch) < len(rows):
+                break
+            last_id = rows[-1].id
+        with self._lock:
+            # Oldest first, so the newest keys end up most recently used
+            self._recent.update(reversed(newest))
+        logger.info(f"Idempotency index rebuilt with {loaded} key(s)")
+        return loaded
+
+    def stats(self) -> dict[str, Any]:
+        """Key counts held by the LRU and the bloom generations."""
+        with self._lock:
+            return {
+                "recent": len(self._recent),
+                "bloom_keys": self._current.count
+                + (self._previous.count if self._previous is not None else 0),
+            }
+
+    def clear(self) -> None:
+        """Forget every key."""
+        with self._lock:
+            self._recent.clear()
+            self._current = BloomFilter(self.bloom_capacity, self.error_rate)
+            self._previous = None
+
+
+def request_fingerprint(event_data: EventCreate) -> str:
+    """Hash of a create request's body, as stored with its replay record."""
+    body = event_data.model_dump_json(exclude={"idempotency_key"})
+    return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+
+def expire_replay_records(db: Session, batch_size: int = 1000, now: datetime | None = None) -> int:
+    """
+    Delete expired replay records, one short transaction per batch.
+
+    Each batch reads the next expired keys from the expires_at index and
+    deletes them by primary key, so no statement locks more than
+    ``batch_size`` rows.
+
+    Returns:
+        Number of records deleted
+    """
+    now = now or datetime.utcnow()
+    deleted = 0
+    while True:
+        keys = db.scalars(
+            select(IdempotencyRecord.idempotency_key)
+            .where(IdempotencyRecord.expires_at <= now)
+            .order_by(IdempotencyRecord.expires_at)
+            .limit(batch_size)
+        ).all()
+        if not keys:
+            break
+        db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.idempotency_key.in_(keys)))
+        db.commit()
+        deleted += len(keys)
+        if len(keys) < batch_size:
+            break
+    return deleted
+
+
+# Global idempotency index instance
+idempotency_index = IdempotencyIndex(
+    max_entries=settings.idempotency_cache_max_entries,
+    bloom_capacity=settings.idempotency_bloom_capacity,
+)
+
+registry.gauge(
+    "idempotency_index_keys",
+    "Idempotency keys held by the in-memory index",
+    lambda: idempotency_index.stats()["recent"],
+)
@@ -0,0 +1,181 @@
+"""Streaming latency statistics for event processing."""
+import math
+import socket
+import threading
+from typing import Any
+
+from app.models.event import EventType
+
+PROCESSING = "processing"
+QUEUE_WAIT = "queue_wait"
+
+QUANTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+
+class QuantileSketch:
+    """
+    Bounded-memory streaming quantile sketch.
+
+    Values are counted in logarithmically sized buckets (as in DDSketch),
+    so every reported quantile is within ``relative_accuracy`` of the true
+    value while memory stays bounded by ``max_buckets`` regardless of how
+    many values are added. When the bound is hit, the lowest buckets are
+    collapsed, sacrificing accuracy only at the bottom of the distribution.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+            max_buckets: Upper bound on the number of stored buckets
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # Smallest value distinguishable from zero (one microsecond)
+        self._min_value = 1e-6
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        self.sum += value
+        if value <= self._min_value:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same accuracy into this one."""
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    @property
+    def mean(self) -> float | None:
+        """Arithmetic mean of all observations."""
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def _collapse(self) -> None:
+        """Merge the two lowest buckets to respect max_buckets."""
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+
+class LatencyTracker:
+    """
+    Per-event-type processing and queue-wait latency sketches.
+
+    Fed by the processor as it works, so metrics never re-scan audit logs.
+    Sketches live in this process and are not merged across replicas:
+    figures describe only the events this replica processed, and the
+    summary names the replica so consumers cannot mistake them for
+    fleet-wide latency.
+    """
+
+    def __init__(self, replica: str | None = None) -> None:
+        """
+        Initialize with no observations.
+
+        Args:
+            replica: Label for this replica (defaults to the hostname)
+        """
+        self.replica = replica or socket.gethostname()
+        self._sketches: dict[tuple[str, str], QuantileSketch] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Number of observations recorded so far (changes whenever the summary may)."""
+        return self._version
+
+    def record(self, event_type: EventType, kind: str, seconds: float) -> None:
+        """
+        Record one latency observation.
+
+        Args:
+            event_type: Type of the event observed
+            kind: PROCESSING or QUEUE_WAIT
+            seconds: Observed latency
+        """
+        with self._lock:
+            sketch = self._sketches.get((event_type.value, kind))
+            if sketch is None:
+                sketch = self._sketches[(event_type.value, kind)] = QuantileSketch()
+            sketch.add(max(0.0, seconds))
+            self._version += 1
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Summarize all sketches.
+
+        Returns:
+            Dictionary with replica, average_processing_time_seconds
+            (across all types) and latency_by_type: {type: {kind: {count,
+            mean, p50, p95, p99}}}
+        """
+        by_type: dict[str, dict[str, Any]] = {}
+        total_sum = 0.0
+        total_count = 0
+        with self._lock:
+            for (event_type, kind), sketch in sorted(self._sketches.items()):
+                stats = {"count": sketch.count, "mean": _round(sketch.mean)}
+                stats.update({name: _round(sketch.quantile(q)) for name, q in QUANTILES.items()})
+                by_type.setdefault(event_type, {})[kind] = stats
+                if kind == PROCESSING:
+                    total_sum += sketch.sum
+                    total_count += sketch.count
+        return {
+            "replica": self.replica,
+            "average_processing_time_seconds": (
+                _round(total_sum / total_count) if total_count else None
+            ),
+            "latency_by_type": by_type,
+        }
+
+    def reset(self) -> None:
+        """Discard all observations."""
+        with self._lock:
+            self._sketches.clear()
+            self._version += 1
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 4) if value is not None else None
+
+
+# Global latency tracker instance
+latency_tracker = LatencyTracker()
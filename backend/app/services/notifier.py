@@ -0,0 +1,124 @@
+"""Wakeup notifications for the background processor."""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class WakeupChannel(ABC):
+    """
+    Transport that carries wakeups between replicas.
+
+    Implementations publish a wakeup to every replica (including the
+    sender) and invoke subscribed callbacks when one arrives.
+    """
+
+    @abstractmethod
+    def publish(self) -> None:
+        """Broadcast a wakeup to all replicas."""
+
+    @abstractmethod
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked for every received wakeup."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook, a no-op unless overridden
+        """Release transport resources (nothing to release by default)."""
+
+
+class InMemoryWakeupChannel(WakeupChannel):
+    """
+    Process-local channel.
+
+    Stands in for a real broker (e.g. Redis pub/sub) in tests: every
+    notifier attached to the same instance behaves like a separate replica.
+    """
+
+    def __init__(self) -> None:
+        """Initialize channel with no subscribers."""
+        self._subscribers: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def publish(self) -> None:
+        """Deliver the wakeup to every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Register a subscriber."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+
+class EventNotifier:
+    """
+    Wakes processor workers as soon as new work is queued.
+
+    Waiters remember the generation they last saw and sleep until it
+    changes or their timeout elapses, so a notification that arrives
+    between a poll and the following wait is never lost.
+    """
+
+    def __init__(self, channel: WakeupChannel | None = None) -> None:
+        """
+        Initialize notifier.
+
+        Args:
+            channel: Optional cross-replica channel
+        """
+        self._condition = threading.Condition()
+        self._generation = 0
+        self.channel: WakeupChannel | None = None
+        if channel is not None:
+            self.set_channel(channel)
+
+    @property
+    def generation(self) -> int:
+        """Current wakeup generation."""
+        with self._condition:
+            return self._generation
+
+    def set_channel(self, channel: WakeupChannel | None) -> None:
+        """Attach (or detach) the cross-replica channel."""
+        if self.channel is not None:
+            self.channel.close()
+        self.channel = channel
+        if channel is not None:
+            channel.subscribe(self.wake)
+
+    def notify(self) -> None:
+        """Signal that new work is available, locally and on other replicas."""
+        self.wake()
+        if self.channel is not None:
+            try:
+                self.channel.publish()
+            except Exception as e:
+                # Other replicas still find the work on their next poll
+                logger.warning(f"Failed to publish wakeup: {e}")
+
+    def wake(self) -> None:
+        """Wake local waiters only."""
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> bool:
+        """
+        Block until a wakeup newer than ``seen`` arrives.
+
+        Args:
+            seen: Generation observed before the caller last polled
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken, False if the timeout elapsed
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation != seen, timeout)
+
+
+# Global notifier instance
+notifier = EventNotifier()
@@ -0,0 +1,113 @@
+"""Chunked backfill of the payload fields promoted to indexed columns."""
+import argparse
+import logging
+import time
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, and_, bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.models.event import CorporateActionEvent
+from app.services.event_service import PROMOTED_DATE_FIELDS, promoted_fields
+
+logger = logging.getLogger(__name__)
+
+PROMOTED_COLUMNS = (*PROMOTED_DATE_FIELDS, "target_symbol")
+
+
+def backfill_promoted_fields(
+    db: Session,
+    chunk_size: int = 1000,
+    pause_seconds: float = 0.0,
+    start_after_id: int = 0,
+) -> int:
+    """
+    Copy promoted payload fields into their columns for older rows.
+
+    The columns must exist; ``app.core.database.upgrade_schema`` adds
+    them to tables that predate them (``main`` runs it first).
+
+    Walks the table in primary-key order, one short transaction per
+    chunk: read the next range of ids and payloads, then update only the
+    rows whose promoted columns are all still NULL. Rows written by the
+    current code already have their columns set and are left alone, so
+    the backfill is safe on a live table and can be stopped and resumed
+    (from the last id it logged) at any time.
+
+    Args:
+        db: Database session
+        chunk_size: Rows read (and at most updated) per transaction
+        pause_seconds: Sleep between chunks to leave headroom for live traffic
+        start_after_id: Resume after this event id
+
+    Returns:
+        Number of rows updated
+    """
+    table = CorporateActionEvent.__table__
+    still_empty = and_(*(table.c[name].is_(None) for name in PROMOTED_COLUMNS))
+    # Keep updated_at: promoting columns is not a change to the event
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("event_id"), still_empty)
+        .values(
+            {name: bindparam(name) for name in PROMOTED_COLUMNS}
+            | {"updated_at": table.c.updated_at}
+        )
+    )
+
+    last_id = start_after_id
+    updated = 0
+    while True:
+        chunk = db.execute(
+            select(table.c.id, table.c.payload)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        rows = []
+        for event_id, payload in chunk:
+            values = promoted_fields(payload or {})
+            if any(value is not None for value in values.values()):
+                rows.append({"event_id": event_id, **values})
+        if rows:
+            updated += cast(CursorResult[Any], db.execute(stmt, rows)).rowcount
+        db.commit()
+        logger.info(f"Backfilled promoted fields through event {last_id} ({updated} updated)")
+
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return updated
+
+
+def main() -> None:
+    """Run the backfill against the configured database."""
+    from app.core.database import SessionLocal, engine, upgrade_schema
+
+    parser = argparse.ArgumentParser(description="Backfill promoted event payload columns")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds between chunks")
+    parser.add_argument("--start-after-id", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    upgrade_schema(engine)
+    db = SessionLocal()
+    try:
+        updated = backfill_promoted_fields(
+            db,
+            chunk_size=args.chunk_size,
+            pause_seconds=args.pause,
+            start_after_id=args.start_after_id,
+        )
+    finally:
+        db.close()
+    logger.info(f"Backfill complete: {updated} event(s) updated")
+
+
+if __name__ == "__main__":
+    main()
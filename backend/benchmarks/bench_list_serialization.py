@@ -0,0 +1,118 @@
+"""
+Benchmark: GET /events page serialization, ORM + models vs rows to JSON.
+
+Compares the previous list path (ORM entities, one EventResponse per row,
+re-validation against the response model, stdlib json encoding) with
+list_event_rows + EVENT_LIST_JSON on an in-memory SQLite database, and
+checks both produce the same body.
+
+Usage (from backend/):
+    python -m benchmarks.bench_list_serialization [--page-size 100] [--rounds 200]
+"""
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+from datetime import date
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.schemas.event import EVENT_LIST_JSON, EventCreate, EventList, EventResponse
+from app.services.event_service import EventService
+
+EVENT_LIST = TypeAdapter(EventList)
+
+
+def seed(service: EventService, count: int) -> None:
+    """Insert ``count`` dividend events."""
+    items = [
+        EventCreate(
+            event_type="DIVIDEND",
+            symbol="AAPL",
+            amount=0.24,
+            ex_date=date(2024, 11, 15),
+            record_date=date(2024, 11, 18),
+            payment_date=date(2024, 11, 25),
+            idempotency_key=f"bench-{index}",
+        )
+        for index in range(count)
+    ]
+    service.create_events(items, user="bench")
+
+
+def orm_path(service: EventService, page_size: int) -> bytes:
+    """Previous path: entities -> models -> response re-validation -> json.dumps."""
+    events, total, next_cursor = service.list_events(limit=page_size)
+    result = EventList(
+        events=[EventResponse.model_validate(e) for e in events],
+        total=total,
+        page=1,
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
+    # What FastAPI does with a response_model: validate, dump, encode
+    content = EVENT_LIST.dump_python(EVENT_LIST.validate_python(result), mode="json")
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+def rows_path(service: EventService, page_size: int) -> bytes:
+    """New path: Core rows -> JSON bytes."""
+    rows, total, next_cursor = service.list_event_rows(limit=page_size)
+    return EVENT_LIST_JSON.dump_json({
+        "events": rows,
+        "total": total,
+        "page": 1,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+    })
+
+
+def measure(call: Callable[[], bytes], rounds: int) -> list[float]:
+    """Per-call wall times in milliseconds (after one warm-up call)."""
+    call()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    service = EventService(db)
+    seed(service, args.page_size * 2)
+
+    assert orm_path(service, args.page_size) == rows_path(service, args.page_size)
+
+    results = {}
+    for name, path in (("orm+models", orm_path), ("rows->json", rows_path)):
+        timings = measure(lambda path=path: path(service, args.page_size), args.rounds)
+        results[name] = statistics.median(timings)
+        print(
+            f"{name:>11}: median {results[name]:.3f} ms, "
+            f"p95 {statistics.quantiles(timings, n=20)[18]:.3f} ms "
+            f"(page_size={args.page_size}, rounds={args.rounds})"
+        )
+    print(f"speedup: {results['orm+models'] / results['rows->json']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,24 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app import main
 from app.core.database import Base, get_db
 from app.main import app
+from app.services.audit_outbox import audit_flusher
+from app.services.event_cache import event_cache
+from app.services.event_processor import processor
+from app.services.idempotency import idempotency_index
 
-# Use in-memory SQLite for tests
+# Use in-memory SQLite for tests. One shared connection, so sessions used
+# from worker threads (threadpool, executors) see the same database.
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -20,6 +28,9 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 @pytest.fixture
 def db() -> Session:
     """Create test database."""
+    # Ids restart in every test database, so cached bodies and keys must not leak
+    event_cache.clear()
+    idempotency_index.clear()
     Base.metadata.create_all(bind=engine)
     session = TestingSessionLocal()
     try:
@@ -30,8 +41,26 @@ def db() -> Session:
 
 
 @pytest.fixture
-def client(db: Session) -> TestClient:
-    """Create test client with test database."""
+def session_factory(db: Session) -> sessionmaker:
+    """Session factory bound to the test database."""
+    return TestingSessionLocal
+
+
+@pytest.fixture
+def client(db: Session, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    """
+    Create test client with test database.
+    
+    The lifespan runs against the test database. The processor and
+    audit flusher start (so their status is reported) but their loops are
+    no-ops: no background thread claims, reaps or flushes while a test
+    inspects the API.
+    """
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(processor, "_process_loop", lambda stats: None)
+    monkeypatch.setattr(processor, "_reap_loop", lambda: None)
+    monkeypatch.setattr(audit_flusher, "_run", lambda: None)
     
     def override_get_db() -> Session:
         try:
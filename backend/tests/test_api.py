@@ -1,9 +1,14 @@
 """Tests for API endpoints."""
+import json
 from datetime import date
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api import events as events_api
+from app.services.async_event_service import AsyncEventService
+
 
 def test_health_check(client: TestClient) -> None:
     """Test health check endpoint."""
@@ -145,8 +150,27 @@ def test_cancel_event(client: TestClient) -> None:
     assert data["status"] == "CANCELLED"
 
 
+def test_cancel_cancelled_event_rejected(client: TestClient) -> None:
+    """Test cancelling an already cancelled event returns 400."""
+    create_response = client.post(
+        "/api/v1/events",
+        json={
+            "event_type": "STOCK_SPLIT",
+            "symbol": "AMZN",
+            "split_ratio_from": 1,
+            "split_ratio_to": 20,
+            "effective_date": "2024-12-01",
+        },
+    )
+    event_id = create_response.json()["id"]
+    client.post(f"/api/v1/events/{event_id}/cancel")
+    
+    response = client.post(f"/api/v1/events/{event_id}/cancel")
+    assert response.status_code == 400
+
+
 def test_idempotency(client: TestClient) -> None:
-    """Test idempotency key prevents duplicates."""
+    """Test idempotency key prevents duplicates and replays the original."""
     event_data = {
         "event_type": "DIVIDEND",
         "symbol": "NFLX",
@@ -161,9 +185,16 @@ def test_idempotency(client: TestClient) -> None:
     response1 = client.post("/api/v1/events", json=event_data)
     assert response1.status_code == 201
     
-    # Second request with same key fails
+    # Retrying the same request replays the original response
     response2 = client.post("/api/v1/events", json=event_data)
-    assert response2.status_code == 409
+    assert response2.status_code == 200
+    assert response2.headers["idempotent-replayed"] == "true"
+    assert response2.json() == response1.json()
+    
+    # Reusing the key for a different request fails, returning the original event
+    response3 = client.post("/api/v1/events", json={**event_data, "amount": 0.30})
+    assert response3.status_code == 409
+    assert response3.json()["event"] == response1.json()
 
 
 def test_invalid_symbol(client: TestClient) -> None:
@@ -203,3 +234,356 @@ def test_metrics_endpoint(client: TestClient) -> None:
     assert "events_by_type" in data
     assert "events_by_status" in data
     assert data["total_events"] >= 1
+
+
+def test_processor_status(client: TestClient) -> None:
+    """Test processor status exposes per-worker utilization."""
+    response = client.get("/api/v1/processor")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["running"] is True
+    assert len(data["workers"]) >= 1
+    assert "utilization" in data["workers"][0]
+
+
+def test_batch_create_json_array(client: TestClient) -> None:
+    """Test batch create reports per-item results without aborting."""
+    split = {
+        "event_type": "STOCK_SPLIT",
+        "symbol": "NVDA",
+        "split_ratio_from": 1,
+        "split_ratio_to": 10,
+        "effective_date": "2024-06-10",
+    }
+    client.post("/api/v1/events", json={**split, "idempotency_key": "batch-existing"})
+    
+    response = client.post(
+        "/api/v1/events:batch",
+        json=[
+            {**split, "idempotency_key": "batch-new"},
+            {**split, "idempotency_key": "batch-existing"},
+            {**split, "symbol": ""},
+            {**split, "idempotency_key": "batch-new"},
+            split,
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total"], data["created"], data["conflicts"], data["invalid"]) == (5, 2, 2, 1)
+    results = data["results"]
+    assert [r["status"] for r in results] == [
+        "created", "conflict", "invalid", "conflict", "created"
+    ]
+    assert results[3]["event_id"] == results[0]["event_id"]
+    assert "symbol" in results[2]["error"]
+    
+    event = client.get(f"/api/v1/events/{results[4]['event_id']}").json()
+    assert event["symbol"] == "NVDA"
+    assert event["status"] == "PENDING"
+
+
+def test_batch_create_ndjson(client: TestClient) -> None:
+    """Test batch create accepts a newline-delimited JSON body."""
+    body = "\n".join([
+        '{"event_type": "DIVIDEND", "symbol": "KO", "amount": 0.46, '
+        '"ex_date": "2024-11-29", "record_date": "2024-11-29", "payment_date": "2024-12-16"}',
+        "not json",
+        '{"event_type": "MERGER", "symbol": "X", "target_symbol": "NPSCY", '
+        '"exchange_ratio": 1, "effective_date": "2024-12-18"}',
+        "",
+    ])
+    
+    response = client.post(
+        "/api/v1/events:batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == ["created", "invalid", "created"]
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_batch_create_over_limit_rejects_the_overflow(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, ndjson: bool
+) -> None:
+    """Test records past ingest_max_items are reported rejected and never inserted."""
+    monkeypatch.setattr(events_api.settings, "ingest_max_items", 3)
+    monkeypatch.setattr(events_api.settings, "ingest_chunk_size", 2)
+    records = [
+        {
+            "event_type": "STOCK_SPLIT",
+            "symbol": f"CAP{i}",
+            "split_ratio_from": 1,
+            "split_ratio_to": 2,
+            "effective_date": "2024-12-01",
+        }
+        for i in range(5)
+    ]
+    
+    if ndjson:
+        response = client.post(
+            "/api/v1/events:batch",
+            content="\n".join(json.dumps(record) for record in records),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+    else:
+        response = client.post("/api/v1/events:batch", json=records)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == ["created"] * 3 + ["rejected"] * 2
+    assert (data["created"], data["rejected"]) == (3, 2)
+    persisted = client.get("/api/v1/events").json()
+    assert sorted(e["symbol"] for e in persisted["events"]) == ["CAP0", "CAP1", "CAP2"]
+
+
+async def test_ndjson_lines_split_across_reads() -> None:
+    """Test NDJSON records are reassembled when lines span body chunks."""
+    
+    class StreamedRequest:
+        headers = {"content-type": "application/x-ndjson"}
+        
+        async def stream(self) -> Any:
+            for part in (b'{"a": 1}\n{"b"', b": 2}", b"\n\n", b'{"c": 3}'):
+                yield part
+    
+    records = [r async for r in events_api._iter_batch_records(StreamedRequest())]
+    
+    assert [(index, json.loads(line)) for index, line in records] == [
+        (0, {"a": 1}), (1, {"b": 2}), (2, {"c": 3})
+    ]
+
+
+def test_batch_create_failure_reports_what_was_written(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a failing chunk returns results matching what was committed."""
+    monkeypatch.setattr(events_api.settings, "ingest_chunk_size", 2)
+    create_events = AsyncEventService.create_events
+    calls = 0
+    
+    async def fail_second_chunk(self: AsyncEventService, *args: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("database went away")
+        return await create_events(self, *args)
+    
+    monkeypatch.setattr(AsyncEventService, "create_events", fail_second_chunk)
+    records = [
+        {
+            "event_type": "STOCK_SPLIT",
+            "symbol": f"PART{i}",
+            "split_ratio_from": 1,
+            "split_ratio_to": 2,
+            "effective_date": "2024-12-01",
+        }
+        for i in range(5)
+    ]
+    
+    response = client.post("/api/v1/events:batch", json=records)
+    
+    assert response.status_code == 500
+    data = response.json()
+    assert [r["status"] for r in data["results"]] == ["created"] * 2 + ["failed"] * 3
+    assert (data["created"], data["failed"]) == (2, 3)
+    persisted = client.get("/api/v1/events").json()["events"]
+    assert {e["id"] for e in persisted} == {r["event_id"] for r in data["results"][:2]}
+
+
+def test_list_events_cursor_pagination(client: TestClient) -> None:
+    """Test walking the event list with next_cursor visits each event once."""
+    created = []
+    for i in range(5):
+        response = client.post(
+            "/api/v1/events",
+            json={
+                "event_type": "STOCK_SPLIT",
+                "symbol": f"PAGE{i}",
+                "split_ratio_from": 1,
+                "split_ratio_to": 2,
+                "effective_date": "2024-12-01",
+            },
+        )
+        created.append(response.json()["id"])
+    
+    seen = []
+    params = {"limit": 2, "count": "none"}
+    while True:
+        data = client.get("/api/v1/events", params=params).json()
+        assert data["total"] is None
+        seen.extend(e["id"] for e in data["events"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    
+    assert seen == sorted(created, reverse=True)
+
+
+def test_list_events_invalid_cursor(client: TestClient) -> None:
+    """Test a malformed cursor is rejected with 400."""
+    response = client.get("/api/v1/events", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_conditional_get_returns_not_modified(client: TestClient) -> None:
+    """Test If-None-Match short-circuits to 304 until an event changes."""
+    event_id = client.post(
+        "/api/v1/events",
+        json={
+            "event_type": "DIVIDEND",
+            "symbol": "MSFT",
+            "amount": 0.75,
+            "ex_date": "2024-11-20",
+            "record_date": "2024-11-21",
+            "payment_date": "2024-12-12",
+        },
+    ).json()["id"]
+    
+    for path in ("/api/v1/events?limit=10", f"/api/v1/events/{event_id}", "/api/v1/metrics"):
+        first = client.get(path)
+        etag = first.headers["ETag"]
+        again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304, path
+        assert again.content == b""
+    
+    list_etag = client.get("/api/v1/events?limit=10").headers["ETag"]
+    event_etag = client.get(f"/api/v1/events/{event_id}").headers["ETag"]
+    client.post(f"/api/v1/events/{event_id}/cancel")
+    
+    assert client.get(
+        "/api/v1/events?limit=10", headers={"If-None-Match": list_etag}
+    ).status_code == 200
+    response = client.get(f"/api/v1/events/{event_id}", headers={"If-None-Match": event_etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "CANCELLED"
+    assert client.get(
+        "/api/v1/events?limit=10&status=PENDING", headers={"If-None-Match": list_etag}
+    ).status_code == 200
+
+
+def test_event_calendar_streams_ndjson(client: TestClient) -> None:
+    """Test the calendar returns a watchlist's events in the window as NDJSON."""
+    for symbol, ex_date in (("AAPL", "2024-11-08"), ("MSFT", "2024-11-14"), ("IBM", "2024-11-09")):
+        client.post(
+            "/api/v1/events",
+            json={
+                "event_type": "DIVIDEND",
+                "symbol": symbol,
+                "amount": 0.5,
+                "ex_date": ex_date,
+                "record_date": "2024-11-20",
+                "payment_date": "2024-11-28",
+            },
+        )
+    
+    response = client.post(
+        "/api/v1/events/calendar",
+        json={
+            "date_from": "2024-11-01",
+            "date_to": "2024-11-10",
+            "symbols": ["aapl", "msft", "ibm"],
+            "event_types": ["DIVIDEND"],
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["symbol"] for line in lines] == ["AAPL", "IBM"]
+    assert lines[0]["payload"]["ex_date"] == "2024-11-08"
+    
+    reversed_window = client.post(
+        "/api/v1/events/calendar", json={"date_from": "2024-11-10", "date_to": "2024-11-01"}
+    )
+    assert reversed_window.status_code == 422
+
+
+def test_list_events_multi_value_filters(client: TestClient) -> None:
+    """Test repeated and comma-separated filter values match with IN."""
+    for symbol in ("AAPL", "MSFT", "IBM"):
+        client.post(
+            "/api/v1/events",
+            json={
+                "event_type": "STOCK_SPLIT",
+                "symbol": symbol,
+                "split_ratio_from": 1,
+                "split_ratio_to": 2,
+                "effective_date": "2024-12-01",
+            },
+        )
+    ibm = client.get("/api/v1/events?symbol=IBM").json()["events"][0]["id"]
+    client.post(f"/api/v1/events/{ibm}/cancel")
+    
+    response = client.get("/api/v1/events?symbol=aapl&symbol=IBM,MSFT&status=PENDING,CANCELLED")
+    assert response.status_code == 200
+    assert {e["symbol"] for e in response.json()["events"]} == {"AAPL", "IBM", "MSFT"}
+    
+    response = client.get("/api/v1/events?symbol=AAPL,IBM&status=CANCELLED")
+    assert [e["symbol"] for e in response.json()["events"]] == ["IBM"]
+    
+    assert client.get("/api/v1/events?status=PENDING,BOGUS").status_code == 422
+
+
+def test_event_history(client: TestClient) -> None:
+    """Test an event's audit trail is returned oldest first."""
+    event_id = client.post(
+        "/api/v1/events",
+        json={
+            "event_type": "DIVIDEND",
+            "symbol": "HIST",
+            "amount": 0.20,
+            "ex_date": "2024-11-15",
+            "record_date": "2024-11-18",
+            "payment_date": "2024-11-25",
+        },
+    ).json()["id"]
+    client.post(f"/api/v1/events/{event_id}/cancel")
+    
+    response = client.get(f"/api/v1/events/{event_id}/history")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["event_id"] == event_id
+    assert [(e["old_status"], e["new_status"]) for e in data["entries"]] == [
+        (None, "PENDING"),
+        ("PENDING", "CANCELLED"),
+    ]
+    
+    assert client.get("/api/v1/events/99999/history").status_code == 404
+
+
+def test_audit_export_streams_window(client: TestClient) -> None:
+    """Test the audit export streams the window as NDJSON or CSV."""
+    for symbol in ("EXPA", "EXPB"):
+        client.post(
+            "/api/v1/events",
+            json={
+                "event_type": "STOCK_SPLIT",
+                "symbol": symbol,
+                "split_ratio_from": 1,
+                "split_ratio_to": 2,
+                "effective_date": "2024-12-01",
+            },
+        )
+    window = {"start": "2000-01-01T00:00:00Z", "end": "2100-01-01T00:00:00"}
+    
+    response = client.get("/api/v1/events/audit/export", params=window)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    entries = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["action"] for e in entries] == ["CREATE", "CREATE"]
+    assert entries[0]["changes"]["payload"]["split_ratio_to"] == 2
+    
+    response = client.get("/api/v1/events/audit/export", params={**window, "format": "csv"})
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,event_id,action,old_status,new_status,changes,timestamp,user,correlation_id"
+    assert len(lines) == 3
+    
+    empty = client.get(
+        "/api/v1/events/audit/export",
+        params={"start": "2000-01-01T00:00:00", "end": "2000-02-01T00:00:00", "format": "csv"},
+    )
+    assert empty.text.splitlines() == lines[:1]
+    reversed_window = {"start": window["end"], "end": "2000-01-01T00:00:00"}
+    assert client.get("/api/v1/events/audit/export", params=reversed_window).status_code == 422
@@ -0,0 +1,107 @@
+"""Tests for the async event service."""
+import threading
+from collections.abc import AsyncIterator, Iterator
+from datetime import date
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.event import EventStatus, EventType
+from app.schemas.event import CalendarQuery, EventCreate
+from app.services.async_event_service import AsyncEventService
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+
+def _dividend(symbol: str) -> EventCreate:
+    return EventCreate(
+        event_type=EventType.DIVIDEND,
+        symbol=symbol,
+        amount=0.5,
+        ex_date=date(2024, 11, 15),
+        record_date=date(2024, 11, 18),
+        payment_date=date(2024, 11, 25),
+    )
+
+
+@pytest.fixture
+async def async_db() -> AsyncIterator[AsyncSession]:
+    """Async session on an in-memory aiosqlite database."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statement_threads(db: Session) -> Iterator[set[int]]:
+    """Ids of the threads that ran statements on the sync test engine."""
+    threads: set[int] = set()
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        threads.add(threading.get_ident())
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    yield threads
+    sa_event.remove(engine, "before_cursor_execute", record)
+
+
+async def test_async_session_round_trip(async_db: AsyncSession) -> None:
+    """Test create, list, cancel and metrics over an async driver."""
+    service = AsyncEventService(async_db)
+
+    event = await service.create_event(_dividend("ASYNC"))
+    assert event.status == EventStatus.PENDING
+
+    events, total, _ = await service.list_events(symbol="ASYNC")
+    assert [e.id for e in events] == [event.id]
+    assert total == 1
+
+    assert await service.update_event_statuses([event.id], EventStatus.CANCELLED) == [event.id]
+    cancelled = await service.get_event(event.id)
+    assert cancelled.status == EventStatus.CANCELLED
+
+    metrics = await service.get_metrics()
+    assert metrics["events_by_status"] == {"CANCELLED": 1}
+    await service.ping()
+
+
+async def test_sync_session_runs_in_threadpool(db: Session, statement_threads: set[int]) -> None:
+    """Test the same service works over a sync session, off the event loop thread."""
+    service = AsyncEventService(db)
+
+    results = await service.create_events([_dividend("ONE"), _dividend("TWO")])
+    assert [r["status"] for r in results] == ["created", "created"]
+    assert (await service.get_event(results[0]["event_id"])).symbol == "ONE"
+    assert statement_threads
+    assert threading.get_ident() not in statement_threads
+
+
+@pytest.mark.parametrize("session_kind", ["async", "sync"])
+async def test_stream_calendar(
+    session_kind: str, async_db: AsyncSession, db: Session, statement_threads: set[int]
+) -> None:
+    """Test calendar batches stream over both session kinds."""
+    service = AsyncEventService(async_db if session_kind == "async" else db)
+    await service.create_events([_dividend(symbol) for symbol in ("AAA", "BBB", "CCC")])
+
+    query = CalendarQuery(
+        date_from=date(2024, 11, 1),
+        date_to=date(2024, 11, 30),
+        symbols=["ccc", "aaa"],
+        event_types=[EventType.DIVIDEND],
+    )
+    batches = [batch async for batch in service.stream_calendar(query, fetch_size=1)]
+    assert [[row["symbol"] for row in batch] for batch in batches] == [["AAA"], ["CCC"]]
+    if session_kind == "sync":
+        # Batches are fetched in the threadpool, never on the event loop
+        assert statement_threads and threading.get_ident() not in statement_threads
@@ -0,0 +1,106 @@
+"""Tests for audit log partition rotation and archiving."""
+from collections.abc import Iterator
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.event import AuditLog
+from app.services.audit_archive import (
+    AuditExporter,
+    ParquetAuditExporter,
+    Partition,
+    month_partition,
+    plan_rotation,
+    rotate_audit_partitions,
+)
+
+
+class InMemoryExporter(AuditExporter):
+    """Collects exported rows per partition."""
+
+    def __init__(self, drop_rows: int = 0) -> None:
+        self.archives: dict[str, list[dict[str, Any]]] = {}
+        self.drop_rows = drop_rows
+
+    def export(self, partition: Partition, batches: Iterator[list[dict[str, Any]]]) -> int:
+        rows = [row for batch in batches for row in batch]
+        self.archives[partition.name] = rows
+        return len(rows) - self.drop_rows
+
+
+def _audit(db: Session, *timestamps: datetime) -> None:
+    db.execute(insert(AuditLog), [
+        {
+            "event_id": index,
+            "action": "CREATE",
+            "new_status": "PENDING",
+            "changes": {"n": index},
+            "timestamp": timestamp,
+            "user": "test",
+        }
+        for index, timestamp in enumerate(timestamps)
+    ])
+    db.commit()
+
+
+def test_plan_rotation() -> None:
+    """Test upcoming months are premade and months past retention expire."""
+    existing = [month_partition(date(2024, month, 1)) for month in range(1, 13)]
+    existing.append(month_partition(date(2025, 1, 1)))
+
+    to_create, expired = plan_rotation(
+        existing, date(2025, 1, 20), retention_months=10, premake_months=2
+    )
+
+    assert [p.name for p in to_create] == ["p202502", "p202503"]
+    assert [p.name for p in expired] == ["p202401", "p202402"]
+    assert expired[0].end == date(2024, 2, 1)
+
+
+def test_rotation_archives_then_drops_expired_months(db: Session) -> None:
+    """Test expired months are exported in batches before their rows go."""
+    _audit(
+        db,
+        datetime(2024, 1, 5), datetime(2024, 1, 31, 23, 59), datetime(2024, 2, 10),
+        datetime(2024, 6, 1), datetime(2024, 6, 2),
+    )
+    exporter = InMemoryExporter()
+
+    summary = rotate_audit_partitions(
+        db, exporter, today=date(2024, 6, 15), retention_months=3, chunk_size=1
+    )
+
+    assert summary["archived"] == {"p202401": 2, "p202402": 1}
+    assert [row["changes"] for row in exporter.archives["p202401"]] == [{"n": 0}, {"n": 1}]
+    remaining = [timestamp for (timestamp,) in db.query(AuditLog.timestamp)]
+    assert remaining == [datetime(2024, 6, 1), datetime(2024, 6, 2)]
+
+
+def test_rotation_keeps_partition_when_export_is_incomplete(db: Session) -> None:
+    """Test a short export stops rotation without dropping anything."""
+    _audit(db, datetime(2024, 1, 5), datetime(2024, 1, 6))
+
+    with pytest.raises(RuntimeError, match="not dropping"):
+        rotate_audit_partitions(
+            db, InMemoryExporter(drop_rows=1), today=date(2024, 6, 15), retention_months=3
+        )
+
+    assert db.query(AuditLog).count() == 2
+
+
+def test_parquet_export(db: Session, tmp_path: Path) -> None:
+    """Test the Parquet exporter writes a readable, compressed archive."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    _audit(db, datetime(2024, 1, 5), datetime(2024, 1, 6))
+
+    rotate_audit_partitions(
+        db, ParquetAuditExporter(tmp_path), today=date(2024, 6, 15), retention_months=3
+    )
+
+    table = pq.read_table(tmp_path / "audit_logs-p202401.parquet")
+    assert table.num_rows == 2
+    assert table.column("changes").to_pylist() == ['{"n":0}', '{"n":1}']
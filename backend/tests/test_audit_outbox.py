@@ -0,0 +1,65 @@
+"""Tests for the audit outbox and its flusher."""
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.event import AuditLog, AuditOutbox, EventStatus, EventType
+from app.schemas.event import EventCreate
+from app.services import event_service
+from app.services.audit_outbox import AuditOutboxFlusher, flush_audit_outbox
+from app.services.event_service import EventService
+
+
+@pytest.fixture
+def outbox_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Route audit writes through the outbox."""
+    monkeypatch.setattr(event_service.settings, "audit_outbox_enabled", True)
+
+
+def _create_dividends(db: Session, count: int) -> list[int]:
+    service = EventService(db)
+    return [
+        service.create_event(
+            EventCreate(
+                event_type=EventType.DIVIDEND,
+                symbol=f"OUT{i}",
+                amount=0.25,
+                ex_date=date(2024, 11, 15),
+                record_date=date(2024, 11, 18),
+                payment_date=date(2024, 11, 25),
+            )
+        ).id
+        for i in range(count)
+    ]
+
+
+def test_audit_entries_are_moved_in_batches(db: Session, outbox_enabled: None) -> None:
+    """Test writes land in the outbox and flushes move them over unchanged."""
+    ids = _create_dividends(db, 3)
+    EventService(db).update_event_status(ids[0], EventStatus.CANCELLED, user="ops")
+    assert db.query(AuditLog).count() == 0
+    pending = db.query(AuditOutbox).order_by(AuditOutbox.id).all()
+    written = [(e.event_id, e.action, e.user, e.timestamp) for e in pending]
+
+    assert flush_audit_outbox(db, batch_size=3) == 3
+    assert flush_audit_outbox(db, batch_size=3) == 1
+    assert flush_audit_outbox(db, batch_size=3) == 0
+
+    assert db.query(AuditOutbox).count() == 0
+    moved = db.query(AuditLog).order_by(AuditLog.id).all()
+    assert [(e.event_id, e.action, e.user, e.timestamp) for e in moved] == written
+    assert moved[-1].old_status == EventStatus.PENDING.value
+
+
+def test_flusher_drains_and_samples_backlog(
+    db: Session, session_factory: sessionmaker, outbox_enabled: None
+) -> None:
+    """Test a drain empties the outbox and resets the depth gauge."""
+    _create_dividends(db, 5)
+    flusher = AuditOutboxFlusher(batch_size=2, session_factory=session_factory)
+
+    assert flusher.drain() == 5
+
+    assert db.query(AuditLog).count() == 5
+    assert flusher.stats() == {"running": False, "depth": 0, "lag_seconds": 0.0}
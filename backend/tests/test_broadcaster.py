@@ -0,0 +1,108 @@
+"""Tests for the push-stream broadcaster."""
+import asyncio
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.models.event import EventStatus, EventType
+from app.schemas.event import EventCreate
+from app.services import event_service
+from app.services.broadcaster import EventBroadcaster
+
+
+async def test_publish_fans_out_to_all_subscribers() -> None:
+    """Test one published message reaches every subscriber in order."""
+    broadcaster = EventBroadcaster()
+    await broadcaster.start()
+    try:
+        with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+            broadcaster.publish({"type": "status", "to": "COMPLETED"})
+            broadcaster.publish({"type": "status", "to": "FAILED"})
+            for subscription in (first, second):
+                assert (await subscription.get(1))["to"] == "COMPLETED"
+                assert (await subscription.get(1))["to"] == "FAILED"
+        assert broadcaster.subscriber_count == 0
+    finally:
+        await broadcaster.stop()
+
+
+async def test_slow_subscriber_resyncs_without_stale_deltas() -> None:
+    """Test a full client queue is replaced by a single resync notice."""
+    broadcaster = EventBroadcaster(client_queue_size=2)
+    await broadcaster.start()
+    try:
+        with broadcaster.subscribe() as subscription:
+            for i in range(5):
+                broadcaster.publish({"type": "status", "n": i})
+            await asyncio.sleep(0.05)
+
+            assert await subscription.get(1) == {"type": "resync", "dropped": 5}
+            assert await subscription.get(0.01) is None
+
+            broadcaster.publish({"type": "status", "n": 5})
+            assert (await subscription.get(1))["n"] == 5
+    finally:
+        await broadcaster.stop()
+
+
+async def test_remote_changes_trigger_resync() -> None:
+    """Test a change sequence moving past what was published resyncs subscribers."""
+    sequence = 10
+    broadcaster = EventBroadcaster(sequence_poll_interval=0.01)
+    await broadcaster.start(read_sequence=lambda: sequence)
+    try:
+        with broadcaster.subscribe() as subscription:
+            await asyncio.sleep(0.05)
+            assert await subscription.get(0.01) is None
+
+            # A local change that reaches the producer is not a resync
+            sequence = 11
+            broadcaster.publish({"type": "status", "change_sequence": 11})
+            assert (await subscription.get(1))["change_sequence"] == 11
+            await asyncio.sleep(0.05)
+            assert await subscription.get(0.01) is None
+
+            sequence = 13
+            assert await subscription.get(1) == {"type": "resync", "dropped": 0}
+    finally:
+        await broadcaster.stop()
+
+
+async def test_service_publishes_committed_changes(db: Session, monkeypatch) -> None:
+    """Test creates and transitions from worker threads reach subscribers."""
+    broadcaster = EventBroadcaster()
+    monkeypatch.setattr(event_service, "broadcaster", broadcaster)
+    await broadcaster.start()
+    service = event_service.EventService(db)
+    loop = asyncio.get_running_loop()
+    try:
+        with broadcaster.subscribe() as subscription:
+            event = await loop.run_in_executor(
+                None,
+                service.create_event,
+                EventCreate(
+                    event_type=EventType.DIVIDEND,
+                    symbol="PUSH",
+                    amount=0.5,
+                    ex_date=date(2024, 11, 15),
+                    record_date=date(2024, 11, 18),
+                    payment_date=date(2024, 11, 25),
+                ),
+            )
+            created = await subscription.get(1)
+            assert created["type"] == "created"
+            assert created["events"][0]["id"] == event.id
+            assert created["deltas"] == {"status": {"PENDING": 1}, "type": {"DIVIDEND": 1}}
+
+            await loop.run_in_executor(
+                None, service.update_event_statuses, [event.id], EventStatus.CANCELLED
+            )
+            transition = await subscription.get(1)
+            assert transition["type"] == "status"
+            assert transition["to"] == "CANCELLED"
+            assert transition["events"] == [{"id": event.id, "from": "PENDING", "retry_count": 0}]
+            assert transition["deltas"] == {"status": {"PENDING": -1, "CANCELLED": 1}}
+            assert transition["change_sequence"] == created["change_sequence"] + 1
+            assert transition["change_sequence"] == service.get_metrics()["change_sequence"]
+    finally:
+        await broadcaster.stop()
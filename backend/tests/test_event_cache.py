@@ -0,0 +1,93 @@
+"""Tests for the event detail cache."""
+import time
+
+from fastapi.testclient import TestClient
+
+from app.services.event_cache import (
+    CachedResponse,
+    EventCache,
+    InMemorySharedClient,
+    InProcessCacheBackend,
+    SharedCacheBackend,
+    event_cache,
+)
+
+
+def test_in_process_backend_evicts_lru_and_expires() -> None:
+    """Test the local backend is bounded by size and TTL."""
+    backend = InProcessCacheBackend(max_entries=2)
+    backend.set("1", b"one", ttl=60)
+    backend.set("2", b"two", ttl=60)
+    assert backend.get("1") == b"one"
+    backend.set("3", b"three", ttl=60)
+
+    assert backend.get("2") is None
+    assert backend.get("1") == b"one"
+    assert backend.size() == 2
+
+    backend.set("4", b"four", ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("4") is None
+
+
+def test_fill_racing_an_invalidation_is_not_stored() -> None:
+    """Test a body loaded before a write cannot repopulate the cache."""
+    cache = EventCache(InProcessCacheBackend())
+    token = cache.fill_token()
+    cache.invalidate([1])
+
+    assert cache.put(1, CachedResponse('"a"', b"stale"), token) is False
+    assert cache.put(2, CachedResponse('"b"', b"other"), token) is True
+    assert cache.get(1) is None
+    assert cache.get(2) == CachedResponse('"b"', b"other")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_shared_backend_invalidates_across_replicas() -> None:
+    """Test an invalidation on one replica is seen by another."""
+    client = InMemorySharedClient()
+    writer = EventCache(SharedCacheBackend(client))
+    reader = EventCache(SharedCacheBackend(client))
+
+    reader.put(7, CachedResponse('"c"', b"cached"), reader.fill_token())
+    assert writer.get(7) == CachedResponse('"c"', b"cached")
+
+    writer.invalidate([7])
+    assert reader.get(7) is None
+
+
+def test_shared_backend_ignores_non_bytes_values() -> None:
+    """Test a client returning decoded strings is treated as a miss."""
+    client = InMemorySharedClient()
+    backend = SharedCacheBackend(client, prefix="p:")
+    # e.g. a Redis client created with decode_responses=True
+    client.set("p:text", "not bytes", ex=60)  # type: ignore[arg-type]
+    backend.set("raw", b"bytes", ttl=60)
+
+    assert backend.get("text") is None
+    assert backend.get("raw") == b"bytes"
+
+
+def test_get_event_served_from_cache_and_invalidated(client: TestClient) -> None:
+    """Test repeat reads hit the cache and a status change invalidates it."""
+    event_id = client.post(
+        "/api/v1/events",
+        json={
+            "event_type": "STOCK_SPLIT",
+            "symbol": "TSLA",
+            "split_ratio_from": 1,
+            "split_ratio_to": 3,
+            "effective_date": "2024-12-01",
+        },
+    ).json()["id"]
+
+    first = client.get(f"/api/v1/events/{event_id}")
+    hits = event_cache.hits
+    second = client.get(f"/api/v1/events/{event_id}")
+    assert second.content == first.content
+    assert event_cache.hits == hits + 1
+
+    client.post(f"/api/v1/events/{event_id}/cancel")
+    response = client.get(f"/api/v1/events/{event_id}")
+    assert response.json()["status"] == "CANCELLED"
@@ -0,0 +1,111 @@
+"""Tests for the background event processor."""
+from datetime import date
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.event import AuditLog, EventStatus, EventType
+from app.schemas.event import EventCreate
+from app.services.event_processor import EventProcessor, WorkerStats
+from app.services.event_service import EventService
+from app.services.latency import LatencyTracker
+
+
+def _create_dividends(db: Session, count: int) -> list[int]:
+    service = EventService(db)
+    ids = []
+    for i in range(count):
+        event = service.create_event(
+            EventCreate(
+                event_type=EventType.DIVIDEND,
+                symbol=f"PROC{i}",
+                amount=0.25,
+                ex_date=date(2024, 11, 15),
+                record_date=date(2024, 11, 18),
+                payment_date=date(2024, 11, 25),
+            )
+        )
+        ids.append(event.id)
+    return ids
+
+
+def test_worker_processes_claimed_batch(db: Session) -> None:
+    """Test a worker claims up to batch_size events and completes them."""
+    ids = _create_dividends(db, 3)
+    processor = EventProcessor(failure_rate=0.0, processing_delay=0.0, batch_size=2)
+    processor.running = True
+    stats = WorkerStats("test-worker")
+
+    assert processor._process_pending_events(db, stats) == 2
+    assert processor._process_pending_events(db, stats) == 1
+    assert processor._process_pending_events(db, stats) == 0
+
+    service = EventService(db)
+    assert all(service.get_event(i).status == EventStatus.COMPLETED for i in ids)
+    snapshot = stats.snapshot()
+    assert snapshot["events_processed"] == 3
+    assert 0.0 <= snapshot["utilization"] <= 1.0
+
+
+def test_worker_records_latency(db: Session) -> None:
+    """Test processing and queue-wait timings feed the sketches and audit trail."""
+    ids = _create_dividends(db, 2)
+    tracker = LatencyTracker()
+    processor = EventProcessor(
+        failure_rate=0.0, processing_delay=0.0, batch_size=2, tracker=tracker
+    )
+    processor.running = True
+
+    processor._process_pending_events(db, WorkerStats("test-worker"))
+
+    dividend = tracker.summary()["latency_by_type"]["DIVIDEND"]
+    assert dividend["processing"]["count"] == 2
+    assert dividend["queue_wait"]["count"] == 2
+    assert tracker.summary()["average_processing_time_seconds"] is not None
+
+    completion = (
+        db.query(AuditLog)
+        .filter(AuditLog.event_id == ids[0], AuditLog.new_status == EventStatus.COMPLETED.value)
+        .one()
+    )
+    timing = completion.changes["timing"]
+    assert timing["claimed_at"] <= timing["started_at"] <= timing["finished_at"]
+    assert timing["processing_seconds"] >= 0
+
+
+def test_stopping_worker_releases_unstarted_events(db: Session) -> None:
+    """Test claimed events are handed back to the queue when stopping."""
+    ids = _create_dividends(db, 2)
+    processor = EventProcessor(failure_rate=0.0, processing_delay=0.0, batch_size=2)
+    processor.running = False
+
+    assert processor._process_pending_events(db, WorkerStats("test-worker")) == 2
+
+    service = EventService(db)
+    assert all(service.get_event(i).status == EventStatus.PENDING for i in ids)
+
+
+def test_worker_pool_start_and_stop(session_factory: sessionmaker) -> None:
+    """Test the pool starts one thread per worker and drains on stop."""
+    processor = EventProcessor(
+        processing_delay=0.0,
+        workers=3,
+        poll_max_interval=0.05,
+        session_factory=session_factory,
+    )
+    processor.start()
+    try:
+        assert len(processor.threads) == 3
+        assert all(thread.is_alive() for thread in processor.threads)
+        stats = processor.get_stats()
+        assert stats["running"] is True
+        assert [w["name"] for w in stats["workers"]] == [
+            "event-processor-0",
+            "event-processor-1",
+            "event-processor-2",
+        ]
+    finally:
+        threads = processor.threads
+        processor.stop()
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert processor.get_stats()["running"] is False
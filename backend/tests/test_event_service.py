@@ -0,0 +1,412 @@
+"""Tests for the event service layer."""
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.models.event import AuditLog, CorporateActionEvent, EventStatus, EventType
+from app.schemas.event import (
+    EVENT_LIST_JSON,
+    AuditLogResponse,
+    AuditRow,
+    EventCreate,
+    EventList,
+    EventListRows,
+    EventResponse,
+    EventRow,
+)
+from app.services import event_service
+from app.services.event_service import EventService
+
+
+def _dividend(symbol: str, **overrides: object) -> EventCreate:
+    data = {
+        "event_type": EventType.DIVIDEND,
+        "symbol": symbol,
+        "amount": 0.25,
+        "ex_date": date(2024, 11, 15),
+        "record_date": date(2024, 11, 18),
+        "payment_date": date(2024, 11, 25),
+    }
+    data.update(overrides)
+    return EventCreate(**data)
+
+
+def test_claim_events_hands_out_disjoint_batches(db: Session) -> None:
+    """Test successive claims never return the same event twice."""
+    service = EventService(db)
+    ids = [service.create_event(_dividend(f"CLM{i}")).id for i in range(5)]
+
+    first = service.claim_events(limit=3, owner="worker-1")
+    second = service.claim_events(limit=3, owner="worker-2")
+    third = service.claim_events(limit=3, owner="worker-3")
+
+    first_ids = [e.id for e in first]
+    second_ids = [e.id for e in second]
+    assert first_ids == ids[:3]  # oldest first
+    assert second_ids == ids[3:]
+    assert third == []
+    assert all(e.status == EventStatus.PROCESSING for e in first + second)
+    assert {e.lease_owner for e in first} == {"worker-1"}
+    assert all(e.lease_expires_at is not None for e in first + second)
+
+
+def test_claim_events_writes_audit_trail(db: Session) -> None:
+    """Test each claimed event gets a PENDING -> PROCESSING audit entry."""
+    service = EventService(db)
+    event = service.create_event(_dividend("AUDIT"))
+
+    service.claim_events(limit=1, owner="host:worker-1", user="worker-1")
+
+    entries = db.query(AuditLog).filter(AuditLog.event_id == event.id).all()
+    assert [(a.old_status, a.new_status, a.user) for a in entries] == [
+        (None, "PENDING", "system"),
+        ("PENDING", "PROCESSING", "worker-1"),
+    ]
+
+
+def test_release_expired_leases_requeues_only_expired(db: Session) -> None:
+    """Test the reaper returns expired leases to PENDING and leaves live ones."""
+    service = EventService(db)
+    expired = service.create_event(_dividend("DEAD"))
+    live = service.create_event(_dividend("LIVE"))
+    service.claim_events(limit=2, owner="dead-pod")
+    db.query(CorporateActionEvent).filter(CorporateActionEvent.id == expired.id).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    assert service.release_expired_leases() == 1
+
+    reclaimed = service.get_event(expired.id)
+    assert reclaimed.status == EventStatus.PENDING
+    assert reclaimed.lease_owner is None
+    assert reclaimed.retry_count == 1
+    assert service.get_event(live.id).status == EventStatus.PROCESSING
+    assert service.release_expired_leases() == 0
+
+
+def test_release_expired_leases_audits_only_released_rows(db: Session) -> None:
+    """Test a row that changes before the reset is neither audited nor counted."""
+    service = EventService(db)
+    ids = [service.create_event(_dividend(symbol)).id for symbol in ("DEAD", "DONE")]
+    service.claim_events(limit=2, owner="dead-pod")
+    db.query(CorporateActionEvent).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    engine = db.get_bind()
+    finished: list[int] = []
+
+    def finish_first(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        # The worker completes DONE between the reaper's SELECT and UPDATE
+        if statement.startswith("UPDATE corporate_action_events") and not finished:
+            finished.append(ids[1])
+            cursor.execute(
+                "UPDATE corporate_action_events SET status = 'COMPLETED' WHERE id = ?", (ids[1],)
+            )
+
+    sa_event.listen(engine, "before_cursor_execute", finish_first)
+    try:
+        assert service.release_expired_leases() == 1
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", finish_first)
+
+    audited = db.query(AuditLog.event_id).filter(AuditLog.user == "reaper").all()
+    assert audited == [(ids[0],)]
+    assert service.get_event(ids[1]).status == EventStatus.COMPLETED
+    assert service.get_metrics()["events_by_status"] == {"PENDING": 1, "PROCESSING": 1}
+
+
+def test_update_status_ignored_after_lease_lost(db: Session) -> None:
+    """Test a worker cannot complete an event it no longer holds a lease on."""
+    service = EventService(db)
+    event = service.create_event(_dividend("LOST"))
+    service.claim_events(limit=1, owner="slow-worker")
+    db.query(CorporateActionEvent).update({"lease_owner": "other-worker"})
+    db.commit()
+
+    assert (
+        service.update_event_status(
+            event.id, EventStatus.COMPLETED, lease_owner="slow-worker"
+        )
+        is None
+    )
+    assert service.get_event(event.id).status == EventStatus.PROCESSING
+
+
+def test_update_event_statuses_is_one_round_trip_per_step(db: Session) -> None:
+    """Test a bulk transition costs the same statements for 1 or N events."""
+    service = EventService(db)
+    ids = [service.create_event(_dividend(f"BULK{i}")).id for i in range(10)]
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        statements.append(statement.split()[0])
+
+    engine = db.get_bind()
+    sa_event.listen(engine, "before_cursor_execute", count)
+    try:
+        updated = service.update_event_statuses(
+            ids, EventStatus.FAILED, error_message="boom", user="tester"
+        )
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+
+    assert sorted(updated) == ids
+    # Status update, audit executemany, counter upsert
+    assert statements == ["SELECT", "UPDATE", "INSERT", "INSERT"]
+    for event_id in ids:
+        event = service.get_event(event_id)
+        assert event.status == EventStatus.FAILED
+        assert event.retry_count == 1
+    assert db.query(AuditLog).filter(AuditLog.user == "tester").count() == 10
+
+
+def test_update_event_statuses_respects_from_statuses(db: Session) -> None:
+    """Test events outside from_statuses are left untouched."""
+    service = EventService(db)
+    done = service.create_event(_dividend("DONE")).id
+    pending = service.create_event(_dividend("PEND")).id
+    service.update_event_statuses([done], EventStatus.COMPLETED)
+
+    cancelled = service.update_event_statuses(
+        [done, pending],
+        EventStatus.CANCELLED,
+        from_statuses=[EventStatus.PENDING, EventStatus.PROCESSING],
+    )
+
+    assert cancelled == [pending]
+    assert service.get_event(done).status == EventStatus.COMPLETED
+    assert service.get_event(pending).status == EventStatus.CANCELLED
+
+
+def test_metrics_counters_match_table_aggregates(db: Session) -> None:
+    """Test incrementally maintained counters agree with GROUP BY over events."""
+    service = EventService(db)
+    ids = [service.create_event(_dividend(f"MET{i}")).id for i in range(4)]
+    service.create_events([_dividend("METB1"), _dividend("METB2")])
+    claimed = service.claim_events(limit=3, owner="worker")
+    service.update_event_statuses([claimed[0].id], EventStatus.COMPLETED)
+    service.update_event_statuses([claimed[1].id], EventStatus.FAILED, error_message="x")
+    service.update_event_statuses([ids[3]], EventStatus.CANCELLED)
+
+    metrics = service.get_metrics()
+
+    assert metrics["total_events"] == 6
+    assert metrics["events_by_type"] == {"DIVIDEND": 6}
+    assert metrics["events_by_status"] == {
+        "PENDING": 2,
+        "PROCESSING": 1,
+        "COMPLETED": 1,
+        "FAILED": 1,
+        "CANCELLED": 1,
+    }
+    assert metrics["recent_events_1h"] == 6
+    assert metrics["recent_events_24h"] == 6
+    assert metrics["error_rate"] == round(1 / 6, 4)
+
+
+def test_change_sequence_is_striped(db: Session) -> None:
+    """Test every write bumps the summed sequence once without sharing one row."""
+    from app.models.metrics import EventCounter
+    from app.services.event_counters import SEQUENCE, read_change_sequence
+
+    service = EventService(db)
+    ids = [service.create_event(_dividend(f"SEQ{i}")).id for i in range(20)]
+    service.update_event_statuses(ids[:5], EventStatus.CANCELLED)
+
+    assert read_change_sequence(db) == 21
+    assert service.get_metrics()["change_sequence"] == 21
+    stripes = db.query(EventCounter.key).filter(EventCounter.dimension == SEQUENCE).all()
+    assert len(stripes) > 1
+
+
+def test_rebuild_counters_from_existing_events(db: Session) -> None:
+    """Test counters can be seeded from a table that predates them."""
+    from app.models.metrics import EventCountBucket, EventCounter
+    from app.services.event_counters import ensure_counters
+
+    service = EventService(db)
+    for i in range(3):
+        service.create_event(_dividend(f"OLD{i}"))
+    db.query(EventCounter).delete()
+    db.query(EventCountBucket).delete()
+    db.commit()
+    assert service.get_metrics()["total_events"] == 0
+
+    ensure_counters(db)
+
+    metrics = service.get_metrics()
+    assert metrics["total_events"] == 3
+    assert metrics["events_by_status"] == {"PENDING": 3}
+    assert metrics["recent_events_1h"] == 3
+
+
+def test_list_event_rows_serialize_like_event_list(db: Session) -> None:
+    """Test the row-based list path produces the same JSON as the model path."""
+    service = EventService(db)
+    for i in range(3):
+        service.create_event(_dividend(f"ROW{i}", idempotency_key=f"row-{i}"))
+
+    events, total, next_cursor = service.list_events(limit=2)
+    rows, row_total, row_cursor = service.list_event_rows(limit=2)
+    assert (row_total, row_cursor) == (total, next_cursor)
+
+    page = {"total": total, "page": 1, "page_size": 2, "next_cursor": next_cursor}
+    expected = EventList(events=[EventResponse.model_validate(e) for e in events], **page)
+    assert EVENT_LIST_JSON.dump_json({"events": rows, **page}) == expected.model_dump_json().encode()
+
+
+@pytest.mark.parametrize(
+    ("rows", "model"),
+    [(EventRow, EventResponse), (EventListRows, EventList), (AuditRow, AuditLogResponse)],
+)
+def test_row_types_match_response_models(rows: type, model: type) -> None:
+    """Test each row TypedDict has its model's fields, in the same order."""
+    assert list(rows.__annotations__) == list(model.model_fields)
+
+
+def test_date_range_filter_on_backfilled_columns(db: Session) -> None:
+    """Test promoted dates are written, backfilled in chunks and filterable."""
+    from app.services.payload_backfill import backfill_promoted_fields
+
+    service = EventService(db)
+    for day in (10, 15, 20):
+        service.create_event(_dividend(f"D{day}", ex_date=date(2024, 11, day)))
+    service.create_event(
+        EventCreate(
+            event_type=EventType.MERGER,
+            symbol="ACQ",
+            target_symbol="TGT",
+            exchange_ratio=1.5,
+            effective_date=date(2024, 12, 1),
+        )
+    )
+
+    # Simulate rows written before the columns existed
+    promoted = ("ex_date", "record_date", "payment_date", "effective_date", "target_symbol")
+    db.query(CorporateActionEvent).update(
+        dict.fromkeys(promoted), synchronize_session=False
+    )
+    db.commit()
+    assert service.list_events(date_from=date(2024, 11, 1))[0] == []
+
+    assert backfill_promoted_fields(db, chunk_size=2) == 4
+    assert backfill_promoted_fields(db, chunk_size=2) == 0
+
+    events, total, _ = service.list_events(
+        event_type=EventType.DIVIDEND, date_from=date(2024, 11, 12), date_to=date(2024, 11, 20)
+    )
+    assert total == 2
+    assert {e.symbol for e in events} == {"D15", "D20"}
+    assert [e.symbol for e in service.list_events(target_symbol="tgt")[0]] == ["ACQ"]
+    assert service.list_events(
+        date_field="effective_date", date_from=date(2024, 12, 1)
+    )[1] == 1
+
+
+def test_upgrade_schema_adds_columns_to_existing_table() -> None:
+    """Test columns and indexes added after deployment reach an old table once."""
+    from sqlalchemy import Column, MetaData, Table, create_engine, inspect
+    from sqlalchemy.pool import StaticPool
+
+    from app.core.database import SCHEMA_ADDITIONS, upgrade_schema
+    from app.services.payload_backfill import backfill_promoted_fields
+
+    table = CorporateActionEvent.__table__
+    added_columns, added_indexes = SCHEMA_ADDITIONS[table.name]
+    old_engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    old_table = Table(
+        table.name,
+        MetaData(),
+        *(
+            Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+            for c in table.columns
+            if c.name not in added_columns
+        ),
+    )
+    old_table.create(old_engine)
+    with old_engine.begin() as conn:
+        conn.execute(
+            old_table.insert().values(
+                event_type=EventType.DIVIDEND,
+                symbol="OLD",
+                status=EventStatus.PENDING,
+                created_at=datetime(2024, 11, 1),
+                updated_at=datetime(2024, 11, 1),
+                payload={"ex_date": "2024-11-15"},
+                retry_count=0,
+                created_by="system",
+            )
+        )
+
+    upgrade_schema(old_engine)
+    upgrade_schema(old_engine)
+
+    inspector = inspect(old_engine)
+    assert set(added_columns) <= {c["name"] for c in inspector.get_columns(table.name)}
+    assert set(added_indexes) <= {i["name"] for i in inspector.get_indexes(table.name)}
+    session = Session(old_engine)
+    try:
+        assert backfill_promoted_fields(session) == 1
+        assert session.get(CorporateActionEvent, 1).ex_date == date(2024, 11, 15)
+    finally:
+        session.close()
+
+
+def test_in_filters_are_padded_to_few_statement_shapes(db: Session) -> None:
+    """Test IN lists round up to a power of two and still match correctly."""
+    service = EventService(db)
+    for symbol in ("S1", "S2", "S3"):
+        service.create_event(_dividend(symbol))
+
+    statements: list[str] = []
+    engine = db.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", capture)
+    try:
+        events, total, _ = service.list_events(symbol=["s1", "S3", "S5"], count="none")
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", capture)
+
+    assert {e.symbol for e in events} == {"S1", "S3"}
+    in_list = statements[-1].split("symbol IN (")[1].split(")")[0]
+    assert in_list.count("?") == 4
+
+
+def test_count_cache_is_bounded(db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cached list counts evict least recently used filters beyond the limit."""
+    cache: OrderedDict = OrderedDict()
+    monkeypatch.setattr(event_service, "_count_cache", cache)
+    monkeypatch.setattr(event_service.settings, "list_count_cache_max_entries", 2)
+    service = EventService(db)
+    service.create_event(_dividend("S1"))
+
+    assert service.list_events(symbol="S1", count="cached")[1] == 1
+    service.list_events(symbol="S2", count="cached")
+    service.list_events(symbol="S1", count="cached")
+    service.list_events(symbol="S3", count="cached")
+
+    assert len(cache) == 2
+    assert [key for key in cache if "S2" in str(key)] == []
+
+
+def test_count_cache_drops_expired_counts(db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test writing a count first drops every expired one."""
+    cache: OrderedDict = OrderedDict()
+    monkeypatch.setattr(event_service, "_count_cache", cache)
+    monkeypatch.setattr(event_service.settings, "list_count_cache_seconds", 0)
+    service = EventService(db)
+
+    for symbol in ("S1", "S2", "S3"):
+        service.list_events(symbol=symbol, count="cached")
+
+    assert len(cache) == 1
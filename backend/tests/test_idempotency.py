@@ -0,0 +1,174 @@
+"""Tests for the idempotency key fast path and response replay."""
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.models.event import CorporateActionEvent, EventType, IdempotencyRecord
+from app.schemas.event import EventCreate, EventResponse
+from app.services.event_service import EventService
+from app.services.idempotency import (
+    BloomFilter,
+    DuplicateIdempotencyKeyError,
+    IdempotencyIndex,
+    expire_replay_records,
+    idempotency_index,
+)
+
+
+def _dividend(key: str, amount: float = 0.25) -> EventCreate:
+    return EventCreate(
+        event_type=EventType.DIVIDEND,
+        symbol="IDEM",
+        amount=amount,
+        ex_date=date(2024, 11, 15),
+        record_date=date(2024, 11, 18),
+        payment_date=date(2024, 11, 25),
+        idempotency_key=key,
+    )
+
+
+@pytest.fixture
+def statements(db: Session) -> Iterator[list[str]]:
+    """SQL statements executed while the test runs."""
+    executed: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        executed.append(statement)
+
+    engine = db.get_bind()
+    sa_event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    sa_event.remove(engine, "before_cursor_execute", record)
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    """Test every added key is reported and unseen keys rarely are."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"key-{i}")
+
+    assert all(f"key-{i}" in bloom for i in range(1000))
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+
+def test_index_is_bounded_and_rotates_bloom_generations() -> None:
+    """Test the LRU drops old keys and the bloom forgets two generations back."""
+    index = IdempotencyIndex(max_entries=2, bloom_capacity=2)
+    for i in range(5):
+        index.add(f"k{i}", i)
+
+    assert index.get("k0") is None
+    assert index.get("k4") == 4
+    assert index.stats() == {"recent": 2, "bloom_keys": 3}
+    assert not IdempotencyIndex(max_entries=0).get("k4")
+    assert IdempotencyIndex(max_entries=0).may_contain("anything")
+
+
+def test_retry_returns_original_without_insert(db: Session, statements: list[str]) -> None:
+    """Test a recent duplicate is answered by primary key, before any INSERT."""
+    service = EventService(db)
+    original = service.create_event(_dividend("retry-1"))
+    statements.clear()
+
+    with pytest.raises(DuplicateIdempotencyKeyError) as excinfo:
+        service.create_event(_dividend("retry-1"))
+
+    assert excinfo.value.event.id == original.id
+    assert len(statements) == 1
+    assert not any(s.lstrip().upper().startswith("INSERT") for s in statements)
+
+
+def test_new_key_skips_lookup(db: Session, statements: list[str]) -> None:
+    """Test a key the bloom filter has not seen goes straight to the INSERT."""
+    EventService(db).create_event(_dividend("fresh-1"))
+
+    assert statements[0].lstrip().upper().startswith("INSERT")
+
+
+def test_forgotten_key_falls_back_to_unique_index(db: Session) -> None:
+    """Test a key the index does not know is still caught, returning the original."""
+    service = EventService(db)
+    original = service.create_event(_dividend("forgotten-1"))
+    idempotency_index.clear()
+
+    with pytest.raises(DuplicateIdempotencyKeyError) as excinfo:
+        service.create_event(_dividend("forgotten-1"))
+
+    assert excinfo.value.event.id == original.id
+    assert db.query(CorporateActionEvent).count() == 1
+
+
+def test_rebuild_loads_existing_keys(db: Session) -> None:
+    """Test a rebuilt index answers keys written before it started."""
+    service = EventService(db)
+    ids = [service.create_event(_dividend(f"rebuild-{i}")).id for i in range(3)]
+    index = IdempotencyIndex(max_entries=2, bloom_capacity=10)
+
+    assert index.rebuild(db, batch_size=2) == 3
+
+    assert index.get("rebuild-0") is None
+    assert index.may_contain("rebuild-0")
+    assert [index.get(f"rebuild-{i}") for i in (1, 2)] == ids[1:]
+
+
+def test_rebuild_stops_at_the_replay_window(db: Session) -> None:
+    """Test keys created before the replay retention window are not loaded."""
+    service = EventService(db)
+    for i in range(3):
+        service.create_event(_dividend(f"window-{i}"))
+    stale = CorporateActionEvent.idempotency_key == "window-0"
+    db.query(CorporateActionEvent).filter(stale).update(
+        {"created_at": datetime.utcnow() - timedelta(days=30)}
+    )
+    db.commit()
+    index = IdempotencyIndex(max_entries=10, bloom_capacity=10)
+
+    assert index.rebuild(db, batch_size=1) == 2
+
+    assert index.get("window-0") is None
+    assert index.get("window-2") is not None
+
+
+def test_replay_after_fallback_learns_the_key(db: Session) -> None:
+    """Test a key created elsewhere is replayed once the unique index reports it."""
+    service = EventService(db)
+    original = service.create_event(_dividend("replay-1"))
+    idempotency_index.clear()
+    assert service.get_replay(_dividend("replay-1")) is None
+
+    with pytest.raises(DuplicateIdempotencyKeyError):
+        service.create_event(_dividend("replay-1"))
+
+    replay = service.get_replay(_dividend("replay-1"))
+    assert EventResponse.model_validate_json(replay).id == original.id
+    assert service.get_replay(_dividend("replay-1", amount=0.5)) is None
+
+
+def test_batch_created_key_is_replayed(db: Session) -> None:
+    """Test a keyed event created in bulk is replayed to a single-create retry."""
+    service = EventService(db)
+    results = service.create_events([_dividend("bulk-1"), _dividend("bulk-2", amount=0.5)])
+
+    replay = service.get_replay(_dividend("bulk-2", amount=0.5))
+    assert EventResponse.model_validate_json(replay).id == results[1]["event_id"]
+    assert service.get_replay(_dividend("bulk-2")) is None
+    assert db.query(IdempotencyRecord).count() == 2
+
+
+def test_expired_replay_records_are_deleted_in_batches(db: Session) -> None:
+    """Test expiry removes only records past their TTL and stops replaying them."""
+    service = EventService(db)
+    for i in range(3):
+        service.create_event(_dividend(f"expire-{i}"))
+    db.query(IdempotencyRecord).filter(IdempotencyRecord.idempotency_key != "expire-2").update(
+        {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+    assert service.get_replay(_dividend("expire-0")) is None
+    assert expire_replay_records(db, batch_size=1) == 2
+    assert [r.idempotency_key for r in db.query(IdempotencyRecord)] == ["expire-2"]
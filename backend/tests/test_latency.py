@@ -0,0 +1,59 @@
+"""Tests for streaming latency sketches."""
+import random
+
+from app.models.event import EventType
+from app.services.latency import PROCESSING, QUEUE_WAIT, LatencyTracker, QuantileSketch
+
+
+def test_sketch_quantiles_within_relative_accuracy() -> None:
+    """Test reported quantiles stay within the configured relative error."""
+    rng = random.Random(42)
+    values = sorted(rng.lognormvariate(0, 1) for _ in range(10000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+    assert abs(sketch.mean - sum(values) / len(values)) < 1e-9
+
+
+def test_sketch_memory_is_bounded() -> None:
+    """Test the bucket count never exceeds max_buckets."""
+    values = sorted(
+        10**exponent * (1 + step / 100) for exponent in range(-5, 5) for step in range(100)
+    )
+    sketch = QuantileSketch(max_buckets=32)
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch.buckets) <= 32
+    assert sketch.count == 1000
+    # Collapsing only loses accuracy at the bottom of the distribution
+    exact = values[int(0.99 * (len(values) - 1))]
+    assert abs(sketch.quantile(0.99) - exact) <= 0.011 * exact
+
+
+def test_tracker_summarizes_per_type() -> None:
+    """Test summary reports per-type percentiles and an overall mean."""
+    tracker = LatencyTracker(replica="api-1")
+    assert tracker.summary() == {
+        "replica": "api-1",
+        "average_processing_time_seconds": None,
+        "latency_by_type": {},
+    }
+
+    for seconds in (1.0, 2.0, 3.0):
+        tracker.record(EventType.DIVIDEND, PROCESSING, seconds)
+    tracker.record(EventType.MERGER, PROCESSING, 6.0)
+    tracker.record(EventType.MERGER, QUEUE_WAIT, 0.5)
+
+    summary = tracker.summary()
+    assert summary["average_processing_time_seconds"] == 3.0
+    dividend = summary["latency_by_type"]["DIVIDEND"]["processing"]
+    assert dividend["count"] == 3
+    assert dividend["mean"] == 2.0
+    assert abs(dividend["p50"] - 2.0) <= 0.02
+    assert "queue_wait" not in summary["latency_by_type"]["DIVIDEND"]
+    assert summary["latency_by_type"]["MERGER"]["queue_wait"]["count"] == 1
@@ -0,0 +1,42 @@
+"""Tests for processor wakeup notifications."""
+import threading
+
+from app.services.notifier import EventNotifier, InMemoryWakeupChannel
+
+
+def test_wait_times_out_without_notification() -> None:
+    """Test an idle waiter returns False once its timeout elapses."""
+    notifier = EventNotifier()
+    assert notifier.wait(notifier.generation, timeout=0.01) is False
+
+
+def test_notification_before_wait_is_not_lost() -> None:
+    """Test a wakeup between poll and wait returns immediately."""
+    notifier = EventNotifier()
+    seen = notifier.generation
+    notifier.notify()
+    assert notifier.wait(seen, timeout=5) is True
+
+
+def test_notify_wakes_blocked_waiter() -> None:
+    """Test notify releases a thread blocked in wait."""
+    notifier = EventNotifier()
+    seen = notifier.generation
+    result: list[bool] = []
+    waiter = threading.Thread(target=lambda: result.append(notifier.wait(seen, timeout=5)))
+    waiter.start()
+    notifier.notify()
+    waiter.join(timeout=5)
+    assert result == [True]
+
+
+def test_channel_wakes_other_replicas() -> None:
+    """Test a wakeup published on one replica reaches the others."""
+    channel = InMemoryWakeupChannel()
+    sender = EventNotifier(channel)
+    receiver = EventNotifier(channel)
+    seen = receiver.generation
+
+    sender.notify()
+
+    assert receiver.wait(seen, timeout=0) is True
@@ -0,0 +1,134 @@
+"""Tests for read-replica routing."""
+from collections.abc import Iterator
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import database
+from app.core.database import PRIMARY_UNTIL_COOKIE, Base, RoutingSession
+from app.models.event import EventStatus, EventType
+from app.schemas.event import EventCreate
+from app.services.async_event_service import AsyncEventService
+from app.services.event_cache import event_cache
+from app.services.event_service import EventService
+
+
+@pytest.fixture
+def routing_factory() -> Iterator[sessionmaker]:
+    """Sessions over a primary and an (empty, never replicated) replica."""
+    engines: list[Engine] = [
+        create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        for _ in range(2)
+    ]
+    for engine in engines:
+        Base.metadata.create_all(bind=engine)
+    primary, replica = engines
+    yield sessionmaker(bind=primary, class_=RoutingSession, replicas=[replica], autoflush=False)
+    for engine in engines:
+        engine.dispose()
+
+
+def _create(factory: sessionmaker) -> int:
+    db = factory()
+    try:
+        return EventService(db).create_event(
+            EventCreate(
+                event_type=EventType.DIVIDEND,
+                symbol="REPL",
+                amount=0.5,
+                ex_date=date(2024, 11, 15),
+                record_date=date(2024, 11, 18),
+                payment_date=date(2024, 11, 25),
+            )
+        ).id
+    finally:
+        db.close()
+
+
+def test_reads_go_to_replica(routing_factory: sessionmaker) -> None:
+    """Test read-only service methods are served by the replica."""
+    event_id = _create(routing_factory)
+
+    db = routing_factory()
+    try:
+        # The replica has not caught up, so it does not know the event
+        assert EventService(db).get_event(event_id) is None
+        assert EventService(db).list_events()[0] == []
+    finally:
+        db.close()
+
+
+def test_session_sticks_to_primary_after_write(routing_factory: sessionmaker) -> None:
+    """Test a session that has written reads its own writes from the primary."""
+    event_id = _create(routing_factory)
+
+    db = routing_factory()
+    try:
+        service = EventService(db)
+        assert service.update_event_statuses([event_id], EventStatus.CANCELLED) == [event_id]
+        assert service.get_event(event_id).status == EventStatus.CANCELLED
+    finally:
+        db.close()
+
+
+def test_primary_reads_context_overrides_replica(routing_factory: sessionmaker) -> None:
+    """Test requests inside the read-your-writes window read the primary."""
+    event_id = _create(routing_factory)
+
+    token = database._primary_reads.set(True)
+    db = routing_factory()
+    try:
+        assert EventService(db).get_event(event_id) is not None
+    finally:
+        db.close()
+        database._primary_reads.reset(token)
+
+
+async def test_cache_fills_from_primary(routing_factory: sessionmaker) -> None:
+    """Test a cache miss is loaded from the primary, not a lagging replica."""
+    event_id = _create(routing_factory)
+
+    db = routing_factory()
+    try:
+        body = await AsyncEventService(db).get_event_body(event_id)
+        assert body is not None
+        assert event_cache.get(event_id) == body
+    finally:
+        db.close()
+        event_cache.clear()
+
+
+def test_write_sets_read_your_writes_cookie(client: TestClient) -> None:
+    """Test successful writes start the primary-read window; reads do not."""
+    response = client.post(
+        "/api/v1/events",
+        json={
+            "event_type": "DIVIDEND",
+            "symbol": "AAPL",
+            "amount": 0.24,
+            "ex_date": "2024-11-15",
+            "record_date": "2024-11-18",
+            "payment_date": "2024-11-25",
+        },
+    )
+    assert response.status_code == 201
+    assert PRIMARY_UNTIL_COOKIE in response.cookies
+
+    response = client.get(f"/api/v1/events/{response.json()['id']}")
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+
+
+def test_calendar_query_is_a_read(client: TestClient) -> None:
+    """Test POSTed calendar queries neither start the window nor need the primary."""
+    response = client.post(
+        "/api/v1/events/calendar",
+        json={"date_from": "2024-11-01", "date_to": "2024-11-30"},
+    )
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
@@ -0,0 +1,73 @@
+"""Tests for Prometheus instrumentation."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core import database
+from app.core.database import InstrumentedQueuePool, instrument_engine, pool_class, pool_stats
+from app.core.telemetry import POOL_CHECKOUT_WAIT, Registry, registry
+
+
+def test_histogram_exposition() -> None:
+    """Test histograms render cumulative buckets, sum and count."""
+    registry = Registry()
+    histogram = registry.histogram("demo_seconds", "Demo", ["route"], buckets=(0.1, 1.0))
+    histogram.labels("/a").observe(0.05)
+    histogram.labels("/a").observe(0.5)
+    histogram.labels("/a").observe(5.0)
+    registry.counter("demo_total", "Demo counter").inc(2)
+
+    text_format = registry.render()
+    assert "# TYPE demo_seconds histogram" in text_format
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in text_format
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in text_format
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in text_format
+    assert 'demo_seconds_count{route="/a"} 3' in text_format
+    assert "demo_total 2" in text_format
+
+
+def test_scrape_endpoint_reports_routes_and_queries(client: TestClient) -> None:
+    """Test /metrics exposes route latency, query time and transitions."""
+    client.get("/api/v1/events")
+    client.get("/api/v1/events/12345")
+    client.get("/api/v1/health")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'route="/api/v1/events"' in body
+    assert 'route="/api/v1/events/{event_id}",status="404"' in body
+    assert 'route="/api/v1/health"' in body
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in body
+    assert "# TYPE event_status_transitions_total counter" in body
+
+
+def test_pool_records_checkout_wait_and_occupancy() -> None:
+    """Test the instrumented pool observes checkouts and reports in-use counts."""
+    engine = instrument_engine(
+        create_engine("sqlite://", poolclass=pool_class(InstrumentedQueuePool, "test")),
+        "test",
+    )
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_stats()["test"]["checked_out"] == 1
+    assert pool_stats()["test"]["checked_out"] == 0
+    assert sum(POOL_CHECKOUT_WAIT.labels("test").counts) == 1
+    assert 'db_pool_connections{pool="test",state="idle"} 1' in registry.render()
+
+
+def test_idle_pre_ping_replaces_dead_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a connection that died while idle is replaced on checkout."""
+    monkeypatch.setattr(database.settings, "db_pool_pre_ping", "idle")
+    monkeypatch.setattr(database.settings, "db_pool_pre_ping_idle_seconds", 0.0)
+    engine = instrument_engine(
+        create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1), "ping-test"
+    )
+    with engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+    raw.close()  # e.g. the server timed the connection out
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert conn.connection.dbapi_connection is not raw
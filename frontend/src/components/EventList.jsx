@@ -1,5 +1,11 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { eventAPI } from '../services/api';
+import { streamSupported, subscribeToEvents } from '../services/stream';
+
+const POLL_INTERVAL_MS = 3000;
+// Safety net for changes committed on other API replicas
+const RESYNC_INTERVAL_MS = 60000;
+const REFETCH_DEBOUNCE_MS = 500;
 
 const STATUS_COLORS = {
   PENDING: '#fbbf24',
@@ -18,7 +24,8 @@ export default function EventList({ refreshTrigger }) {
   const fetchEvents = async () => {
     try {
       setLoading(true);
-      const params = statusFilter ? { status: statusFilter } : {};
+      // The list only renders the first page, so skip the COUNT(*)
+      const params = statusFilter ? { status: statusFilter, count: 'none' } : { count: 'none' };
       const response = await eventAPI.listEvents(params);
       setEvents(response.data.events);
       setError(null);
@@ -29,10 +36,63 @@ export default function EventList({ refreshTrigger }) {
     }
   };
 
+  const refetchTimer = useRef(null);
+
+  const scheduleRefetch = () => {
+    clearTimeout(refetchTimer.current);
+    refetchTimer.current = setTimeout(fetchEvents, REFETCH_DEBOUNCE_MS);
+  };
+
+  const applyTransitions = ({ to, events: changed }) => {
+    const byId = new Map(changed.map((change) => [change.id, change]));
+    setEvents((current) =>
+      current
+        .map((event) => {
+          const change = byId.get(event.id);
+          if (!change) return event;
+          return {
+            ...event,
+            status: to,
+            retry_count: change.retry_count ?? event.retry_count,
+            error_message: change.error_message ?? event.error_message,
+          };
+        })
+        .filter((event) => !statusFilter || event.status === statusFilter)
+    );
+    // Events that moved into the filtered status are not on screen yet
+    if (statusFilter === to) scheduleRefetch();
+  };
+
   useEffect(() => {
     fetchEvents();
-    const interval = setInterval(fetchEvents, 3000); // Poll every 3 seconds
-    return () => clearInterval(interval);
+    let interval = null;
+    const startPolling = (ms) => {
+      clearInterval(interval);
+      interval = setInterval(fetchEvents, ms);
+    };
+
+    if (!streamSupported) {
+      startPolling(POLL_INTERVAL_MS);
+      return () => clearInterval(interval);
+    }
+
+    startPolling(RESYNC_INTERVAL_MS);
+    const unsubscribe = subscribeToEvents((type, data) => {
+      if (type === 'status') {
+        applyTransitions(data);
+      } else if (type === 'created') {
+        if (!statusFilter || statusFilter === 'PENDING') scheduleRefetch();
+      } else if (type === 'resync') {
+        scheduleRefetch();
+      } else if (type === 'closed') {
+        startPolling(POLL_INTERVAL_MS);
+      }
+    });
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+      clearTimeout(refetchTimer.current);
+    };
   }, [statusFilter, refreshTrigger]);
 
   const formatDate = (dateString) => {
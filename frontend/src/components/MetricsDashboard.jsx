@@ -2,6 +2,47 @@ import { useState, useEffect } from 'react';
 import { Chart as ChartJS, ArcElement, Tooltip, Legend, CategoryScale, LinearScale, BarElement, Title } from 'chart.js';
 import { Doughnut, Bar } from 'react-chartjs-2';
 import { eventAPI } from '../services/api';
+import { streamSupported, subscribeToEvents } from '../services/stream';
+
+const POLL_INTERVAL_MS = 5000;
+// Pushed deltas keep counts live; a periodic refetch corrects rolling
+// windows. Changes committed on other API replicas arrive as resyncs.
+const RESYNC_INTERVAL_MS = 60000;
+
+const addDeltas = (counts, deltas = {}) => {
+  const next = { ...counts };
+  Object.entries(deltas).forEach(([key, delta]) => {
+    const value = (next[key] || 0) + delta;
+    if (value > 0) {
+      next[key] = value;
+    } else {
+      delete next[key];
+    }
+  });
+  return next;
+};
+
+// Deltas are tagged with the change sequence they committed at; skip
+// any the current snapshot already counts
+const applyDeltas = (metrics, type, { deltas, change_sequence: sequence }) => {
+  if (!metrics) return metrics;
+  if (sequence != null && metrics.change_sequence != null && sequence <= metrics.change_sequence) {
+    return metrics;
+  }
+  const created = type === 'created' ? deltas.status.PENDING || 0 : 0;
+  const eventsByStatus = addDeltas(metrics.events_by_status, deltas.status);
+  const totalEvents = metrics.total_events + created;
+  return {
+    ...metrics,
+    total_events: totalEvents,
+    events_by_type: addDeltas(metrics.events_by_type, deltas.type),
+    events_by_status: eventsByStatus,
+    recent_events_1h: metrics.recent_events_1h + created,
+    recent_events_24h: metrics.recent_events_24h + created,
+    error_rate: totalEvents > 0 ? (eventsByStatus.FAILED || 0) / totalEvents : 0,
+    change_sequence: sequence ?? metrics.change_sequence,
+  };
+};
 
 ChartJS.register(ArcElement, Tooltip, Legend, CategoryScale, LinearScale, BarElement, Title);
 
@@ -24,8 +65,31 @@ export default function MetricsDashboard({ refreshTrigger }) {
 
   useEffect(() => {
     fetchMetrics();
-    const interval = setInterval(fetchMetrics, 5000); // Poll every 5 seconds
-    return () => clearInterval(interval);
+    let interval = null;
+    const startPolling = (ms) => {
+      clearInterval(interval);
+      interval = setInterval(fetchMetrics, ms);
+    };
+
+    if (!streamSupported) {
+      startPolling(POLL_INTERVAL_MS);
+      return () => clearInterval(interval);
+    }
+
+    startPolling(RESYNC_INTERVAL_MS);
+    const unsubscribe = subscribeToEvents((type, data) => {
+      if (type === 'created' || type === 'status') {
+        setMetrics((current) => applyDeltas(current, type, data));
+      } else if (type === 'resync') {
+        fetchMetrics();
+      } else if (type === 'closed') {
+        startPolling(POLL_INTERVAL_MS);
+      }
+    });
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+    };
   }, [refreshTrigger]);
 
   if (loading) {
@@ -99,6 +163,15 @@ export default function MetricsDashboard({ refreshTrigger }) {
           <div className="metric-value">{(metrics.error_rate * 100).toFixed(1)}%</div>
           <div className="metric-label">Error Rate</div>
         </div>
+        
+        <div className="metric-card">
+          <div className="metric-value">
+            {metrics.average_processing_time_seconds != null
+              ? `${metrics.average_processing_time_seconds.toFixed(2)}s`
+              : '—'}
+          </div>
+          <div className="metric-label">Avg Processing Time</div>
+        </div>
       </div>
 
       <div className="charts-grid">
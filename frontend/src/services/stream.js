@@ -0,0 +1,52 @@
+import { API_BASE_URL } from './api';
+
+const STREAM_URL = `${API_BASE_URL}/api/v1/events/stream`;
+const MESSAGE_TYPES = ['created', 'status', 'resync'];
+
+// One EventSource is shared by every subscribed component
+let source = null;
+let opened = false;
+const listeners = new Set();
+
+export const streamSupported = typeof window !== 'undefined' && 'EventSource' in window;
+
+const dispatch = (type, data) => {
+  listeners.forEach((listener) => listener(type, data));
+};
+
+const connect = () => {
+  source = new EventSource(STREAM_URL);
+  source.onopen = () => {
+    // Anything sent while we were reconnecting was missed
+    if (opened) dispatch('resync', {});
+    opened = true;
+  };
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      dispatch('closed', {});
+    }
+  };
+  MESSAGE_TYPES.forEach((type) => {
+    source.addEventListener(type, (message) => dispatch(type, JSON.parse(message.data)));
+  });
+};
+
+/**
+ * Subscribe to pushed event changes.
+ *
+ * The listener is called with (type, data) where type is one of
+ * created, status, resync (refetch everything) or closed (the stream
+ * gave up; fall back to polling). Returns an unsubscribe function.
+ */
+export function subscribeToEvents(listener) {
+  listeners.add(listener);
+  if (!source) connect();
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && source) {
+      source.close();
+      source = null;
+      opened = false;
+    }
+  };
+}